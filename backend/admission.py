@@ -0,0 +1,118 @@
+"""
+HUSH Admission Control
+Limits that keep an overloaded node fast for the sessions it already serves,
+instead of slow for everyone.
+
+  sessions   /ws connections beyond max_sessions are told
+             {"type": "rejected", "reason": "capacity", "retry_after_seconds": N}
+             and closed with code 1013 (try again later), reason "retry-after=N".
+             N is retry_after_seconds plus up to 50% jitter, so rejected
+             clients do not all come back at once.
+  frame rate frames a session sends faster than max_session_fps (a token
+             bucket with a burst of burst_frames) are answered
+             {"type": "skipped", "frame_id": N, "reason": "rate"} and never queued.
+  in flight  at most max_in_flight frames are in inference across all
+             sessions; a frame that would exceed the budget is answered
+             {"type": "skipped", "frame_id": N, "reason": "busy"} and the
+             session's next frame gets the next chance.
+
+Limits apply per server process (each uvicorn worker enforces its own).
+Sessions are capped at workers × HUSH_MAX_TRACKERS: each inference worker
+keeps a tracker per session, and a session beyond that would keep taking
+trackers from live ones, so none of them would ever track a steady hand.
+/ws/landmarks sessions cost no inference and are not limited.
+
+Configuration (environment):
+  HUSH_MAX_SESSIONS             concurrent /ws sessions, "auto" = workers × HUSH_MAX_TRACKERS, also the most allowed (default: auto)
+  HUSH_MAX_SESSION_FPS          frames per second one session may send, 0 = unlimited (default: 15)
+  HUSH_MAX_IN_FLIGHT            frames in inference at once, 0 = unlimited, "auto" = 2 × workers × batch size (default: auto)
+  HUSH_RETRY_AFTER_SECONDS      base retry hint for rejected connections (default: 5)
+"""
+
+import os
+import random
+from typing import Optional
+
+WS_TRY_AGAIN_LATER = 1013
+
+
+def load_config(workers: int = 1, batch_size: int = 8, max_trackers: int = 8) -> dict:
+    sessions = os.environ.get("HUSH_MAX_SESSIONS", "auto").strip().lower()
+    in_flight = os.environ.get("HUSH_MAX_IN_FLIGHT", "auto").strip().lower()
+    return {
+        "max_sessions": workers * max_trackers if sessions == "auto" else int(sessions),
+        "max_session_fps": float(os.environ.get("HUSH_MAX_SESSION_FPS", 15)),
+        "max_in_flight": 2 * workers * batch_size if in_flight == "auto" else int(in_flight),
+        "retry_after_seconds": float(os.environ.get("HUSH_RETRY_AFTER_SECONDS", 5)),
+    }
+
+
+class RateLimiter:
+    """Token bucket: rate frames per second, bursts of up to burst frames."""
+
+    def __init__(self, rate: float, burst: float = 2.0):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._last: Optional[float] = None
+
+    def allow(self, now: float) -> bool:
+        if self._last is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class AdmissionControl:
+    def __init__(
+        self,
+        max_sessions: int = 0,
+        max_session_fps: float = 15,
+        max_in_flight: int = 0,
+        retry_after_seconds: float = 5,
+        burst_frames: float = 2,
+    ):
+        self.max_sessions = max_sessions
+        self.max_session_fps = max_session_fps
+        self.max_in_flight = max_in_flight
+        self.retry_after_seconds = retry_after_seconds
+        self.burst_frames = burst_frames
+        self.sessions = 0    # admitted /ws sessions open now
+        self.in_flight = 0   # frames in inference now
+
+    def admit(self) -> Optional[dict]:
+        """Take a session slot: None if admitted, else the rejection message to send before closing."""
+        if self.max_sessions and self.sessions >= self.max_sessions:
+            retry = round(self.retry_after_seconds * (1 + random.random() / 2))
+            return {"type": "rejected", "reason": "capacity", "retry_after_seconds": retry}
+        self.sessions += 1
+        return None
+
+    def leave(self):
+        self.sessions = max(0, self.sessions - 1)
+
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """A new session's frame-rate limiter (None when unlimited)."""
+        return RateLimiter(self.max_session_fps, self.burst_frames) if self.max_session_fps > 0 else None
+
+    def acquire(self) -> bool:
+        """Claim an in-flight inference slot; False if the budget is spent."""
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def stats(self) -> dict:
+        return {
+            "max_sessions": self.max_sessions or None,
+            "max_session_fps": self.max_session_fps or None,
+            "max_in_flight": self.max_in_flight or None,
+            "sessions": self.sessions,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,164 @@
+"""
+HUSH Static Assets
+The frontend (and other fixed responses) served from memory.
+
+At startup every file under frontend/ is read once into an index keyed by its
+relative path. Each entry holds the body, a content-hash ETag, its
+Cache-Control header and precompressed variants: gzip (level 9) and, if the
+optional `brotli` package is installed, brotli (quality 11) — kept only for
+text types where they are smaller. A request is a dict lookup: no filesystem
+calls, no compression, and a matching If-None-Match is answered 304 with no
+body. Fixed API responses (the ISL alphabet) are built the same way from
+their pre-serialized JSON.
+
+HTML pages and API JSON are sent with `no-cache` (always revalidated, so a
+deploy shows up on the next load, as a 304 until then); CSS, JS and other
+assets may be reused for HUSH_STATIC_MAX_AGE seconds before revalidating.
+
+Configuration (environment):
+  HUSH_STATIC_MAX_AGE  seconds browsers may reuse CSS / JS / images without asking (default: 3600)
+  HUSH_STATIC_RELOAD   1 to re-read files that changed on disk (development), 0 to serve the startup copy (default: 0)
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+MIN_COMPRESS_BYTES = 256
+_COMPRESSIBLE = ("text/", "application/json", "application/javascript", "image/svg+xml")
+_NO_CACHE = "no-cache"
+
+
+class Asset(NamedTuple):
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    encoded: dict        # content-coding ("br", "gzip") -> compressed body
+    mtime: float = 0.0   # of the source file, for reload
+
+
+def load_config() -> dict:
+    return {
+        "max_age": int(os.environ.get("HUSH_STATIC_MAX_AGE", 3600)),
+        "reload": os.environ.get("HUSH_STATIC_RELOAD", "0").strip() not in ("0", "false", "no", ""),
+    }
+
+
+def build_asset(body: bytes, media_type: str, cache_control: str = _NO_CACHE, mtime: float = 0.0) -> Asset:
+    """An in-memory response body with its ETag and any worthwhile compressed variants."""
+    encoded = {}
+    if len(body) >= MIN_COMPRESS_BYTES and media_type.startswith(_COMPRESSIBLE):
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=11)
+        encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        encoded = {coding: data for coding, data in encoded.items() if len(data) < len(body)}
+    etag = f'W/"{hashlib.sha256(body).hexdigest()[:20]}"'  # weak: shared by every encoding
+    return Asset(body, media_type, etag, cache_control, encoded, mtime)
+
+
+def _accepted_codings(header: str) -> set:
+    codings = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            codings.add(name.strip().lower())
+    return codings
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
+
+
+def respond(request: Request, asset: Asset, status_code: int = 200) -> tuple[Response, str]:
+    """
+    The response for asset: 304 if the client's copy is current, else the
+    smallest encoding it accepts. Also returns the outcome: not_modified,
+    br, gzip or identity.
+    """
+    headers = {"ETag": asset.etag, "Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+    if status_code == 200 and _etag_matches(request.headers.get("if-none-match", ""), asset.etag):
+        return Response(status_code=304, headers=headers), "not_modified"
+    body, outcome = asset.body, "identity"
+    if asset.encoded:
+        accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+        for coding in ("br", "gzip"):
+            if coding in accepted and coding in asset.encoded:
+                body, outcome = asset.encoded[coding], coding
+                headers["Content-Encoding"] = coding
+                break
+    return Response(body, status_code, headers, media_type=asset.media_type), outcome
+
+
+class AssetIndex:
+    """Every file under a directory, loaded once and looked up by relative path."""
+
+    def __init__(self, directory, max_age: int = 3600, reload: bool = False):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.reload = reload
+        self._assets: Optional[dict[str, Asset]] = None
+        self.build_ms = 0.0
+
+    def _cache_control(self, media_type: str) -> str:
+        return _NO_CACHE if media_type == "text/html" else f"public, max-age={self.max_age}"
+
+    def _build(self, path: Path) -> Asset:
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return build_asset(path.read_bytes(), media_type, self._cache_control(media_type), path.stat().st_mtime)
+
+    def load(self):
+        started = time.perf_counter()
+        assets = {}
+        if self.directory.is_dir():
+            for path in sorted(self.directory.rglob("*")):
+                if path.is_file() and not path.name.startswith("."):
+                    assets[path.relative_to(self.directory).as_posix()] = self._build(path)
+        self._assets = assets
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def get(self, path: str) -> Optional[Asset]:
+        """The asset at a relative path (e.g. "css/app.css"), or None."""
+        if self._assets is None:
+            self.load()
+        asset = self._assets.get(path)
+        if asset is not None and self.reload:
+            source = self.directory / path
+            try:
+                if source.stat().st_mtime != asset.mtime:
+                    asset = self._assets[path] = self._build(source)
+            except OSError:
+                pass  # deleted: keep serving the loaded copy
+        return asset
+
+    def stats(self) -> dict:
+        assets = (self._assets or {}).values()
+        return {
+            "files": len(self._assets or {}),
+            "bytes": sum(len(a.body) for a in assets),
+            "gzip_bytes": sum(len(a.encoded.get("gzip", a.body)) for a in assets),
+            "br_bytes": sum(len(a.encoded.get("br", a.body)) for a in assets) if brotli is not None else None,
+            "build_ms": round(self.build_ms, 1),
+        }
@@ -0,0 +1,121 @@
+"""
+HUSH Client Rate Control
+Server-driven frame interval, resolution and JPEG quality for /ws clients.
+
+After every processed frame the session's controller looks at three signals:
+  - hand presence: after idle_after frames without a hand the client drops to
+    a slow, small, low-quality "idle" stream; the first hand restores it
+  - the session's own processing time: a client is never asked to send faster
+    than its frames are served (anything faster is dropped server-side anyway)
+  - server backlog: frames queued for a worker, per worker; when workers fall
+    behind, every client backs off and sends smaller frames
+and, when the targets change, returns a message for the client:
+
+  {"type": "control", "frame_interval_ms": 150, "max_width": 640,
+   "jpeg_quality": 0.65, "reason": "active" | "idle" | "load"}
+
+Small fluctuations are not sent: the interval must move by min_change and
+messages are at least min_gap_seconds apart, except for idle → active, which
+is sent at once so the client reacts to a hand immediately.
+
+Configuration (environment):
+  HUSH_CONTROL                1 to send control messages, 0 to leave clients alone (default: 1)
+  HUSH_FRAME_INTERVAL_MS      interval while a hand is in view (default: 150)
+  HUSH_IDLE_INTERVAL_MS       interval while no hand is in view (default: 500)
+  HUSH_MAX_FRAME_INTERVAL_MS  upper bound under load (default: 1000)
+"""
+
+import os
+import time
+from typing import Optional
+
+FULL_WIDTH, LOAD_WIDTH, IDLE_WIDTH = 640, 480, 480
+FULL_QUALITY, LOAD_QUALITY, IDLE_QUALITY = 0.65, 0.55, 0.5
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_CONTROL", "1").strip() not in ("0", "false", "no", ""),
+        "interval_ms": float(os.environ.get("HUSH_FRAME_INTERVAL_MS", 150)),
+        "idle_interval_ms": float(os.environ.get("HUSH_IDLE_INTERVAL_MS", 500)),
+        "max_interval_ms": float(os.environ.get("HUSH_MAX_FRAME_INTERVAL_MS", 1000)),
+    }
+
+
+class FrameRateController:
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval_ms: float = 150,
+        idle_interval_ms: float = 500,
+        max_interval_ms: float = 1000,
+        idle_after: int = 8,
+        min_change: float = 0.2,
+        min_gap_seconds: float = 1.0,
+    ):
+        self.enabled = enabled
+        self.interval_ms = interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.max_interval_ms = max(max_interval_ms, interval_ms, idle_interval_ms)
+        self.idle_after = idle_after
+        self.min_change = min_change
+        self.min_gap = min_gap_seconds
+        self._misses = 0
+        self._frame_ms = 0.0   # EWMA of receive → result time for this session
+        self._sent_at = 0.0
+        self.targets = self._targets(interval_ms, FULL_WIDTH, FULL_QUALITY, "active")
+        self.sent = 0
+
+    @staticmethod
+    def _targets(interval_ms, width, quality, reason) -> dict:
+        return {
+            "type": "control",
+            "frame_interval_ms": int(interval_ms),
+            "max_width": width,
+            "jpeg_quality": quality,
+            "reason": reason,
+        }
+
+    def initial(self) -> Optional[dict]:
+        """Message to send when the session opens (None when control is off)."""
+        if not self.enabled:
+            return None
+        self._sent_at = time.monotonic()
+        self.sent += 1
+        return self.targets
+
+    def update(self, hand_detected: bool, frame_ms: float, backlog: float) -> Optional[dict]:
+        """
+        Feed one processed frame: whether it had a hand, its receive → result
+        time, and the server backlog (queued frames per worker). Returns a
+        control message when the targets change enough to be worth sending.
+        """
+        if not self.enabled:
+            return None
+        self._frame_ms = frame_ms if not self._frame_ms else 0.8 * self._frame_ms + 0.2 * frame_ms
+        was_idle = self.targets["reason"] == "idle"
+        self._misses = 0 if hand_detected else self._misses + 1
+
+        if self._misses >= self.idle_after:
+            reason, interval, width, quality = "idle", self.idle_interval_ms, IDLE_WIDTH, IDLE_QUALITY
+        elif backlog > 1:
+            reason, width, quality = "load", LOAD_WIDTH, LOAD_QUALITY
+            interval = self.interval_ms * min(4.0, backlog)
+        else:
+            reason, interval, width, quality = "active", self.interval_ms, FULL_WIDTH, FULL_QUALITY
+        # Never ask for frames faster than this session's frames are served
+        interval = max(interval, self._frame_ms * 1.25)
+        interval = min(self.max_interval_ms, round(interval / 25) * 25)
+
+        current = self.targets
+        now = time.monotonic()
+        moved = abs(interval - current["frame_interval_ms"]) >= self.min_change * current["frame_interval_ms"]
+        changed = moved or width != current["max_width"] or quality != current["jpeg_quality"]
+        woke = was_idle and reason != "idle"
+        if not changed or (not woke and now - self._sent_at < self.min_gap):
+            return None
+
+        self.targets = self._targets(interval, width, quality, reason)
+        self._sent_at = now
+        self.sent += 1
+        return self.targets
@@ -0,0 +1,135 @@
+"""
+HUSH Frame Cache
+Per-session reuse of hand inference for near-duplicate frames.
+
+While a sign is held for the auto-add timer, consecutive frames are almost
+identical. Before decoding a frame for MediaPipe, the session takes a cheap
+fingerprint of it: a grayscale JPEG decode at reduced DCT scale
+(IMREAD_REDUCED_GRAYSCALE_2/4/8, no colour conversion), cropped to the
+tracked hand's box when there is one and area-averaged to 16 × 16 luminance
+cells. If it is within the threshold of the last *processed* frame's
+fingerprint, that frame's landmarks and classification are reused and decode,
+hands.process and classify are skipped; the stability filter and motion
+tracker still see the frame, so hold timers keep running.
+
+Difference is the largest per-cell luminance change (0–255) after removing
+the mean change, so a camera's exposure drift does not count but a finger
+moving inside the hand box does. Hits never refresh the stored frame, so slow
+drift cannot accumulate, and a result is reused for at most max_age_ms after
+it was computed.
+
+Configuration (environment):
+  HUSH_FRAME_CACHE             1 to reuse results for near-duplicate frames, 0 to process every frame (default: 1)
+  HUSH_FRAME_CACHE_THRESHOLD   max per-cell luminance change of a duplicate, 0–255 (default: 8)
+  HUSH_FRAME_CACHE_MAX_AGE_MS  longest a result is reused (default: 500)
+"""
+
+import os
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from backend.roi import Box
+
+FINGERPRINT_SIDE = 16
+MIN_REGION_PIXELS = 32   # decoded pixels across the fingerprinted region
+
+_GRAY_FLAGS = {
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    1: cv2.IMREAD_GRAYSCALE,
+}
+
+
+class _Entry(NamedTuple):
+    fingerprint: np.ndarray
+    box: Optional[Box]          # region fingerprinted (None = whole frame)
+    time: float                 # when the result was computed
+    landmarks: Optional[np.ndarray]
+    prediction: Optional[tuple]  # (handedness, [(letter, confidence), ...]) for detected hands
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_FRAME_CACHE", "1").strip() not in ("0", "false", "no", ""),
+        "threshold": float(os.environ.get("HUSH_FRAME_CACHE_THRESHOLD", 8)),
+        "max_age_ms": float(os.environ.get("HUSH_FRAME_CACHE_MAX_AGE_MS", 500)),
+    }
+
+
+def fingerprint(frame_bytes, box: Optional[Box] = None, frame_size: Optional[tuple] = None) -> Optional[np.ndarray]:
+    """
+    (16, 16) float32 luminance cells of the frame, or of box within it; None
+    if undecodable. frame_size (full-resolution width, height) picks the
+    decode scale for a box; whole frames always decode at 1/8.
+    """
+    factor = 8
+    if box is not None and frame_size:
+        side = min((box.x1 - box.x0) * frame_size[0], (box.y1 - box.y0) * frame_size[1])
+        factor = next((f for f in (8, 4, 2) if side / f >= MIN_REGION_PIXELS), 1)
+    gray = cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), _GRAY_FLAGS[factor])
+    if gray is None:
+        return None
+    if box is not None:
+        h, w = gray.shape
+        x0, y0 = int(box.x0 * w), int(box.y0 * h)
+        gray = gray[y0:max(y0 + 1, int(round(box.y1 * h))), x0:max(x0 + 1, int(round(box.x1 * w)))]
+    cells = cv2.resize(gray, (FINGERPRINT_SIDE, FINGERPRINT_SIDE), interpolation=cv2.INTER_AREA)
+    return cells.astype(np.float32)
+
+
+def difference(a: np.ndarray, b: np.ndarray) -> float:
+    """Largest per-cell luminance change between two fingerprints, net of the mean change."""
+    d = a - b
+    return float(np.abs(d - d.mean()).max())
+
+
+class FrameCache:
+    """The last processed frame of one session and its result."""
+
+    def __init__(self, enabled: bool = True, threshold: float = 8.0, max_age_ms: float = 500.0):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_age = max_age_ms / 1000
+        self._entry: Optional[_Entry] = None
+        self._candidate = None   # (fingerprint, box, time) of a frame being processed
+        self.status = "miss"     # outcome of the last check: hit | miss | expired
+
+    def check(self, frame_bytes, box: Optional[Box], frame_size: Optional[tuple], now: float) -> Optional[tuple]:
+        """
+        Fingerprint a frame about to be processed. Returns (landmarks or None,
+        prediction or None) from the last processed frame when this one is a
+        near duplicate of it; otherwise None, and the frame's result should
+        be handed to store() once known.
+        """
+        self._candidate = None
+        self.status = "miss"
+        if not self.enabled:
+            return None
+        fp = fingerprint(frame_bytes, box, frame_size)
+        if fp is None:
+            return None
+        entry = self._entry
+        if entry is not None and entry.box == box and difference(fp, entry.fingerprint) <= self.threshold:
+            if now - entry.time <= self.max_age:
+                self.status = "hit"
+                return entry.landmarks, entry.prediction
+            self.status = "expired"
+        self._candidate = (fp, box, now)
+        return None
+
+    def store(self, landmarks: Optional[np.ndarray], prediction: Optional[tuple] = None):
+        """Remember the result of the frame last passed to check()."""
+        if self._candidate is None:
+            return
+        if landmarks is not None and prediction is None:
+            self._entry = None  # a hand without a classification is nothing to reuse
+        else:
+            self._entry = _Entry(*self._candidate, landmarks, prediction)
+        self._candidate = None
+
+    def clear(self):
+        self._entry = None
+        self._candidate = None
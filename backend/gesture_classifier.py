@@ -2,9 +2,16 @@
 HUSH Gesture Classifier
 Uses MediaPipe hand landmarks to classify ISL (Indian Sign Language) alphabet gestures.
 Rule-based classification using finger states, angles, and relative positions.
+
+Up to HUSH_MAX_HANDS hands are tracked per frame (see backend/results.py).
+With two, every hand of a frame (and of every frame in a batch) is classified
+in the same classify_gestures() call, each hand keeps its own stability and
+motion state, and results add "hands": one entry per hand with its
+"handedness", letter, stability and landmarks. The hand-box crop
+(backend/roi.py) then covers all tracked hands and is only used while every
+hand is tracked — a missing hand is searched for in the whole frame.
 """
 
-import math
 import numpy as np
 import mediapipe as mp
 import cv2
@@ -12,260 +19,390 @@ import base64
 from typing import Optional
 import time
 
+from backend.landmarks import (  # noqa: F401  (indices re-exported for callers)
+    WRIST,
+    THUMB_CMC, THUMB_MCP, THUMB_IP, THUMB_TIP,
+    INDEX_MCP, INDEX_PIP, INDEX_DIP, INDEX_TIP,
+    MIDDLE_MCP, MIDDLE_PIP, MIDDLE_DIP, MIDDLE_TIP,
+    RING_MCP, RING_PIP, RING_DIP, RING_TIP,
+    PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP,
+    landmarks_to_array,
+)
+from backend.frame_cache import FrameCache, load_config as load_frame_cache_config
+from backend.gesture_rules import classify_hand
+from backend.learned import active_classifier
+from backend.motion import MotionTracker, load_config as load_motion_config
+from backend.results import NO_HAND, HandStates, StabilityFilter, load_config as load_hands_config, stream_result
+from backend.roi import (
+    Box,
+    decode_full,
+    decode_region,
+    hand_box,
+    load_config as load_roi_config,
+    map_to_frame,
+    padded_box,
+    should_move,
+)
+
 mp_hands = mp.solutions.hands
 
-# Landmark indices
-WRIST = 0
-THUMB_CMC, THUMB_MCP, THUMB_IP, THUMB_TIP = 1, 2, 3, 4
-INDEX_MCP, INDEX_PIP, INDEX_DIP, INDEX_TIP = 5, 6, 7, 8
-MIDDLE_MCP, MIDDLE_PIP, MIDDLE_DIP, MIDDLE_TIP = 9, 10, 11, 12
-RING_MCP, RING_PIP, RING_DIP, RING_TIP = 13, 14, 15, 16
-PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP = 17, 18, 19, 20
 
+def classify_gesture(lm) -> tuple[str, float]:
+    """
+    Returns (letter, confidence) for ISL alphabet.
+    Uses rule-based landmark geometry: the finger-state mask picks the
+    relevant rules from the compiled table in backend/gesture_rules.py.
+    """
+    return classify_hand([l.x for l in lm], [l.y for l in lm], [l.z for l in lm])
 
-def dist(a, b):
-    return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2 + (a.z - b.z) ** 2)
 
+def classify_gestures(hands) -> list[tuple[str, float]]:
+    """
+    Classify several hands in one vectorized call, with the rule table or the
+    learned index (HUSH_CLASSIFIER, see backend/learned.py).
+    hands: (N, 21, 3) array or list of (21, 3) arrays. Returns [(letter, confidence), ...].
+    """
+    return active_classifier()(hands)
 
-def is_finger_up(lm, tip_idx, pip_idx):
-    """Returns True if the finger tip is above its PIP joint (extended)."""
-    return lm[tip_idx].y < lm[pip_idx].y
 
+def decode_base64_frame(b64_data: str) -> bytes:
+    """Decode a base64 JPEG/PNG string, with or without a data URL prefix."""
+    # Strip data URL prefix if present
+    if "," in b64_data:
+        b64_data = b64_data.split(",", 1)[1]
+    return base64.b64decode(b64_data)
 
-def is_finger_bent(lm, tip_idx, pip_idx):
-    return lm[tip_idx].y > lm[pip_idx].y
 
+def decode_frame(frame_bytes) -> Optional[np.ndarray]:
+    """Decode JPEG/WebP bytes (bytes or memoryview) to an RGB image, or None if undecodable."""
+    nparr = np.frombuffer(frame_bytes, np.uint8)
+    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
-def finger_states(lm):
-    """Returns bool tuple: (thumb_up, index_up, middle_up, ring_up, pinky_up)"""
-    thumb = lm[THUMB_TIP].x < lm[THUMB_IP].x  # left hand: thumb extends left
-    # For typical right hand in mirrored (selfie) view:
-    thumb = lm[THUMB_TIP].x > lm[THUMB_IP].x
-    index = is_finger_up(lm, INDEX_TIP, INDEX_PIP)
-    middle = is_finger_up(lm, MIDDLE_TIP, MIDDLE_PIP)
-    ring = is_finger_up(lm, RING_TIP, RING_PIP)
-    pinky = is_finger_up(lm, PINKY_TIP, PINKY_PIP)
-    return (thumb, index, middle, ring, pinky)
 
+def process_batch(jobs: list, complexity: Optional[int] = None) -> list[dict]:
+    """
+    Run a batch of frames from (possibly) different sessions.
+    jobs: list of (classifier, frame_bytes) — frame_bytes may also be a base64 str.
+    Each frame is decoded and tracked by its own session's classifier, then all
+    detected hands are classified in a single classify_gestures() call; frames
+    that are near duplicates of their session's last processed frame reuse its
+    result instead (see backend/frame_cache.py).
+    complexity (0 lite / 1 full), if given, switches each classifier's model first.
+    Every result carries per-stage milliseconds under "_timings" (see
+    backend/metrics.py); the batch's classify time is shared across its hands.
+    With the frame cache on, "_cache" is hit, miss or expired.
+    """
+    clock = time.perf_counter
+    results = [None] * len(jobs)
+    timings = [{} for _ in jobs]
+    detected = []  # (job index, classifier, (N, 21, 3) hands, handedness)
+    for n, (clf, frame) in enumerate(jobs):
+        try:
+            if complexity is not None:
+                clf.set_complexity(complexity)
+            if isinstance(frame, str):
+                t0 = clock()
+                frame = decode_base64_frame(frame)
+                _add_ms(timings[n], "decode", clock() - t0)
+            cached = clf.reuse(frame, timings[n])
+            if cached is not None:
+                results[n] = clf.replay(*cached, timings[n])
+                continue
+            found = clf.detect_frame(frame, timings[n])
+            if found is None:
+                clf.remember(None)
+                results[n] = clf.no_hand()
+            else:
+                detected.append((n, clf, *found))
+        except Exception as e:
+            results[n] = {**NO_HAND, "error": str(e)}
 
-def fingers_up_count(states):
-    return sum(states)
+    if detected:
+        t0 = clock()
+        predictions = classify_gestures(np.concatenate([hands for _, _, hands, _ in detected]))
+        classify_ms = (clock() - t0) * 1000 / len(predictions)
+        start = 0
+        for n, clf, hands, labels in detected:
+            t1 = clock()
+            own = predictions[start:start + len(hands)]
+            start += len(hands)
+            clf.remember(hands, (labels, own))
+            results[n] = clf.finalize_hands(hands, labels, own)
+            timings[n]["classify"] = classify_ms * len(hands)
+            timings[n]["serialize"] = (clock() - t1) * 1000
 
+    for (clf, _), result, stages in zip(jobs, results, timings):
+        result["_timings"] = stages
+        if clf.frame_cache is not None:
+            result["_cache"] = clf.frame_cache.status
+    return results
 
-def touching(lm, a_idx, b_idx, threshold=0.06):
-    return dist(lm[a_idx], lm[b_idx]) < threshold
 
-
-def classify_gesture(lm) -> tuple[str, float]:
-    """
-    Returns (letter, confidence) for ISL alphabet.
-    Uses rule-based landmark geometry.
-    """
-    t, i, m, r, p = finger_states(lm)
-    count = fingers_up_count((t, i, m, r, p))
-
-    # --- A: Fist, thumb to the side ---
-    if not i and not m and not r and not p and not t:
-        return ("A", 0.82)
-
-    # --- S: Fist with thumb over fingers ---
-    if not i and not m and not r and not p and t:
-        if lm[THUMB_TIP].y > lm[INDEX_MCP].y:
-            return ("S", 0.78)
-
-    # --- B: 4 fingers up, thumb folded ---
-    if not t and i and m and r and p:
-        if abs(lm[INDEX_TIP].x - lm[PINKY_TIP].x) < 0.15:
-            return ("B", 0.85)
-
-    # --- L: Index up + thumb out ---
-    if t and i and not m and not r and not p:
-        # Thumb and index roughly perpendicular
-        return ("L", 0.83)
-
-    # --- Y: Thumb + pinky extended (shaka) ---
-    if t and not i and not m and not r and p:
-        return ("Y", 0.87)
-
-    # --- I: Only pinky up ---
-    if not t and not i and not m and not r and p:
-        return ("I", 0.84)
-
-    # --- D: Index up, thumb touches middle ---
-    if not t and i and not m and not r and not p:
-        if touching(lm, THUMB_TIP, MIDDLE_TIP, 0.07):
-            return ("D", 0.80)
-
-    # --- G: Index horizontal, thumb parallel ---
-    if not t and i and not m and not r and not p:
-        # Index roughly horizontal (tip.y ≈ MCP.y)
-        if abs(lm[INDEX_TIP].y - lm[INDEX_MCP].y) < 0.07:
-            return ("G", 0.75)
-
-    # --- X: Index bent/hooked ---
-    if not t and not m and not r and not p:
-        if lm[INDEX_TIP].y > lm[INDEX_PIP].y:  # index bent down
-            return ("X", 0.78)
-
-    # --- 1/Index: Index up alone ---
-    if not t and i and not m and not r and not p:
-        return ("1", 0.70)
-
-    # --- V: Index + middle in V ---
-    if not t and i and m and not r and not p:
-        spread = abs(lm[INDEX_TIP].x - lm[MIDDLE_TIP].x)
-        if spread > 0.04:
-            return ("V", 0.85)
-
-    # --- U: Index + middle together ---
-    if not t and i and m and not r and not p:
-        return ("U", 0.80)
-
-    # --- R: Index + middle crossed ---
-    if not t and i and m and not r and not p:
-        if lm[INDEX_TIP].x > lm[MIDDLE_TIP].x:  # crossed
-            return ("R", 0.76)
-        return ("U", 0.80)
-
-    # --- H: Index + middle horizontal ---
-    if not t and i and m and not r and not p:
-        if abs(lm[INDEX_TIP].y - lm[INDEX_MCP].y) < 0.07:
-            return ("H", 0.75)
-
-    # --- K: V with thumb between ---
-    if t and i and m and not r and not p:
-        if lm[THUMB_TIP].y < lm[INDEX_MCP].y:
-            return ("K", 0.78)
-
-    # --- W: 3 fingers spread ---
-    if not t and i and m and r and not p:
-        spread = abs(lm[INDEX_TIP].x - lm[RING_TIP].x)
-        if spread > 0.07:
-            return ("W", 0.82)
-
-    # --- 3 fingers: W variant ---
-    if not t and i and m and r and not p:
-        return ("W", 0.75)
-
-    # --- F: OK sign (index+thumb circle, 3 fingers up) ---
-    if not t and i and m and r and p:
-        if touching(lm, INDEX_TIP, THUMB_TIP, 0.06):
-            return ("F", 0.82)
-
-    # --- O: All fingertips touching thumb ---
-    if count >= 3:
-        if touching(lm, INDEX_TIP, THUMB_TIP, 0.07):
-            all_close = all(touching(lm, tip, THUMB_TIP, 0.10) for tip in [MIDDLE_TIP, RING_TIP])
-            if all_close:
-                return ("O", 0.84)
-
-    # --- C: Curved hand ---
-    if not i and not m and not r and not p:
-        # Open C shape — all fingers curved but not closed
-        return ("C", 0.70)
-
-    # --- E: Fingers bent at middle joint ---
-    if not t and not i and not m and not r and not p:
-        return ("E", 0.72)
-
-    # --- M: 3 fingers over thumb ---
-    if not t and not i and not m and not r and not p:
-        return ("M", 0.68)
-
-    # --- N: 2 fingers over thumb ---
-    if not t and not i and not m and not r and not p:
-        return ("N", 0.65)
-
-    # --- T: Thumb between index+middle ---
-    if not i and not m and not r and not p:
-        if lm[THUMB_TIP].x > lm[INDEX_MCP].x and lm[THUMB_TIP].x < lm[MIDDLE_MCP].x:
-            return ("T", 0.73)
-
-    # --- P: K shape pointing down ---
-    if t and i and m and not r and not p:
-        if lm[INDEX_TIP].y > lm[WRIST].y:  # pointing downward
-            return ("P", 0.70)
-
-    # --- Q: G pointing down ---
-    if t and i and not m and not r and not p:
-        if lm[INDEX_TIP].y > lm[WRIST].y:
-            return ("Q", 0.68)
-
-    return (None, 0.0)
+def _add_ms(timings: dict, stage: str, seconds: float):
+    timings[stage] = timings.get(stage, 0.0) + seconds * 1000
 
 
 class GestureClassifier:
-    def __init__(self):
-        self.hands = mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.65,
-            min_tracking_confidence=0.55,
-            model_complexity=1
-        )
-        self._last_letter = None
-        self._stable_count = 0
-        self._stable_threshold = 3  # frames to confirm
-
-    def process_frame(self, frame_bytes: bytes) -> dict:
+    def __init__(
+        self,
+        complexity: int = 1,
+        roi: Optional[dict] = None,
+        motion: Optional[dict] = None,
+        frame_cache: Optional[dict] = None,
+        max_hands: Optional[int] = None,
+    ):
+        self._hands = {}              # model_complexity -> Hands, created on first use
+        self.complexity = complexity
+        self.max_hands = max_hands if max_hands is not None else load_hands_config()["max_hands"]
+        self.roi_config = roi if roi is not None else load_roi_config()
+        self.roi: Optional[Box] = None  # crop around the tracked hand; None → full frame
+        self.frame_size = None        # (width, height) of the last decoded frame
+        self.stability = StabilityFilter(threshold=3)
+        motion = motion if motion is not None else load_motion_config()
+        self.motion = MotionTracker(**motion) if motion["enabled"] else None  # J / Z trajectories
+        # Two-hand mode: stability and motion per hand instead of the two above
+        self.hand_states = HandStates(self.max_hands, 3, motion) if self.max_hands > 1 else None
+        frame_cache = frame_cache if frame_cache is not None else load_frame_cache_config()
+        self.frame_cache = FrameCache(**frame_cache) if frame_cache["enabled"] else None
+        self.roi_frames = 0           # frames tracked inside the crop
+        self.full_frames = 0          # frames run on the whole image
+        self.roi_misses = 0           # crops that lost the hand (retried full-frame)
+
+    @property
+    def hands(self):
+        """MediaPipe Hands at the current model complexity."""
+        hands = self._hands.get(self.complexity)
+        if hands is None:
+            hands = self._hands[self.complexity] = mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.max_hands,
+                min_detection_confidence=0.65,
+                min_tracking_confidence=0.55,
+                model_complexity=self.complexity
+            )
+        return hands
+
+    def set_complexity(self, complexity: int):
+        """Switch between the full (1) and lite (0) landmark model."""
+        if complexity != self.complexity:
+            self.complexity = complexity
+            # This instance's tracking state is from an older part of the stream
+            self._reset_tracking()
+
+    @property
+    def graphs(self) -> int:
+        """Resident Hands graphs (one per model complexity used)."""
+        return len(self._hands)
+
+    def close_idle_graphs(self) -> int:
+        """Close the graphs not at the current complexity; returns how many."""
+        idle = [c for c in self._hands if c != self.complexity]
+        for complexity in idle:
+            self._hands.pop(complexity).close()
+        return len(idle)
+
+    def _lost_hand(self):
+        # A gap in the hand breaks both the stable streak and any trajectory
+        self.stability.reset()
+        if self.motion is not None:
+            self.motion.reset()
+        if self.hand_states is not None:
+            self.hand_states.reset()
+
+    def _reset_tracking(self):
+        # Drop MediaPipe's previous-frame ROI so the next frame starts with detection
+        if hasattr(self.hands, "reset"):
+            self.hands.reset()
+
+    def detect(self, img_rgb: np.ndarray):
+        """Run MediaPipe on an RGB image. Returns the first hand's landmarks, or None if no hand."""
+        result = self.hands.process(img_rgb)
+        if not result.multi_hand_landmarks:
+            self._lost_hand()
+            return None
+        return result.multi_hand_landmarks[0].landmark
+
+    def _found(self, result) -> Optional[tuple]:
+        """(N, 21, 3) landmarks and handedness labels from a Hands result, or None if no hand."""
+        found = result.multi_hand_landmarks
+        if not found:
+            return None
+        hands = np.stack([landmarks_to_array(hand.landmark) for hand in found[:self.max_hands]])
+        handedness = result.multi_handedness or ()
+        labels = [entry.classification[0].label for entry in handedness[:len(hands)]]
+        return hands, labels + [None] * (len(hands) - len(labels))
+
+    def detect_frame(self, frame_bytes, timings: dict) -> Optional[tuple]:
+        """
+        Decode and track one encoded frame. While every hand is tracked only
+        the padded box around them is decoded (at reduced JPEG scale) and
+        processed; otherwise, or when the crop loses a hand, the whole frame is.
+        Returns ((N, 21, 3) full-frame landmarks, handedness labels) or None;
+        adds decode/detect ms to timings.
+        """
+        clock = time.perf_counter
+        config = self.roi_config
+        if self.roi is not None:
+            t0 = clock()
+            crop, box, size = decode_region(frame_bytes, self.roi, self.frame_size, config["min_side"])
+            t1 = clock()
+            _add_ms(timings, "decode", t1 - t0)
+            if crop is None:
+                return None
+            self.frame_size = size
+            found = self._found(self.hands.process(crop))
+            _add_ms(timings, "detect", clock() - t1)
+            if found is not None and len(found[0]) == self.max_hands:
+                self.roi_frames += 1
+                hands = map_to_frame(found[0], box)
+                self._follow(hands)
+                return hands, found[1]
+            # Lost a hand inside the crop: retry this frame on the full image
+            self.roi_misses += 1
+            self.roi = None
+            self._reset_tracking()
+
+        t0 = clock()
+        img_rgb, size = decode_full(frame_bytes, self.frame_size, config["full_min_side"])
+        t1 = clock()
+        _add_ms(timings, "decode", t1 - t0)
+        if img_rgb is None:
+            return None
+        self.frame_size = size
+        self.full_frames += 1
+        found = self._found(self.hands.process(img_rgb))
+        _add_ms(timings, "detect", clock() - t1)
+        if found is None:
+            self._lost_hand()
+            return None
+        self._follow(found[0])
+        return found
+
+    def _follow(self, hands: np.ndarray):
+        """Move the crop box to the (N, 21, 3) hands when they near its edge (or on first sight)."""
+        if not self.roi_config["enabled"]:
+            return
+        if len(hands) < self.max_hands:
+            # A hand is missing: it can only be found again in the whole frame
+            if self.roi is not None:
+                self.roi = None
+                self._reset_tracking()
+            return
+        tight = hand_box(hands.reshape(-1, 3))
+        if self.roi is None or should_move(self.roi, tight):
+            self.roi = padded_box(tight, self.frame_size, self.roi_config["padding"])
+            # MediaPipe's tracking is relative to the image it saw; the image moved
+            self._reset_tracking()
+
+    def roi_stats(self) -> dict:
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "roi_misses": self.roi_misses,
+        }
+
+    def finalize(self, landmarks: np.ndarray, letter: Optional[str], confidence: float) -> dict:
+        """Apply motion gestures and the stability filter to a raw prediction and build the result dict."""
+        return stream_result(landmarks, letter, confidence, self.stability, self.motion)
+
+    def finalize_hands(self, hands: np.ndarray, labels: list, predictions: list) -> dict:
+        """finalize() for a frame's (N, 21, 3) hands, their handedness and [(letter, confidence), ...]."""
+        if self.hand_states is None:
+            return self.finalize(hands[0], *predictions[0])
+        return self.hand_states.result(hands, labels, predictions)
+
+    def no_hand(self) -> dict:
+        """Result for a frame without a hand."""
+        return dict(NO_HAND) if self.hand_states is None else self.hand_states.no_hand()
+
+    # ─── Frame cache ─────────────────────────────────────────────────────────
+
+    def reuse(self, frame_bytes, timings: dict) -> Optional[tuple]:
+        """
+        (hands or None, (handedness, predictions)) of the last processed frame
+        if this one is a near duplicate of it, else None. Fingerprinting counts as decode.
         """
-        Process a raw JPEG frame and return classification result.
+        if self.frame_cache is None:
+            return None
+        t0 = time.perf_counter()
+        cached = self.frame_cache.check(frame_bytes, self.roi, self.frame_size, time.monotonic())
+        _add_ms(timings, "decode", time.perf_counter() - t0)
+        return cached
+
+    def remember(self, hands: Optional[np.ndarray], prediction: Optional[tuple] = None):
+        """Keep a processed frame's (N, 21, 3) hands and (handedness, predictions) for near-duplicate frames."""
+        if self.frame_cache is not None:
+            self.frame_cache.store(hands, prediction)
+
+    def replay(self, hands: Optional[np.ndarray], prediction: Optional[tuple], timings: dict) -> dict:
+        """Result for a frame reusing a cached detection; stability and motion still advance."""
+        if hands is None:
+            return self.no_hand()
+        t0 = time.perf_counter()
+        result = self.finalize_hands(hands, *prediction)
+        timings["serialize"] = (time.perf_counter() - t0) * 1000
+        return result
+
+    def process_frame(self, frame_bytes) -> dict:
+        """
+        Process a raw JPEG/WebP frame (bytes or memoryview) and return classification result.
         Returns dict with keys: hand_detected, letter, confidence, landmarks
+        ((21, 3) array, see backend/results.py) and, with two hands, "hands"
+        (plus per-stage milliseconds under "_timings").
         """
+        clock = time.perf_counter
+        timings = {}
         try:
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            if img is None:
-                return {"hand_detected": False, "letter": None, "confidence": 0.0, "landmarks": []}
-
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            result = self.hands.process(img_rgb)
-
-            if not result.multi_hand_landmarks:
-                self._last_letter = None
-                self._stable_count = 0
-                return {"hand_detected": False, "letter": None, "confidence": 0.0, "landmarks": []}
-
-            lm = result.multi_hand_landmarks[0].landmark
-            letter, confidence = classify_gesture(lm)
-
-            # Stability filter — require consistent prediction
-            if letter == self._last_letter:
-                self._stable_count += 1
-            else:
-                self._last_letter = letter
-                self._stable_count = 1
-
-            stable = self._stable_count >= self._stable_threshold
-
-            # Serialize landmarks
-            landmarks = [
-                {"x": l.x, "y": l.y, "z": l.z}
-                for l in lm
-            ]
-
-            return {
-                "hand_detected": True,
-                "letter": letter if stable else None,
-                "pending_letter": letter,  # raw prediction before stability
-                "confidence": round(confidence, 3) if stable else 0.0,
-                "landmarks": landmarks,
-                "stable": stable
-            }
+            cached = self.reuse(frame_bytes, timings)
+            if cached is not None:
+                return {**self.replay(*cached, timings), "_timings": timings}
+            found = self.detect_frame(frame_bytes, timings)
+            if found is None:
+                self.remember(None)
+                return {**self.no_hand(), "_timings": timings}
+
+            hands, labels = found
+            t0 = clock()
+            predictions = classify_gestures(hands)
+            t1 = clock()
+            timings["classify"] = (t1 - t0) * 1000
+            self.remember(hands, (labels, predictions))
+            result = self.finalize_hands(hands, labels, predictions)
+            timings["serialize"] = (clock() - t1) * 1000
+            result["_timings"] = timings
+            return result
 
         except Exception as e:
-            return {"hand_detected": False, "letter": None, "confidence": 0.0, "landmarks": [], "error": str(e)}
+            return {**NO_HAND, "error": str(e), "_timings": timings}
 
     def process_base64_frame(self, b64_data: str) -> dict:
         """Accepts base64-encoded JPEG/PNG string."""
         try:
-            # Strip data URL prefix if present
-            if "," in b64_data:
-                b64_data = b64_data.split(",", 1)[1]
-            frame_bytes = base64.b64decode(b64_data)
-            return self.process_frame(frame_bytes)
+            t0 = time.perf_counter()
+            frame = decode_base64_frame(b64_data)
+            b64_ms = (time.perf_counter() - t0) * 1000
+            result = self.process_frame(frame)
+            timings = result["_timings"]
+            timings["decode"] = timings.get("decode", 0.0) + b64_ms
+            return result
         except Exception as e:
-            return {"hand_detected": False, "letter": None, "confidence": 0.0, "error": str(e), "landmarks": []}
+            return {**NO_HAND, "error": str(e)}
+
+    def reset(self):
+        """Forget stability and tracking state so the instance can serve a new stream."""
+        self._lost_hand()
+        self.roi = None
+        self.frame_size = None
+        if self.frame_cache is not None:
+            self.frame_cache.clear()
+        for hands in self._hands.values():
+            if hasattr(hands, "reset"):
+                hands.reset()
 
     def close(self):
-        self.hands.close()
+        for hands in self._hands.values():
+            hands.close()
+        self._hands.clear()
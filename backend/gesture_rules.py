@@ -0,0 +1,271 @@
+"""
+HUSH Gesture Rules
+Declarative rule table for the ISL alphabet and its compiled dispatch table.
+
+Each rule names a letter, a fixed confidence, the finger-state pattern it
+applies to and an optional geometric check. Patterns are five characters in
+thumb/index/middle/ring/pinky order: "1" extended, "0" folded, "." either.
+Rules keep the priority order of the original hand-written cascade.
+
+At import the table is compiled into DISPATCH: for each of the 32 finger-state
+bitmasks, the ordered list of rules that can still fire for that mask, cut off
+after the first rule without a check. Classifying a hand is then one mask
+computation plus the few geometric checks relevant to that mask. Rules that no
+mask can ever reach are collected in UNREACHABLE; print the report with
+
+    python -m backend.gesture_rules
+
+Checks take (X, Y, Z) indexed by landmark number. For a single hand these are
+plain lists of floats; for a batch they are (21, N) arrays, so the same rule
+code serves classify_hand() and classify_landmarks().
+"""
+
+import math
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from backend.landmarks import (
+    WRIST,
+    THUMB_IP, THUMB_TIP,
+    INDEX_MCP, INDEX_PIP, INDEX_TIP,
+    MIDDLE_MCP, MIDDLE_PIP, MIDDLE_TIP,
+    RING_PIP, RING_TIP,
+    PINKY_PIP, PINKY_TIP,
+    as_batch,
+)
+
+FINGERS = "TIMRP"
+
+
+class Rule(NamedTuple):
+    letter: str
+    confidence: float
+    pattern: str                       # e.g. "01100" — see module docstring
+    check: Optional[Callable] = None   # (X, Y, Z) -> bool / bool array
+    min_up: int = 0                    # minimum number of extended fingers
+
+
+# ─── Geometric checks ────────────────────────────────────────────────────────
+
+def _dist(X, Y, Z, a, b):
+    sq = (X[a] - X[b]) ** 2 + (Y[a] - Y[b]) ** 2 + (Z[a] - Z[b]) ** 2
+    # math.sqrt is much cheaper than a NumPy ufunc call on a single float
+    return math.sqrt(sq) if type(sq) is float else np.sqrt(sq)
+
+
+def _touching(a, b, threshold):
+    return lambda X, Y, Z: _dist(X, Y, Z, a, b) < threshold
+
+
+def _index_level(X, Y, Z):
+    # Index roughly horizontal (tip.y ≈ MCP.y)
+    return abs(Y[INDEX_TIP] - Y[INDEX_MCP]) < 0.07
+
+
+def _index_down(X, Y, Z):
+    return Y[INDEX_TIP] > Y[WRIST]
+
+
+def _o_shape(X, Y, Z):
+    return (
+        (_dist(X, Y, Z, INDEX_TIP, THUMB_TIP) < 0.07)
+        & (_dist(X, Y, Z, MIDDLE_TIP, THUMB_TIP) < 0.10)
+        & (_dist(X, Y, Z, RING_TIP, THUMB_TIP) < 0.10)
+    )
+
+
+def _thumb_between(X, Y, Z):
+    return (X[THUMB_TIP] > X[INDEX_MCP]) & (X[THUMB_TIP] < X[MIDDLE_MCP])
+
+
+# ─── Rule table (priority order) ─────────────────────────────────────────────
+
+RULES = (
+    # A: Fist, thumb to the side
+    Rule("A", 0.82, "00000"),
+    # S: Fist with thumb over fingers
+    Rule("S", 0.78, "10000", lambda X, Y, Z: Y[THUMB_TIP] > Y[INDEX_MCP]),
+    # B: 4 fingers up, thumb folded
+    Rule("B", 0.85, "01111", lambda X, Y, Z: abs(X[INDEX_TIP] - X[PINKY_TIP]) < 0.15),
+    # L: Index up + thumb out
+    Rule("L", 0.83, "11000"),
+    # Y: Thumb + pinky extended (shaka)
+    Rule("Y", 0.87, "10001"),
+    # I: Only pinky up
+    Rule("I", 0.84, "00001"),
+    # D: Index up, thumb touches middle
+    Rule("D", 0.80, "01000", _touching(THUMB_TIP, MIDDLE_TIP, 0.07)),
+    # G: Index horizontal, thumb parallel
+    Rule("G", 0.75, "01000", _index_level),
+    # X: Index bent/hooked (tip below PIP, so the index reads as folded)
+    Rule("X", 0.78, "00000", lambda X, Y, Z: Y[INDEX_TIP] > Y[INDEX_PIP]),
+    # 1/Index: Index up alone
+    Rule("1", 0.70, "01000"),
+    # V: Index + middle in V
+    Rule("V", 0.85, "01100", lambda X, Y, Z: abs(X[INDEX_TIP] - X[MIDDLE_TIP]) > 0.04),
+    # U: Index + middle together
+    Rule("U", 0.80, "01100"),
+    # R: Index + middle crossed
+    Rule("R", 0.76, "01100", lambda X, Y, Z: X[INDEX_TIP] > X[MIDDLE_TIP]),
+    Rule("U", 0.80, "01100"),
+    # H: Index + middle horizontal
+    Rule("H", 0.75, "01100", _index_level),
+    # K: V with thumb between
+    Rule("K", 0.78, "11100", lambda X, Y, Z: Y[THUMB_TIP] < Y[INDEX_MCP]),
+    # W: 3 fingers spread, then the plain 3-finger variant
+    Rule("W", 0.82, "01110", lambda X, Y, Z: abs(X[INDEX_TIP] - X[RING_TIP]) > 0.07),
+    Rule("W", 0.75, "01110"),
+    # F: OK sign (index+thumb circle, 3 fingers up)
+    Rule("F", 0.82, "01111", _touching(INDEX_TIP, THUMB_TIP, 0.06)),
+    # O: All fingertips touching thumb
+    Rule("O", 0.84, ".....", _o_shape, min_up=3),
+    # C: Curved hand — all fingers curved but not closed
+    Rule("C", 0.70, ".0000"),
+    # E: Fingers bent at middle joint
+    Rule("E", 0.72, "00000"),
+    # M: 3 fingers over thumb
+    Rule("M", 0.68, "00000"),
+    # N: 2 fingers over thumb
+    Rule("N", 0.65, "00000"),
+    # T: Thumb between index+middle
+    Rule("T", 0.73, ".0000", _thumb_between),
+    # P: K shape pointing down
+    Rule("P", 0.70, "11100", _index_down),
+    # Q: G pointing down
+    Rule("Q", 0.68, "11000", _index_down),
+)
+
+
+# ─── Compilation ─────────────────────────────────────────────────────────────
+
+def _matches(rule: Rule, mask: int) -> bool:
+    # Mask bits are thumb (high) … pinky (low), same order as the pattern
+    bits = format(mask, "05b")
+    if bits.count("1") < rule.min_up:
+        return False
+    return all(want in (".", got) for want, got in zip(rule.pattern, bits))
+
+
+def compile_rules(rules=RULES) -> tuple[tuple, list]:
+    """
+    Build the 32-entry dispatch table.
+    Returns (dispatch, unreachable): dispatch[mask] is a tuple of rule numbers
+    to try in order; unreachable lists (rule number, reason) for rules that
+    can never fire.
+    """
+    dispatch = []
+    shadowed_by = {n: set() for n in range(len(rules))}
+    reachable = set()
+    for mask in range(32):
+        entry = []
+        stopper = None
+        for n, rule in enumerate(rules):
+            if not _matches(rule, mask):
+                continue
+            if stopper is not None:
+                shadowed_by[n].add(stopper)
+                continue
+            entry.append(n)
+            reachable.add(n)
+            if rule.check is None:
+                stopper = n
+        dispatch.append(tuple(entry))
+
+    unreachable = []
+    for n, rule in enumerate(rules):
+        if n in reachable:
+            continue
+        if shadowed_by[n]:
+            names = ", ".join(f"{rules[s].letter}#{s}" for s in sorted(shadowed_by[n]))
+            unreachable.append((n, f"shadowed by {names}"))
+        else:
+            unreachable.append((n, "pattern matches no finger state"))
+    return tuple(dispatch), unreachable
+
+
+DISPATCH, UNREACHABLE = compile_rules()
+
+_LETTERS = np.array([rule.letter for rule in RULES] + [None], dtype=object)
+_CONFIDENCES = np.array([rule.confidence for rule in RULES] + [0.0])
+_NO_MATCH = len(RULES)
+
+
+# ─── Classification ──────────────────────────────────────────────────────────
+
+def classify_hand(X, Y, Z) -> tuple[Optional[str], float]:
+    """Classify one hand given per-landmark x, y, z sequences."""
+    # For typical right hand in mirrored (selfie) view
+    mask = (
+        (X[THUMB_TIP] > X[THUMB_IP]) << 4
+        | (Y[INDEX_TIP] < Y[INDEX_PIP]) << 3
+        | (Y[MIDDLE_TIP] < Y[MIDDLE_PIP]) << 2
+        | (Y[RING_TIP] < Y[RING_PIP]) << 1
+        | (Y[PINKY_TIP] < Y[PINKY_PIP])
+    )
+    for n in DISPATCH[mask]:
+        rule = RULES[n]
+        if rule.check is None or rule.check(X, Y, Z):
+            return (rule.letter, rule.confidence)
+    return (None, 0.0)
+
+
+def state_masks(X, Y) -> np.ndarray:
+    """(21, N) coordinate arrays → (N,) finger-state bitmasks."""
+    return (
+        (X[THUMB_TIP] > X[THUMB_IP]).astype(np.intp) << 4
+        | (Y[INDEX_TIP] < Y[INDEX_PIP]).astype(np.intp) << 3
+        | (Y[MIDDLE_TIP] < Y[MIDDLE_PIP]).astype(np.intp) << 2
+        | (Y[RING_TIP] < Y[RING_PIP]).astype(np.intp) << 1
+        | (Y[PINKY_TIP] < Y[PINKY_PIP]).astype(np.intp)
+    )
+
+
+def classify_landmarks(landmarks) -> list[tuple]:
+    """
+    Classify a batch of hands. Accepts a (21, 3) hand, an (N, 21, 3) batch or
+    a list of hands; returns [(letter, confidence), ...].
+    Hands are grouped by finger-state mask and each group only runs the
+    checks its dispatch entry lists.
+    """
+    # Geometry in float64 so threshold comparisons match the scalar path exactly
+    P = as_batch(landmarks).astype(np.float64)
+    if not len(P):
+        return []
+    X, Y, Z = (P[:, :, k].T for k in range(3))  # each (21, N)
+    masks = state_masks(X, Y)
+    picks = np.full(len(P), _NO_MATCH)
+
+    for mask in np.unique(masks).tolist():
+        idx = np.flatnonzero(masks == mask)
+        for n in DISPATCH[mask]:
+            check = RULES[n].check
+            if check is None:
+                picks[idx] = n
+                break
+            hit = np.asarray(check(X[:, idx], Y[:, idx], Z[:, idx]), dtype=bool)
+            picks[idx[hit]] = n
+            idx = idx[~hit]
+            if not idx.size:
+                break
+
+    return list(zip(_LETTERS[picks].tolist(), _CONFIDENCES[picks].tolist()))
+
+
+def report() -> str:
+    lines = ["mask   fingers  rules tried (in order)"]
+    for mask, entry in enumerate(DISPATCH):
+        up = "".join(f if bit == "1" else "." for f, bit in zip(FINGERS, format(mask, "05b")))
+        tried = " → ".join(
+            RULES[n].letter + ("?" if RULES[n].check else "") for n in entry
+        ) or "(none)"
+        lines.append(f"{mask:2d}     {up}    {tried}")
+    lines.append("")
+    lines.append(f"{len(UNREACHABLE)} unreachable rule(s):")
+    for n, reason in UNREACHABLE:
+        lines.append(f"  {RULES[n].letter}#{n} [{RULES[n].pattern}] – {reason}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(report())
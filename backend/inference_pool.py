@@ -0,0 +1,248 @@
+"""
+HUSH Inference Pool
+Runs MediaPipe frame inference off the asyncio event loop.
+Each worker is a single-threaded executor (thread or process) holding its own
+TrackerPool of per-session GestureClassifiers, so workers never share MediaPipe
+graph state and throughput scales with the worker count. Sessions are pinned
+to one worker for their lifetime so their tracker stays warm.
+
+Configuration (environment):
+  HUSH_INFERENCE_MODE        "thread" (default) or "process"
+  HUSH_INFERENCE_WORKERS     number of workers (default: min(4, CPU count))
+  HUSH_MAX_TRACKERS          resident Hands graphs per worker (default: 8)
+  HUSH_TRACKER_IDLE_SECONDS  idle time before a session's tracker is reclaimed (default: 30)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+INFERENCE_MODES = ("thread", "process")
+_WARM_UP_SESSION = "__warm_up__"
+
+# Worker-local state. A thread worker and a process worker both run exactly one
+# thread, so thread-local storage gives every worker its own tracker pool.
+_local = threading.local()
+
+
+# ─── Worker-side functions (must be top-level for process pickling) ─────────
+
+def _init_worker(max_trackers: int, idle_seconds: float):
+    started = time.perf_counter()
+    from backend.gesture_classifier import GestureClassifier
+    from backend.tracker_pool import TrackerPool
+    _local.import_ms = (time.perf_counter() - started) * 1000  # mediapipe, cv2, ...
+    _local.trackers = TrackerPool(
+        GestureClassifier,
+        max_trackers=max_trackers,
+        idle_seconds=idle_seconds,
+    )
+
+
+def _process_frame(session_id, frame_bytes) -> dict:
+    return _local.trackers.get(session_id).process_frame(frame_bytes)
+
+
+def _process_base64_frame(session_id, b64_data: str) -> dict:
+    return _local.trackers.get(session_id).process_base64_frame(b64_data)
+
+
+def _process_batch(items: list, complexity=None) -> list[dict]:
+    from backend.gesture_classifier import process_batch
+    trackers = _local.trackers
+    results = process_batch(
+        [(trackers.get(session_id), frame) for session_id, frame in items], complexity
+    )
+    if complexity is not None:
+        trackers.trim()  # a switch may have built second graphs past the cap
+    return results
+
+
+def _warm_up() -> dict:
+    """
+    Build a tracker and run a blank frame through both landmark models, then
+    park it as a spare so the first session starts warm. Timings in ms.
+    """
+    import cv2
+    import numpy as np
+    from backend.gesture_classifier import process_batch
+    trackers = _local.trackers
+    started = time.perf_counter()
+    tracker = trackers.get(_WARM_UP_SESSION)
+    built = time.perf_counter()
+    blank = cv2.imencode(".jpg", np.zeros((240, 320, 3), np.uint8))[1].tobytes()
+    for complexity in (0, 1):  # lite first: sessions start on the full model
+        process_batch([(tracker, blank)], complexity)
+    done = time.perf_counter()
+    trackers.release(_WARM_UP_SESSION)
+    return {
+        "import_ms": round(_local.import_ms, 1),
+        "build_ms": round((built - started) * 1000, 1),
+        "first_frames_ms": round((done - built) * 1000, 1),
+    }
+
+
+def _release_session(session_id):
+    _local.trackers.release(session_id)
+
+
+def _worker_stats() -> dict:
+    trackers = _local.trackers
+    stats = trackers.stats()
+    # ROI counters summed over resident trackers
+    roi = {"roi_frames": 0, "full_frames": 0, "roi_misses": 0}
+    for tracker in trackers.trackers():
+        for key, value in tracker.roi_stats().items():
+            roi[key] += value
+    stats["roi"] = roi
+    return stats
+
+
+def _close_worker():
+    trackers = getattr(_local, "trackers", None)
+    if trackers:
+        trackers.close()
+        _local.trackers = None
+
+
+# ─── Config ──────────────────────────────────────────────────────────────────
+
+def load_config() -> dict:
+    """Read pool configuration from the environment."""
+    mode = os.environ.get("HUSH_INFERENCE_MODE", "thread").strip().lower()
+    default_workers = min(4, os.cpu_count() or 1)
+    return {
+        "mode": mode,
+        "workers": int(os.environ.get("HUSH_INFERENCE_WORKERS", default_workers)),
+        "max_trackers": int(os.environ.get("HUSH_MAX_TRACKERS", 8)),
+        "idle_seconds": float(os.environ.get("HUSH_TRACKER_IDLE_SECONDS", 30)),
+    }
+
+
+# ─── Pool ────────────────────────────────────────────────────────────────────
+
+class InferencePool:
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: int = 1,
+        max_trackers: int = 8,
+        idle_seconds: float = 30.0,
+    ):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode '{mode}', expected one of {INFERENCE_MODES}")
+        if workers < 1:
+            raise ValueError("Inference pool needs at least one worker")
+        self.mode = mode
+        self.size = workers
+        self._initargs = (max_trackers, idle_seconds)
+        self._executors = [self._make_executor(n) for n in range(workers)]
+        self._in_flight = [0] * workers
+        self._started = [False] * workers
+        self._sessions = [0] * workers
+        self._assignment = {}  # session_id -> worker index
+
+    def _make_executor(self, n: int) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self._initargs,
+            )
+        return ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"hush-infer-{n}",
+            initializer=_init_worker,
+            initargs=self._initargs,
+        )
+
+    def worker_for(self, session_id) -> int:
+        """
+        Pin a session to the worker with the fewest sessions on first use.
+        Admission caps /ws sessions at workers × max_trackers (backend/admission.py),
+        so that worker always has a tracker for it.
+        """
+        idx = self._assignment.get(session_id)
+        if idx is None:
+            idx = min(range(self.size), key=lambda n: (self._sessions[n], self._in_flight[n]))
+            self._assignment[session_id] = idx
+            self._sessions[idx] += 1
+        return idx
+
+    async def _run(self, idx: int, fn, *args):
+        loop = asyncio.get_running_loop()
+        self._in_flight[idx] += 1
+        self._started[idx] = True
+        try:
+            return await loop.run_in_executor(self._executors[idx], fn, *args)
+        finally:
+            self._in_flight[idx] -= 1
+
+    async def process_frame(self, session_id, frame_bytes) -> dict:
+        """
+        Classify raw JPEG/WebP bytes on the session's worker.
+        Thread workers decode straight from the caller's buffer (memoryview is
+        fine); process workers need a picklable copy.
+        """
+        if self.mode == "process" and isinstance(frame_bytes, memoryview):
+            frame_bytes = frame_bytes.tobytes()
+        idx = self.worker_for(session_id)
+        return await self._run(idx, _process_frame, session_id, frame_bytes)
+
+    async def process_base64_frame(self, session_id, b64_data: str) -> dict:
+        """Classify a base64 frame on the session's worker without blocking the event loop."""
+        idx = self.worker_for(session_id)
+        return await self._run(idx, _process_base64_frame, session_id, b64_data)
+
+    async def process_batch(self, idx: int, items: list, complexity=None) -> list[dict]:
+        """
+        Run a batch of (session_id, frame) pairs on worker idx, where every
+        session is pinned to that worker. Frames are raw bytes or base64 str.
+        complexity (0 lite / 1 full), if given, selects the landmark model.
+        """
+        if self.mode == "process":
+            items = [
+                (sid, frame.tobytes() if isinstance(frame, memoryview) else frame)
+                for sid, frame in items
+            ]
+        return await self._run(idx, _process_batch, items, complexity)
+
+    async def warm_up(self) -> list[dict]:
+        """Start every worker and run a blank frame through it, all at once (timings per worker)."""
+        return list(await asyncio.gather(*(self._run(idx, _warm_up) for idx in range(self.size))))
+
+    def release_session(self, session_id):
+        """Hand the session's tracker back to its worker's pool."""
+        idx = self._assignment.pop(session_id, None)
+        if idx is None:
+            return
+        self._sessions[idx] -= 1
+        self._executors[idx].submit(_release_session, session_id)
+
+    async def worker_stats(self) -> list:
+        """Tracker pool stats from every worker that has started."""
+        return [
+            await self._run(idx, _worker_stats)
+            for idx in range(self.size) if self._started[idx]
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.size,
+            "in_flight": sum(self._in_flight),
+            "sessions_per_worker": list(self._sessions),
+        }
+
+    def close(self):
+        for ex, started in zip(self._executors, self._started):
+            if started:
+                try:
+                    ex.submit(_close_worker).result(timeout=5)
+                except Exception:
+                    pass
+            ex.shutdown(wait=True, cancel_futures=True)
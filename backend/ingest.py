@@ -0,0 +1,80 @@
+"""
+HUSH Frame Ingest
+Per-session latest-frame-wins buffering between the WebSocket reader and
+the inference pool. A session holds at most one pending frame: a newer frame
+replaces (drops) the older one, so under load results stay current instead
+of latency growing with a backlog of queued frames.
+"""
+
+import asyncio
+import time
+from typing import NamedTuple, Optional
+
+
+class PendingFrame(NamedTuple):
+    frame_id: int
+    payload: object      # memoryview of image bytes, or base64 str
+    binary: bool
+    received_at: float   # time.monotonic() when the frame arrived
+
+
+class LatestFrameSlot:
+    def __init__(self):
+        self._frame: Optional[PendingFrame] = None
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+        self.errors = 0
+        self.cache_hits = 0  # frames answered from the worker's frame cache
+        self.in_flight = 0   # frames handed to the scheduler, result not sent yet
+        self.last_queue_age = 0.0
+
+    @property
+    def pending(self) -> int:
+        return 1 if self._frame is not None else 0
+
+    def pending_age(self) -> float:
+        """Seconds the pending frame (if any) has been waiting."""
+        frame = self._frame
+        return time.monotonic() - frame.received_at if frame is not None else 0.0
+
+    def put(self, frame: PendingFrame) -> bool:
+        """Store the newest frame. Returns True if an older pending frame was dropped."""
+        dropped = self._frame is not None
+        if dropped:
+            self.dropped += 1
+        self._frame = frame
+        self.received += 1
+        self._ready.set()
+        return dropped
+
+    async def get(self) -> Optional[PendingFrame]:
+        """Wait for the newest frame; returns None once the slot is closed."""
+        while self._frame is None:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        frame, self._frame = self._frame, None
+        self.last_queue_age = time.monotonic() - frame.received_at
+        return frame
+
+    def close(self):
+        self._closed = True
+        self._frame = None
+        self._ready.set()
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "pending_age_ms": round(self.pending_age() * 1000, 1),
+            "last_queue_age_ms": round(self.last_queue_age * 1000, 1),
+        }
@@ -0,0 +1,67 @@
+"""
+HUSH Landmark Arrays
+Array representation of MediaPipe hand landmarks and vectorized geometry
+helpers over batches of hands.
+
+A hand is a float32 array of shape (21, 3) holding (x, y, z) per landmark; a
+batch is (N, 21, 3). The batched classifier built on these lives in
+backend/gesture_rules.py.
+"""
+
+import numpy as np
+
+# Landmark indices
+WRIST = 0
+THUMB_CMC, THUMB_MCP, THUMB_IP, THUMB_TIP = 1, 2, 3, 4
+INDEX_MCP, INDEX_PIP, INDEX_DIP, INDEX_TIP = 5, 6, 7, 8
+MIDDLE_MCP, MIDDLE_PIP, MIDDLE_DIP, MIDDLE_TIP = 9, 10, 11, 12
+RING_MCP, RING_PIP, RING_DIP, RING_TIP = 13, 14, 15, 16
+PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP = 17, 18, 19, 20
+
+NUM_LANDMARKS = 21
+FINGERTIPS = (THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP)
+# Positions of each fingertip within FINGERTIPS
+_T, _I, _M, _R, _P = range(5)
+
+
+def landmarks_to_array(lm) -> np.ndarray:
+    """Convert a MediaPipe landmark list (or any objects with .x/.y/.z) to a (21, 3) float32 array."""
+    return np.array([(l.x, l.y, l.z) for l in lm], dtype=np.float32)
+
+
+def as_batch(landmarks) -> np.ndarray:
+    """Coerce a (21, 3) hand, an (N, 21, 3) batch or a list of hands to an (N, 21, 3) array."""
+    arr = np.asarray(landmarks, dtype=np.float32)
+    if arr.ndim == 2:
+        arr = arr[None]
+    if arr.ndim != 3 or arr.shape[1:] != (NUM_LANDMARKS, 3):
+        raise ValueError(f"Expected landmarks of shape (N, 21, 3), got {arr.shape}")
+    return arr
+
+
+def serialize_landmarks(arr: np.ndarray) -> list[dict]:
+    """(21, 3) array → [{"x", "y", "z"}, ...] as sent to clients."""
+    return [{"x": x, "y": y, "z": z} for x, y, z in arr.tolist()]
+
+
+def finger_states_array(P: np.ndarray) -> np.ndarray:
+    """(N, 21, 3) → (N, 5) bool: thumb, index, middle, ring, pinky extended."""
+    X, Y = P[..., 0], P[..., 1]
+    states = np.empty((P.shape[0], 5), dtype=bool)
+    # For typical right hand in mirrored (selfie) view
+    states[:, _T] = X[:, THUMB_TIP] > X[:, THUMB_IP]
+    states[:, _I] = Y[:, INDEX_TIP] < Y[:, INDEX_PIP]
+    states[:, _M] = Y[:, MIDDLE_TIP] < Y[:, MIDDLE_PIP]
+    states[:, _R] = Y[:, RING_TIP] < Y[:, RING_PIP]
+    states[:, _P] = Y[:, PINKY_TIP] < Y[:, PINKY_PIP]
+    return states
+
+
+def tip_distances(P: np.ndarray) -> np.ndarray:
+    """(N, 21, 3) → (N, 5, 5) pairwise Euclidean distances between fingertips."""
+    # Coordinate-major (3, N, 5) keeps each broadcast on contiguous memory
+    tx, ty, tz = np.moveaxis(P[:, FINGERTIPS, :], -1, 0)
+    dx = tx[:, :, None] - tx[:, None, :]
+    dy = ty[:, :, None] - ty[:, None, :]
+    dz = tz[:, :, None] - tz[:, None, :]
+    return np.sqrt(dx * dx + dy * dy + dz * dz)
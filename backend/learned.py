@@ -0,0 +1,319 @@
+"""
+HUSH Learned Classifier
+Data-driven alternative to the rule table: nearest-neighbour classification
+of normalized landmark features against an index trained from labelled hands.
+
+Features (70 per hand): the 20 non-wrist landmarks relative to the wrist and
+the 10 pairwise fingertip distances, all divided by the hand length (wrist →
+middle MCP, in x/y), then standardized with the training mean and spread.
+Orientation is kept on purpose — H/U and G/1 differ only by it.
+
+Two index kinds, both a single compressed .npz:
+  centroid  up to `prototypes` k-means centres per letter (tiny; default)
+  knn       every training vector (float16) with k-nearest-neighbour voting
+Feature vectors are too wide for trees to prune well, so both are searched
+by brute force: one matrix product per batch of hands.
+
+Confidence is data-driven: for centroid, d2 / (d1 + d2) from the distances
+to the nearest and the nearest other letter; for knn, the distance-weighted
+vote share. Hands farther from every letter than its training radius get
+(None, 0.0), like a hand no rule matches.
+
+Training:
+
+    python -m backend.learned train labelled.jsonl [more.jsonl|.npz ...] --out index.npz
+        [--kind centroid|knn] [--prototypes 4] [--k 5] [--label-field label]
+
+JSONL rows carry "landmarks" (see backend/protocol.py) and a label field; an
+.npz carries "hands" (N, 21, 3) and "labels" (N,). Offline-pipeline output
+(`python -m backend.offline --landmarks`) works with --label-field letter,
+after correcting the letters.
+
+Configuration (environment):
+  HUSH_CLASSIFIER        rules | learned (default: rules)
+  HUSH_CLASSIFIER_INDEX  index file for the learned classifier
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Callable, Optional
+
+import numpy as np
+
+from backend.gesture_rules import classify_landmarks
+from backend.landmarks import MIDDLE_MCP, WRIST, as_batch, tip_distances
+
+INDEX_VERSION = 1
+_TIP_PAIRS = np.triu_indices(5, k=1)
+_CHUNK = 1024  # hands per distance matrix
+
+
+def load_config() -> dict:
+    return {
+        "classifier": os.environ.get("HUSH_CLASSIFIER", "rules").strip().lower(),
+        "index": os.environ.get("HUSH_CLASSIFIER_INDEX", ""),
+    }
+
+
+def hand_features(landmarks) -> np.ndarray:
+    """(21, 3) / (N, 21, 3) landmarks → (N, 70) float32 features (unstandardized)."""
+    P = as_batch(landmarks)
+    length = np.hypot(*(P[:, MIDDLE_MCP, :2] - P[:, WRIST, :2]).T)
+    scale = 1.0 / np.maximum(length, 1e-6)
+    relative = (P[:, 1:] - P[:, WRIST:WRIST + 1]) * scale[:, None, None]
+    tips = tip_distances(P)[:, _TIP_PAIRS[0], _TIP_PAIRS[1]] * scale[:, None]
+    return np.concatenate([relative.reshape(len(P), 60), tips], axis=1).astype(np.float32)
+
+
+def _sq_distances(X: np.ndarray, V: np.ndarray, v_norms: np.ndarray) -> np.ndarray:
+    """(N, F) × (M, F) → (N, M) squared Euclidean distances."""
+    d = X @ V.T
+    d *= -2.0
+    d += (X * X).sum(axis=1)[:, None]
+    d += v_norms
+    return np.maximum(d, 0.0, out=d)
+
+
+def _kmeans(X: np.ndarray, k: int, rng: np.random.Generator, iterations: int = 25) -> np.ndarray:
+    """Lloyd's k-means with k-means++ seeding; returns (k, F) centres."""
+    centres = [X[rng.integers(len(X))]]
+    for _ in range(1, k):
+        C = np.array(centres)
+        d = _sq_distances(X, C, (C * C).sum(axis=1)).min(axis=1)
+        if not d.sum():
+            break
+        centres.append(X[rng.choice(len(X), p=d / d.sum())])
+    C = np.array(centres)
+    for _ in range(iterations):
+        assign = _sq_distances(X, C, (C * C).sum(axis=1)).argmin(axis=1)
+        moved = np.array([X[assign == c].mean(axis=0) if (assign == c).any() else C[c] for c in range(len(C))])
+        if np.allclose(moved, C):
+            break
+        C = moved
+    return C
+
+
+class LearnedClassifier:
+    """A trained index; classify() has the same contract as classify_landmarks()."""
+
+    def __init__(self, kind: str, mean, std, vectors, labels, radius, k: int = 5):
+        if kind not in ("centroid", "knn"):
+            raise ValueError(f"Unknown index kind {kind!r}")
+        self.kind = kind
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        # Vectors grouped by letter, so per-letter minima are one reduceat
+        labels = np.asarray(labels).astype(str)
+        order = np.argsort(labels, kind="stable")
+        self.vectors = np.asarray(vectors, dtype=np.float32)[order]
+        self.labels = labels[order]
+        self.radius = np.asarray(radius, dtype=np.float32)  # per letter (centroid) or scalar (knn)
+        self.k = min(k, len(self.vectors))
+        self.letters, self._label_ids = np.unique(self.labels, return_inverse=True)
+        self._letter_starts = np.flatnonzero(np.r_[True, np.diff(self._label_ids) != 0])
+        self._norms = (self.vectors * self.vectors).sum(axis=1)
+
+    # ─── Training ────────────────────────────────────────────────────────────
+
+    @classmethod
+    def train(cls, hands, labels, kind: str = "centroid", prototypes: int = 4, k: int = 5, seed: int = 0):
+        features = hand_features(hands)
+        labels = np.asarray(labels).astype(str)
+        if len(features) != len(labels) or not len(labels):
+            raise ValueError("Need the same, non-zero number of hands and labels")
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-6
+        X = (features - mean) / std
+        rng = np.random.default_rng(seed)
+
+        if kind == "centroid":
+            vectors, owners = [], []
+            for letter in np.unique(labels):
+                members = X[labels == letter]
+                centres = _kmeans(members, min(prototypes, len(members)), rng)
+                vectors.append(centres)
+                owners += [letter] * len(centres)
+            vectors, owners = np.concatenate(vectors), np.array(owners)
+            clf = cls(kind, mean, std, vectors, owners, np.zeros(0), k)
+            # Radius: generous margin over how far a letter's own hands sit from it
+            nearest = np.sqrt(clf._class_distances(X))[np.arange(len(X)), np.searchsorted(clf.letters, labels)]
+            clf.radius = np.array([
+                1.5 * np.percentile(nearest[labels == letter], 95) for letter in clf.letters
+            ], dtype=np.float32)
+            return clf
+
+        clf = cls(kind, mean, std, X, labels, np.zeros(0), k)
+        # Radius from nearest-other-neighbour distances on a sample of the data
+        sample = rng.choice(len(X), size=min(2000, len(X)), replace=False)
+        d = _sq_distances(clf.vectors[sample], clf.vectors, clf._norms)
+        d[np.arange(len(sample)), sample] = np.inf
+        nearest = np.sqrt(d.min(axis=1)) if len(X) > 1 else np.zeros(1)
+        clf.radius = np.float32(1.5 * np.percentile(nearest, 95))
+        return clf
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def save(self, path: str):
+        with open(path, "wb") as f:  # a file object keeps numpy from appending ".npz"
+            np.savez_compressed(
+                f,
+                version=INDEX_VERSION,
+                kind=self.kind,
+                mean=self.mean,
+                std=self.std,
+                vectors=self.vectors.astype(np.float16) if self.kind == "knn" else self.vectors,
+                labels=self.labels,
+                radius=self.radius,
+                k=self.k,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LearnedClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"{path}: unsupported index version {int(data['version'])}")
+            return cls(
+                str(data["kind"]), data["mean"], data["std"], data["vectors"],
+                data["labels"], data["radius"], int(data["k"]),
+            )
+
+    # ─── Inference ───────────────────────────────────────────────────────────
+
+    def _class_distances(self, X: np.ndarray) -> np.ndarray:
+        """(N, F) standardized → (N, letters) squared distance to each letter's nearest prototype."""
+        return np.minimum.reduceat(_sq_distances(X, self.vectors, self._norms), self._letter_starts, axis=1)
+
+    def _classify_block(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        rows = np.arange(len(X))
+        if self.kind == "centroid":
+            d = np.sqrt(self._class_distances(X))
+            order = np.argsort(d, axis=1)
+            best, d1 = order[:, 0], d[rows, order[:, 0]]
+            d2 = d[rows, order[:, 1]] if d.shape[1] > 1 else d1 + 1.0
+            confidence = d2 / np.maximum(d1 + d2, 1e-12)
+            known = d1 <= self.radius[best]
+            return np.where(known, best, -1), np.where(known, confidence, 0.0)
+
+        d = _sq_distances(X, self.vectors, self._norms)
+        near = np.argpartition(d, self.k - 1, axis=1)[:, :self.k] if self.k < d.shape[1] \
+            else np.broadcast_to(np.arange(d.shape[1]), d.shape)
+        near_d = np.sqrt(d[rows[:, None], near])
+        weights = 1.0 / (near_d + 1e-6)
+        votes = np.zeros((len(X), len(self.letters)))
+        np.add.at(votes, (rows[:, None], self._label_ids[near]), weights)
+        best = votes.argmax(axis=1)
+        confidence = votes[rows, best] / votes.sum(axis=1)
+        known = near_d.min(axis=1) <= self.radius
+        return np.where(known, best, -1), np.where(known, confidence, 0.0)
+
+    def classify(self, landmarks) -> list[tuple]:
+        """Batch of hands → [(letter or None, confidence), ...]."""
+        features = hand_features(landmarks)
+        if not len(features):
+            return []
+        X = (features - self.mean) / self.std
+        letters = self.letters.tolist()
+        results = []
+        for start in range(0, len(X), _CHUNK):
+            picks, confidence = self._classify_block(X[start:start + _CHUNK])
+            results += [
+                (letters[pick] if pick >= 0 else None, conf)
+                for pick, conf in zip(picks.tolist(), np.round(confidence.astype(np.float64), 3).tolist())
+            ]
+        return results
+
+
+# ─── Active classifier ───────────────────────────────────────────────────────
+
+_active: Optional[tuple] = None  # (classify function, description)
+
+
+def _select() -> tuple:
+    config = load_config()
+    if config["classifier"] == "learned":
+        try:
+            clf = LearnedClassifier.load(config["index"])
+            return clf.classify, {"classifier": "learned", "kind": clf.kind, "index": config["index"],
+                                  "letters": len(clf.letters), "vectors": len(clf.vectors)}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Learned classifier unavailable ({e}); using rules", file=sys.stderr)
+    elif config["classifier"] != "rules":
+        print(f"⚠️  Unknown HUSH_CLASSIFIER {config['classifier']!r}; using rules", file=sys.stderr)
+    return classify_landmarks, {"classifier": "rules"}
+
+
+def active_classifier() -> Callable:
+    """
+    The classify function every ingest path uses (per process, chosen from
+    the environment once): the learned index if configured and loadable,
+    otherwise the rule table.
+    """
+    global _active
+    if _active is None:
+        _active = _select()
+    return _active[0]
+
+
+def active_description() -> dict:
+    active_classifier()
+    return dict(_active[1])
+
+
+# ─── Training data ───────────────────────────────────────────────────────────
+
+def load_labelled(paths: list, label_field: str = "label") -> tuple[np.ndarray, np.ndarray]:
+    """Labelled hands from JSONL and/or .npz files → ((N, 21, 3), (N,) labels)."""
+    from backend.protocol import parse_landmark_json
+
+    hands, labels = [], []
+    for path in paths:
+        if path.endswith(".npz"):
+            with np.load(path, allow_pickle=False) as data:
+                hands.append(data["hands"].astype(np.float32).reshape(-1, 21, 3))
+                labels.append(data["labels"].astype(str))
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                label = row.get(label_field)
+                if not label or not row.get("landmarks"):
+                    continue
+                hands.append(parse_landmark_json(row)[1][:1])
+                labels.append(np.array([str(label)]))
+    if not hands:
+        raise ValueError(f"No labelled hands with a {label_field!r} field found")
+    return np.concatenate(hands), np.concatenate(labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train a learned landmark classifier index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="build an index from labelled landmark files")
+    train.add_argument("files", nargs="+", help="labelled JSONL / .npz files")
+    train.add_argument("--out", required=True, help="index file to write (.npz)")
+    train.add_argument("--kind", choices=("centroid", "knn"), default="centroid")
+    train.add_argument("--prototypes", type=int, default=4, help="k-means centres per letter (centroid)")
+    train.add_argument("--k", type=int, default=5, help="neighbours that vote (knn)")
+    train.add_argument("--label-field", default="label", help="JSONL field holding the letter")
+    args = parser.parse_args(argv)
+
+    hands, labels = load_labelled(args.files, args.label_field)
+    clf = LearnedClassifier.train(hands, labels, args.kind, args.prototypes, args.k)
+    clf.save(args.out)
+    accuracy = float(np.mean([letter == label for (letter, _), label in zip(clf.classify(hands), labels)]))
+    print(json.dumps({
+        "index": args.out,
+        "kind": clf.kind,
+        "hands": len(hands),
+        "letters": clf.letters.tolist(),
+        "vectors": len(clf.vectors),
+        "bytes": os.path.getsize(args.out),
+        "training_accuracy": round(accuracy, 4),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,20 @@
 """
 HUSH – FastAPI Backend
 Serves the frontend and provides:
-  - REST API: /api/gestures, /api/stats
-  - WebSocket: /ws  (real-time frame → gesture classification)
-  - Static files: /  (serves frontend/)
+  - REST API: /api/gestures, /api/health (+ /ready), /api/stats, /api/metrics (Prometheus),
+              /api/landmarks/classify, /api/admin/profile (sampling profiler window),
+              /api/offline/jobs (chunked video upload → JSONL labels)
+  - WebSocket: /ws  (real-time frame → gesture classification;
+                     binary frames per backend/protocol.py, base64 text fallback;
+                     ?landmarks=json|packed|none&delta=1 picks the result format;
+                     results carry "word" updates per backend/words.py;
+                     sessions, frame rate and frames in flight are capped per backend/admission.py)
+  - WebSocket: /ws/landmarks  (client-side hand tracking → classification only)
+  - Static files: /  (serves frontend/ from memory, precompressed, per backend/assets.py)
 """
 
 import asyncio
+import itertools
 import json
 import os
 import time
@@ -14,40 +22,162 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+_import_started = time.perf_counter()  # for the startup report; MediaPipe / cv2 load in the workers
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 
-from backend.gesture_classifier import GestureClassifier
+from backend.admission import WS_TRY_AGAIN_LATER, AdmissionControl, load_config as load_admission_config
+from backend.assets import AssetIndex, build_asset, load_config as load_assets_config, respond
+from backend.control import FrameRateController, load_config as load_control_config
+from backend.inference_pool import InferencePool, load_config
+from backend.ingest import LatestFrameSlot, PendingFrame
 from backend.isl_gestures import ISL_ALPHABET, LETTER_LIST
+from backend.metrics import LATENCY_BUCKETS_MS, HistogramSet, PrometheusText
+from backend.motion import MotionTracker, load_config as load_motion_config
+from backend.offline import OfflineJobs, TooManyJobs, UploadTooLarge, load_config as load_offline_config
+from backend.profiler import Profiler, ProfilerBusy, load_config as load_profiler_config
+from backend.protocol import (
+    FrameProtocolError,
+    ResultEncoder,
+    decode_frame_message,
+    decode_landmark_array,
+    decode_landmark_message,
+    parse_landmark_json,
+)
+from backend.learned import active_classifier, active_description
+from backend.recorder import Recorder, Recording, load_config as load_recorder_config
+from backend.results import HandStates, StabilityFilter, landmark_result, load_config as load_hands_config
+from backend.scheduler import BatchScheduler, load_config as load_scheduler_config
+from backend.shared_stats import SharedStats, load_config as load_shared_stats_config
+from backend.startup import Startup, heavy_modules_loaded, load_config as load_startup_config
+from backend.words import Lexicon, WordDecoder, load_config as load_words_config, load_lexicon
 
 # ─── Globals ────────────────────────────────────────────────────────────────
 
-classifier: Optional[GestureClassifier] = None
-
+inference_pool: Optional[InferencePool] = None
+scheduler: Optional[BatchScheduler] = None
+offline_jobs: Optional[OfflineJobs] = None
+control_config = load_control_config()
+motion_config = load_motion_config()
+hands_config = load_hands_config()
+words_config = load_words_config()
+lexicon: Optional[Lexicon] = None  # shared read-only by every session's WordDecoder
+startup_config = load_startup_config()
+startup = Startup((time.perf_counter() - _import_started) * 1000, heavy_modules_loaded())
+
+# Counted per uvicorn worker process; /api/stats and /api/metrics merge all
+# workers through shared_stats (see backend/shared_stats.py)
 session_stats = {
-    "total_frames": 0,
+    "total_frames": 0,       # frames run through the classifier
+    "received_frames": 0,
+    "dropped_frames": 0,     # superseded by a newer frame before processing
+    "queue_age_total": 0.0,  # seconds processed frames spent waiting
     "detected_frames": 0,
     "letters_detected": {},  # letter -> count
+    "errors": {"protocol": 0, "inference": 0, "send": 0},
+    "results": {"sent": 0, "same": 0, "bytes": 0},  # outbound result messages
+    "frame_cache": {"hit": 0, "miss": 0, "expired": 0},  # near-duplicate frame reuse
+    "words": {"letters": 0, "finished": 0, "corrected": 0},  # word decoder events
+    "not_ready": {"held": 0, "shed": 0},  # /ws frames received before the workers were ready
+    "static": {"identity": 0, "gzip": 0, "br": 0, "not_modified": 0, "bytes": 0},  # in-memory asset responses
+    "admission": {"admitted": 0, "rejected": 0, "skipped_rate": 0, "skipped_busy": 0},  # /ws limits
     "sessions": 0,
     "start_time": time.time(),
 }
+_GAUGES = ("sessions",)
+_NOT_COUNTERS = _GAUGES + ("start_time",)
+
+_session_ids = itertools.count(1)
+WS_INTERNAL_ERROR = 1011
+ingest_slots: dict[int, LatestFrameSlot] = {}  # session_id -> pending frame slot
+rate_controllers: dict[int, FrameRateController] = {}  # session_id -> client rate control
+result_encoders: dict[int, ResultEncoder] = {}  # session_id -> negotiated result format
+stage_latency = HistogramSet(LATENCY_BUCKETS_MS)  # per-stage ms, see backend/metrics.py
+shared_stats = SharedStats(**load_shared_stats_config())
+recorder = Recorder(**load_recorder_config())  # opt-in traffic capture for benchmarks.replay
+admission = AdmissionControl()  # configured in the lifespan, once the pool size is known
+profiler = Profiler(**load_profiler_config())  # idle until /api/admin/profile opens a window
 
 
 # ─── Lifespan ────────────────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global classifier
-    print("🤚 HUSH starting – loading MediaPipe gesture classifier…")
-    classifier = GestureClassifier()
+    global inference_pool, scheduler, offline_jobs, control_config, motion_config, hands_config, shared_stats
+    global words_config, lexicon, startup_config, startup, static_assets, recorder, admission
+    global profiler
+    # Keep the import time measured when the module loaded; restart the clock
+    startup = Startup(startup.phases["import"], startup.heavy_modules)
+    with startup.phase("config"):
+        config = load_config()
+        control_config = load_control_config()
+        motion_config = load_motion_config()
+        hands_config = load_hands_config()
+        words_config = load_words_config()
+        startup_config = load_startup_config()
+        scheduler_config = load_scheduler_config()
+        if scheduler_config["max_batch_size"] > config["max_trackers"]:
+            # A batch holds one frame per session; more sessions than trackers
+            # would have the pool hand one session's tracker to another mid-batch
+            print(f"⚠️  HUSH_BATCH_MAX_SIZE={scheduler_config['max_batch_size']} exceeds "
+                  f"HUSH_MAX_TRACKERS={config['max_trackers']}; batching at most {config['max_trackers']} frames")
+            scheduler_config["max_batch_size"] = config["max_trackers"]
+        profiler = Profiler(**load_profiler_config())
+        admission_config = load_admission_config(config["workers"], scheduler_config["max_batch_size"],
+                                                 config["max_trackers"])
+        capacity = config["workers"] * config["max_trackers"]
+        if not 0 < admission_config["max_sessions"] <= capacity:
+            # Past one tracker per session the pool takes trackers from live sessions
+            print(f"⚠️  HUSH_MAX_SESSIONS={admission_config['max_sessions'] or 'unlimited'} exceeds "
+                  f"{config['workers']} worker(s) × HUSH_MAX_TRACKERS={config['max_trackers']}; "
+                  f"admitting at most {capacity} sessions")
+            admission_config["max_sessions"] = capacity
+        admission = AdmissionControl(**admission_config)
+    lexicon = None
+    if words_config["enabled"]:
+        with startup.phase("lexicon"):
+            try:
+                lexicon = load_lexicon(words_config["lexicon"])
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Word decoder disabled: {e}")
+    with startup.phase("assets"):
+        static_assets = AssetIndex(FRONTEND_DIR, **load_assets_config())
+        static_assets.load()
+    with startup.phase("classifier"):
+        active_classifier()  # loads a learned index, if configured, before /ws/landmarks needs it
+    print(f"🤚 HUSH starting – {config['workers']} MediaPipe {config['mode']} worker(s)…")
+    with startup.phase("pool"):
+        inference_pool = InferencePool(**config)
+        scheduler = BatchScheduler(inference_pool, **scheduler_config)
+        scheduler.start()
+        offline_jobs = OfflineJobs(**load_offline_config())
     session_stats["start_time"] = time.time()
-    print("✅ Classifier ready. Visit http://localhost:8000")
+    shared_stats = SharedStats(**load_shared_stats_config())
+    shared_stats.open()
+    shared_stats.start(_local_stats)
+    recorder = Recorder(**load_recorder_config())
+    recorder.start()
+    if startup.heavy_modules:
+        print(f"⚠️  Importing the app loaded {', '.join(startup.heavy_modules)}; startup is slower than it needs to be")
+    if startup_config["warm_up"]:
+        print("🔥 Warming up inference workers in the background…")
+        startup.start_warm_up(inference_pool, _on_ready)
+    else:
+        startup.mark_ready()
+        _on_ready()
     yield
     print("🛑 HUSH shutting down…")
-    if classifier:
-        classifier.close()
+    await startup.close()
+    await recorder.close()
+    await shared_stats.close(_local_stats())
+    if scheduler:
+        await scheduler.close()
+    if inference_pool:
+        inference_pool.close()
+    if offline_jobs:
+        offline_jobs.close()
 
 
 # ─── App ─────────────────────────────────────────────────────────────────────
@@ -72,144 +202,751 @@ app.add_middleware(
 
 @app.get("/api/health")
 async def health():
+    """Liveness: answers as soon as the app is up; "ready" says whether the inference workers are warm."""
     return {
         "status": "ok",
         "service": "HUSH Gesture Recognition API",
         "version": "1.0.0",
         "uptime_seconds": round(time.time() - session_stats["start_time"], 1),
-        "classifier_ready": classifier is not None,
+        "ready": startup.ready,
+        "classifier_ready": startup.ready,
+        "classifier": active_description(),
+        "inference": inference_pool.stats() if inference_pool else None,
+        "startup": startup.report(),
     }
 
 
+@app.get("/api/health/ready")
+async def readiness():
+    """Readiness: 200 once the inference workers are warm, 503 while they start."""
+    return JSONResponse(
+        {"ready": startup.ready, "seconds_to_ready": startup.report()["seconds_to_ready"]},
+        status_code=200 if startup.ready else 503,
+    )
+
+
+def _json_asset(content):
+    """Pre-serialized JSON, encoded the way JSONResponse would."""
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return build_asset(body, "application/json")
+
+
+# The alphabet never changes while the server runs: serialize and compress once
+_GESTURES = _json_asset({
+    "sign_language": "ISL",
+    "total": len(LETTER_LIST),
+    "letters": [
+        {
+            "letter": letter,
+            **ISL_ALPHABET[letter]
+        }
+        for letter in LETTER_LIST
+    ]
+})
+_GESTURE_DETAIL = {letter: _json_asset({"letter": letter, **ISL_ALPHABET[letter]}) for letter in ISL_ALPHABET}
+
+
+def _send_asset(request: Request, asset, status_code: int = 200):
+    response, outcome = respond(request, asset, status_code)
+    counters = session_stats["static"]
+    counters[outcome] += 1
+    counters["bytes"] += len(response.body)
+    return response
+
+
 @app.get("/api/gestures")
-async def get_gestures():
+async def get_gestures(request: Request):
     """Return full ISL alphabet with descriptions and tips."""
-    return {
-        "sign_language": "ISL",
-        "total": len(LETTER_LIST),
-        "letters": [
-            {
-                "letter": letter,
-                **ISL_ALPHABET[letter]
-            }
-            for letter in LETTER_LIST
-        ]
-    }
+    return _send_asset(request, _GESTURES)
 
 
 @app.get("/api/gestures/{letter}")
-async def get_gesture_detail(letter: str):
+async def get_gesture_detail(letter: str, request: Request):
     """Return detail for a single ISL letter."""
     letter = letter.upper()
     if letter not in ISL_ALPHABET:
         return JSONResponse({"error": f"Letter '{letter}' not found"}, status_code=404)
-    return {"letter": letter, **ISL_ALPHABET[letter]}
+    return _send_asset(request, _GESTURE_DETAIL[letter])
+
+
+def _on_ready():
+    print(f"✅ Classifier ready in {startup.summary()}. Visit http://localhost:8000")
+
+
+def _local_stats() -> dict:
+    """This worker's counters, gauges and stage histograms, as published to shared_stats."""
+    return {
+        "counters": {k: v for k, v in session_stats.items() if k not in _NOT_COUNTERS},
+        "gauges": {k: session_stats[k] for k in _GAUGES},
+        "histograms": stage_latency.export(),
+    }
 
 
 @app.get("/api/stats")
 async def get_stats():
-    """Return current session statistics."""
-    total = session_stats["total_frames"]
-    detected = session_stats["detected_frames"]
+    """
+    Return current session statistics. Counters, latencies and active sessions
+    cover every worker process; per-session detail, batching and trackers are
+    the answering worker's.
+    """
+    merged = shared_stats.read(_local_stats())
+    counters = merged["counters"]
+    total = counters["total_frames"]
+    detected = counters["detected_frames"]
     top_letters = sorted(
-        session_stats["letters_detected"].items(),
+        counters["letters_detected"].items(),
         key=lambda x: x[1],
         reverse=True
     )[:5]
+    results = counters["results"]
     return {
         "total_frames_processed": total,
         "frames_with_hand": detected,
         "detection_rate": round(detected / total, 3) if total > 0 else 0.0,
-        "unique_letters_detected": len(session_stats["letters_detected"]),
-        "top_letters": [{"letter": l, "count": c} for l, c in top_letters],
-        "active_sessions": session_stats["sessions"],
-        "uptime_seconds": round(time.time() - session_stats["start_time"], 1),
+        "unique_letters_detected": sum(1 for count in counters["letters_detected"].values() if count),
+        "top_letters": [{"letter": l, "count": c} for l, c in top_letters if c],
+        "active_sessions": merged["gauges"]["sessions"],
+        "uptime_seconds": round(time.time() - merged["since"], 1),
+        "workers": merged["workers"],
+        "worker": {"pid": os.getpid(), "sessions": session_stats["sessions"]},
+        "ingest": {
+            "received": counters["received_frames"],
+            "processed": total,
+            "dropped": counters["dropped_frames"],
+            "avg_queue_age_ms": round(counters["queue_age_total"] / total * 1000, 1) if total > 0 else 0.0,
+            "max_pending_age_ms": round(max(
+                (slot.pending_age() for slot in ingest_slots.values()), default=0.0
+            ) * 1000, 1),
+            "sessions": {sid: _session_stats(sid, slot) for sid, slot in ingest_slots.items()},
+        },
+        "results": {
+            "sent": results["sent"],
+            "same": results["same"],
+            "avg_bytes": round(results["bytes"] / results["sent"], 1) if results["sent"] else 0.0,
+        },
+        "frame_cache": _frame_cache_stats(counters["frame_cache"]),
+        "words": counters["words"],
+        "not_ready": counters["not_ready"],
+        "static": {**counters["static"], "index": static_assets.stats()},
+        "admission": {**counters["admission"], **admission.stats()},
+        "recorder": recorder.stats(),
+        "latency_ms": HistogramSet.from_export(LATENCY_BUCKETS_MS, merged["histograms"]).snapshot(),
+        "errors": counters["errors"],
+        "batching": scheduler.stats() if scheduler else None,
+        # Workers are busy importing MediaPipe until ready; don't queue behind them
+        "trackers": await inference_pool.worker_stats() if inference_pool and startup.ready else [],
     }
 
 
 @app.post("/api/stats/reset")
 async def reset_stats():
-    session_stats["total_frames"] = 0
-    session_stats["detected_frames"] = 0
-    session_stats["letters_detected"] = {}
-    session_stats["start_time"] = time.time()
+    """Zero the server-wide counters (a baseline every worker subtracts) and this worker's batching stats."""
+    shared_stats.reset(_local_stats())
+    if scheduler:
+        scheduler.reset_stats()
     return {"message": "Stats reset successfully"}
 
 
+@app.post("/api/admin/profile")
+async def profile(request: Request, seconds: float = 5.0, format: str = "json"):
+    """
+    Profile this process for a bounded window (see backend/profiler.py):
+    sampled stacks, event-loop lag, slow callbacks and the slowest /ws frames.
+    format=collapsed returns the stacks as flamegraph input instead.
+    """
+    if not profiler.admin_token:
+        return JSONResponse({"error": "Admin endpoints are disabled: set HUSH_ADMIN_TOKEN"}, status_code=403)
+    if not profiler.authorized(request.headers.get("authorization", "")):
+        return JSONResponse({"error": "Admin token required"}, status_code=401)
+    if format not in ("json", "collapsed"):
+        return JSONResponse({"error": "format must be json or collapsed"}, status_code=400)
+    try:
+        report = await profiler.run(seconds)
+    except ProfilerBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return report
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """
+    Prometheus text exposition of counters, queue depths and stage latencies.
+    Counters and stage latencies cover every worker process; queue depths and
+    per-session series are the answering worker's.
+    """
+    merged = shared_stats.read(_local_stats())
+    counters = merged["counters"]
+    out = PrometheusText()
+    out.sample("hush_uptime_seconds", time.time() - merged["since"],
+               help_text="Seconds since start or last stats reset")
+    out.sample("hush_active_sessions", merged["gauges"]["sessions"],
+               help_text="Open WebSocket sessions")
+    out.sample("hush_worker_processes", merged["workers"],
+               help_text="Live server worker processes")
+    out.sample("hush_ready", int(startup.ready),
+               help_text="1 once this process's inference workers are warm")
+    for name, key, help_text in (
+        ("hush_frames_received_total", "received_frames", "Frames received over WebSockets"),
+        ("hush_frames_processed_total", "total_frames", "Frames run through the classifier"),
+        ("hush_frames_dropped_total", "dropped_frames", "Frames superseded before processing"),
+        ("hush_frames_with_hand_total", "detected_frames", "Processed frames with a hand"),
+    ):
+        out.sample(name, counters[key], "counter", help_text)
+    for kind, count in counters["errors"].items():
+        out.sample("hush_errors_total", count, "counter", "Errors by kind", kind=kind)
+    results = counters["results"]
+    out.sample("hush_result_messages_total", results["sent"] - results["same"], "counter",
+               "Result messages sent, by kind", kind="result")
+    out.sample("hush_result_messages_total", results["same"], "counter",
+               "Result messages sent, by kind", kind="same")
+    out.sample("hush_result_bytes_total", results["bytes"], "counter",
+               "Bytes of result messages sent")
+    for outcome, count in counters["frame_cache"].items():
+        out.sample("hush_frame_cache_lookups_total", count, "counter",
+                   "Frame cache lookups by outcome", result=outcome)
+    for action, count in counters["not_ready"].items():
+        out.sample("hush_not_ready_frames_total", count, "counter",
+                   "/ws frames received before the inference workers were ready", action=action)
+    for outcome, count in counters["static"].items():
+        if outcome != "bytes":
+            out.sample("hush_static_responses_total", count, "counter",
+                       "Static / fixed API responses by encoding (or not_modified)", result=outcome)
+    for decision, count in counters["admission"].items():
+        out.sample("hush_admission_total", count, "counter",
+                   "/ws admission decisions (sessions admitted / rejected, frames skipped)", decision=decision)
+    for kind, count in counters["words"].items():
+        out.sample("hush_word_events_total", count, "counter",
+                   "Word decoder events (letters, finished words, corrections)", kind=kind)
+
+    slots = list(ingest_slots.items())
+    out.sample("hush_pending_frames", sum(slot.pending for _, slot in slots),
+               help_text="Frames waiting in session slots")
+    out.sample("hush_in_flight_frames", sum(slot.in_flight for _, slot in slots),
+               help_text="Frames submitted for inference, result not yet sent")
+    out.sample("hush_admission_in_flight_frames", admission.in_flight,
+               help_text="Frames holding the in-flight inference budget")
+    if scheduler:
+        out.sample("hush_scheduler_queued_frames", scheduler.stats()["queued"],
+                   help_text="Frames queued for a batch")
+    if inference_pool:
+        out.sample("hush_inference_in_flight_calls", inference_pool.stats()["in_flight"],
+                   help_text="Worker calls (batches) currently running")
+    for name, attr, metric_type, help_text in (
+        ("hush_session_pending_frames", "pending", "gauge", "Frames waiting in the session slot"),
+        ("hush_session_in_flight_frames", "in_flight", "gauge", "Session frames in inference"),
+        ("hush_session_frames_received_total", "received", "counter", "Frames received by session"),
+        ("hush_session_frames_dropped_total", "dropped", "counter", "Frames dropped by session"),
+        ("hush_session_errors_total", "errors", "counter", "Errors by session"),
+    ):
+        for sid, slot in slots:
+            out.sample(name, getattr(slot, attr), metric_type, help_text, session=sid)
+
+    for stage, hist in HistogramSet.from_export(LATENCY_BUCKETS_MS, merged["histograms"]).histograms.items():
+        out.histogram("hush_stage_latency_seconds", hist, "Frame pipeline stage latency",
+                      scale=0.001, stage=stage)
+    if scheduler:
+        out.histogram("hush_batch_size", scheduler.batch_sizes, "Frames per inference batch")
+        out.histogram("hush_batch_wait_seconds", scheduler.wait_ms, "Time frames wait for a batch",
+                      scale=0.001)
+    return PlainTextResponse(out.render(), media_type=PrometheusText.CONTENT_TYPE)
+
+
+@app.post("/api/landmarks/classify")
+async def classify_landmark_batch(request: Request):
+    """
+    Stateless batch classification of client-side landmarks.
+    Body: JSON {"hands": [[[x, y, z] × 21], ...]} or application/octet-stream
+    of N × 63 little-endian float32 values. No stability filtering is applied.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("application/octet-stream"):
+            hands = decode_landmark_array(body)
+        else:
+            _, hands = parse_landmark_json(json.loads(body or b"{}"))
+    except (FrameProtocolError, ValueError) as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    return {
+        "results": [
+            {"letter": letter, "confidence": round(confidence, 3)}
+            for letter, confidence in active_classifier()(hands)
+        ]
+    }
+
+
+# ─── Offline Jobs ────────────────────────────────────────────────────────────
+
+def _offline_job(job_id: str):
+    job = offline_jobs.get(job_id) if offline_jobs else None
+    if job is None:
+        return None, JSONResponse({"error": f"Job '{job_id}' not found"}, status_code=404)
+    return job, None
+
+
+@app.post("/api/offline/jobs")
+async def create_offline_job(filename: str = "upload.mp4"):
+    """Open an upload job; the file extension helps OpenCV pick a demuxer."""
+    if not offline_jobs:
+        return JSONResponse({"error": "Server not ready"}, status_code=503)
+    try:
+        return offline_jobs.create(filename).status()
+    except TooManyJobs as e:
+        return JSONResponse({"error": str(e)}, status_code=429)
+
+
+@app.put("/api/offline/jobs/{job_id}/upload")
+async def upload_offline_chunk(job_id: str, request: Request, offset: int = 0):
+    """
+    Append one chunk of the video (raw request body) at the given byte offset.
+    Send chunks in order; a chunk whose offset is not the current upload size
+    is rejected (409), as is one that would take the upload past
+    HUSH_OFFLINE_MAX_UPLOAD_MB (413). The body is streamed to disk as it arrives.
+    """
+    job, error = _offline_job(job_id)
+    if error:
+        return error
+    # Refuse a declared oversize body before reading any of it
+    length = request.headers.get("content-length", "")
+    if job.max_bytes and length.isdigit() and job.bytes_received + int(length) > job.max_bytes:
+        return JSONResponse({"error": f"Upload exceeds {job.max_bytes} bytes", **job.status()}, status_code=413)
+    try:
+        await job.receive(offset, request.stream())
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e), **job.status()}, status_code=413)
+    except ValueError as e:
+        return JSONResponse({"error": str(e), **job.status()}, status_code=409)
+    return job.status()
+
+
+@app.post("/api/offline/jobs/{job_id}/start")
+async def start_offline_job(job_id: str, every: int = 1, landmarks: bool = False):
+    job, error = _offline_job(job_id)
+    if error:
+        return error
+    if every < 1:
+        return JSONResponse({"error": "every must be at least 1"}, status_code=400)
+    try:
+        offline_jobs.start(job, sample_every=every, include_landmarks=landmarks)
+    except ValueError as e:
+        return JSONResponse({"error": str(e), **job.status()}, status_code=409)
+    return job.status()
+
+
+@app.get("/api/offline/jobs/{job_id}")
+async def get_offline_job(job_id: str):
+    job, error = _offline_job(job_id)
+    return error or job.status()
+
+
+@app.get("/api/offline/jobs/{job_id}/results")
+async def get_offline_results(job_id: str):
+    """Download the JSONL results once the job is done."""
+    job, error = _offline_job(job_id)
+    if error:
+        return error
+    if job.state != "done":
+        return JSONResponse({"error": f"Job is {job.state}", **job.status()}, status_code=409)
+    return FileResponse(str(job.output_path), media_type="application/x-ndjson",
+                        filename=f"{job.id}.jsonl")
+
+
+@app.delete("/api/offline/jobs/{job_id}")
+async def delete_offline_job(job_id: str):
+    job, error = _offline_job(job_id)
+    if error:
+        return error
+    try:
+        offline_jobs.delete(job)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    return {"message": f"Job '{job_id}' deleted"}
+
+
 # ─── WebSocket ───────────────────────────────────────────────────────────────
 
+def _count_error(kind: str, slot: Optional[LatestFrameSlot] = None):
+    session_stats["errors"][kind] += 1
+    if slot is not None:
+        slot.errors += 1
+
+
+def _session_stats(session_id: int, slot: LatestFrameSlot) -> dict:
+    stats = slot.stats()
+    if session_id in rate_controllers:
+        stats["control"] = rate_controllers[session_id].targets
+    if session_id in result_encoders:
+        stats["results"] = result_encoders[session_id].stats()
+    return stats
+
+
+async def _send_result(websocket: WebSocket, encoder: ResultEncoder, frame_id: int, result: dict):
+    """Encode a result in the connection's negotiated format and send it."""
+    same = encoder.same
+    text = encoder.encode(frame_id, result)
+    counters = session_stats["results"]
+    counters["sent"] += 1
+    counters["same"] += encoder.same - same
+    counters["bytes"] += len(text)
+    await websocket.send_text(text)
+
+
+async def _negotiate_results(websocket: WebSocket) -> Optional[ResultEncoder]:
+    """Build the connection's ResultEncoder from its query string; None (and closed) if invalid."""
+    try:
+        encoder, asked = ResultEncoder.from_params(websocket.query_params)
+    except FrameProtocolError as e:
+        _count_error("protocol")
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1008)
+        return None
+    if asked:
+        await websocket.send_json(encoder.describe())
+    return encoder
+
+
+def _frame_cache_stats(counts: dict) -> dict:
+    lookups = sum(counts.values())
+    return {
+        "hits": counts["hit"],
+        "misses": counts["miss"],
+        "expired": counts["expired"],
+        "hit_rate": round(counts["hit"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+def _new_word_decoder() -> Optional[WordDecoder]:
+    if lexicon is None:
+        return None
+    return WordDecoder(lexicon, words_config["beam"], words_config["hold_ms"], words_config["gap_ms"])
+
+
+def _decode_words(decoder: Optional[WordDecoder], result: dict):
+    """Feed a result to the session's word decoder; attach its update, if any, as "word"."""
+    if decoder is None:
+        return
+    update = decoder.observe(result, time.monotonic())
+    if update is None:
+        return
+    result["word"] = update
+    counters = session_stats["words"]
+    if update["final"] is None:
+        counters["letters"] += 1
+    else:
+        counters["finished"] += 1
+        counters["corrected"] += update["final"] != update["typed"]
+
+
+def _record_result(result: dict):
+    session_stats["total_frames"] += 1
+    if result.get("hand_detected"):
+        session_stats["detected_frames"] += 1
+        letter = result.get("letter")
+        if letter:
+            session_stats["letters_detected"][letter] = (
+                session_stats["letters_detected"].get(letter, 0) + 1
+            )
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    encoder = await _negotiate_results(websocket)
+    if encoder is None:
+        return
+    # Full: tell the client when to come back, then close before any per-session state exists
+    rejection = admission.admit()
+    if rejection is not None:
+        session_stats["admission"]["rejected"] += 1
+        await websocket.send_json(rejection)
+        await websocket.close(WS_TRY_AGAIN_LATER, f"retry-after={rejection['retry_after_seconds']}")
+        return
+    session_stats["admission"]["admitted"] += 1
     session_stats["sessions"] += 1
+    session_id = next(_session_ids)
+    slot = LatestFrameSlot()
+    ingest_slots[session_id] = slot
+    controller = rate_controllers[session_id] = FrameRateController(**control_config)
+    result_encoders[session_id] = encoder
+    limiter = admission.rate_limiter()
+    last_frame_id = 0  # text frames carry no id: each takes the next above any seen (skipped ones too)
+    recording = recorder.open("/ws", str(websocket.query_params))
+    processor = asyncio.create_task(
+        _process_frames(websocket, session_id, slot, controller, encoder, _new_word_decoder(), recording)
+    )
     client = websocket.client
     print(f"🔌 WS connected: {client}")
 
     try:
+        control = controller.initial()
+        if control:
+            await websocket.send_json(control)
+        if not startup.ready:
+            await websocket.send_json({"type": "status", "state": "warming_up"})
+
         while True:
             try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=10.0)
+                message = await asyncio.wait_for(websocket.receive(), timeout=10.0)
             except asyncio.TimeoutError:
+                if processor.done():  # processing failed and closed the socket
+                    break
                 # Send heartbeat ping
                 await websocket.send_json({"type": "ping"})
                 continue
 
-            session_stats["total_frames"] += 1
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Binary messages carry raw JPEG/WebP after a small header; text
+            # messages are the legacy base64 fallback (ids assigned here).
+            if message.get("bytes") is not None:
+                try:
+                    header, payload = decode_frame_message(message["bytes"])
+                except FrameProtocolError as e:
+                    _count_error("protocol", slot)
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                    continue
+                frame = PendingFrame(header.frame_id, payload, True, time.monotonic())
+            else:
+                frame = PendingFrame(last_frame_id + 1, message["text"], False, time.monotonic())
+            last_frame_id = max(last_frame_id, frame.frame_id)
+
+            if recording:
+                recording.frame(frame.frame_id, frame.payload, frame.binary)
+            session_stats["received_frames"] += 1
+            # Over the session's frame-rate cap: answer now, never queue it
+            if limiter and not limiter.allow(frame.received_at):
+                session_stats["admission"]["skipped_rate"] += 1
+                await websocket.send_json({"type": "skipped", "frame_id": frame.frame_id, "reason": "rate"})
+                continue
+            if not startup.ready:
+                session_stats["not_ready"]["held" if startup_config["not_ready"] == "hold" else "shed"] += 1
+            # Latest frame wins: a frame still waiting for the worker is dropped
+            if slot.put(frame):
+                session_stats["dropped_frames"] += 1
 
-            if not classifier:
+    except WebSocketDisconnect:
+        print(f"🔌 WS disconnected: {client}")
+    except Exception as e:
+        print(f"❌ WS error: {e}")
+    finally:
+        slot.close()
+        processor.cancel()
+        ingest_slots.pop(session_id, None)
+        rate_controllers.pop(session_id, None)
+        result_encoders.pop(session_id, None)
+        if recording:
+            recording.close()
+        session_stats["sessions"] = max(0, session_stats["sessions"] - 1)
+        admission.leave()
+        if inference_pool:
+            inference_pool.release_session(session_id)
+
+
+async def _process_frames(
+    websocket: WebSocket,
+    session_id: int,
+    slot: LatestFrameSlot,
+    controller: FrameRateController,
+    encoder: ResultEncoder,
+    words: Optional[WordDecoder],
+    recording: Optional[Recording],
+):
+    """Per-session consumer: classify the newest pending frame, one at a time."""
+    try:
+        warming = not startup.ready
+        if warming and startup_config["not_ready"] == "hold":
+            await startup.wait_ready()  # the slot keeps the newest frame meanwhile
+        while True:
+            frame = await slot.get()
+            if frame is None:
+                return
+            if warming:
+                if not startup.ready:  # shedding
+                    await websocket.send_json({"type": "status", "state": "warming_up", "frame_id": frame.frame_id})
+                    continue
+                warming = False
+                await websocket.send_json({"type": "status", "state": "ready"})
+
+            if not scheduler:
                 await websocket.send_json({
                     "type": "error",
                     "message": "Classifier not ready"
                 })
                 continue
 
-            # Process frame
-            result = classifier.process_base64_frame(data)
+            # Over the server-wide inference budget: skip this frame, the
+            # session's next one gets the next chance
+            if not admission.acquire():
+                session_stats["admission"]["skipped_busy"] += 1
+                await websocket.send_json({"type": "skipped", "frame_id": frame.frame_id, "reason": "busy"})
+                continue
 
-            if result.get("hand_detected"):
-                session_stats["detected_frames"] += 1
-                letter = result.get("letter")
-                if letter:
-                    session_stats["letters_detected"][letter] = (
-                        session_stats["letters_detected"].get(letter, 0) + 1
-                    )
+            # Batched with other sessions' frames and run on a pool worker,
+            # so the event loop stays free
+            slot.in_flight = 1
+            submitted = time.monotonic()
+            try:
+                result = await scheduler.submit(session_id, frame.payload)
+            except BaseException:
+                slot.in_flight = 0
+                raise
+            finally:
+                admission.release()
+            timings = result.pop("_timings", {})
+            stage_latency.observe_all(timings)
+            cache = result.pop("_cache", None)
+            if cache is not None:
+                session_stats["frame_cache"][cache] += 1
+                slot.cache_hits += cache == "hit"
+            queue_ms = slot.last_queue_age * 1000
+            inference_ms = (time.monotonic() - submitted) * 1000
+            stage_latency.observe("queue", queue_ms)
+            stage_latency.observe("inference", inference_ms)
+
+            slot.processed += 1
+            session_stats["queue_age_total"] += slot.last_queue_age
+            _record_result(result)
+            _decode_words(words, result)
+            if recording:
+                recording.result(frame.frame_id, result)
+            if "error" in result:
+                _count_error("inference", slot)
+
+            sending = time.monotonic()
+            try:
+                await _send_result(websocket, encoder, frame.frame_id, result)
+            except Exception:
+                _count_error("send", slot)
+                raise
+            finally:
+                slot.in_flight = 0
+            done = time.monotonic()
+            send_ms, total_ms = (done - sending) * 1000, (done - frame.received_at) * 1000
+            stage_latency.observe("send", send_ms)
+            stage_latency.observe("total", total_ms)
+            profiler.frame(session_id, frame.frame_id, total_ms,
+                           {**timings, "queue": queue_ms, "inference": inference_ms, "send": send_ms},
+                           cache=cache, hand_detected=result.get("hand_detected", False))
+
+            # Steer the client's frame rate / size / quality toward useful work
+            control = controller.update(
+                result.get("hand_detected", False),
+                (sending - frame.received_at) * 1000,
+                scheduler.queued / inference_pool.size,
+            )
+            if control:
+                await websocket.send_json(control)
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        print(f"❌ WS processing error: {e}")
+        # A session nobody answers would hold its socket and admission slot
+        # forever (e.g. after a worker process crashed): end it, the client reconnects
+        try:
+            await websocket.close(WS_INTERNAL_ERROR, "processing failed")
+        except Exception:
+            pass  # already closed
+
+
+@app.websocket("/ws/landmarks")
+async def landmarks_endpoint(websocket: WebSocket):
+    """
+    Landmarks-only ingest: the browser runs hand tracking and sends 21×3
+    landmark arrays (binary or JSON, see backend/protocol.py). The server only
+    classifies and applies the stability filter, inline — no decode, no
+    MediaPipe, no worker hop. Results have the same shape as /ws.
+    """
+    await websocket.accept()
+    encoder = await _negotiate_results(websocket)
+    if encoder is None:
+        return
+    session_stats["sessions"] += 1
+    stability = StabilityFilter()
+    states = HandStates(hands_config["max_hands"], motion=motion_config) if hands_config["max_hands"] > 1 else None
+    motion = MotionTracker(**motion_config) if motion_config["enabled"] else None
+    words = _new_word_decoder()
+    recording = recorder.open("/ws/landmarks", str(websocket.query_params))
+    frame_ids = itertools.count(1)
+    client = websocket.client
+    print(f"🔌 WS landmarks connected: {client}")
+
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=10.0)
+            except asyncio.TimeoutError:
+                # Send heartbeat ping
+                await websocket.send_json({"type": "ping"})
+                continue
 
-            await websocket.send_json({
-                "type": "result",
-                **result
-            })
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            try:
+                if message.get("bytes") is not None:
+                    header, hands = decode_landmark_message(message["bytes"])
+                    frame_id = header.frame_id
+                else:
+                    frame_id, hands = parse_landmark_json(json.loads(message["text"]))
+                    if frame_id is None:
+                        frame_id = next(frame_ids)
+            except (FrameProtocolError, ValueError) as e:
+                _count_error("protocol")
+                await websocket.send_json({"type": "error", "message": str(e)})
+                continue
+
+            if recording:
+                recording.hands(frame_id, hands)
+            session_stats["received_frames"] += 1
+            started = time.monotonic()
+            result = landmark_result(hands, stability, motion, states)
+            _record_result(result)
+            _decode_words(words, result)
+            if recording:
+                recording.result(frame_id, result)
+            sending = time.monotonic()
+            stage_latency.observe("landmarks", (sending - started) * 1000)
+
+            try:
+                await _send_result(websocket, encoder, frame_id, result)
+            except Exception:
+                _count_error("send")
+                raise
+            stage_latency.observe("send", (time.monotonic() - sending) * 1000)
 
     except WebSocketDisconnect:
-        print(f"🔌 WS disconnected: {client}")
+        print(f"🔌 WS landmarks disconnected: {client}")
     except Exception as e:
-        print(f"❌ WS error: {e}")
+        print(f"❌ WS landmarks error: {e}")
     finally:
+        if recording:
+            recording.close()
         session_stats["sessions"] = max(0, session_stats["sessions"] - 1)
 
 
 # ─── Static File Serving ─────────────────────────────────────────────────────
 
+# frontend/ is read, hashed and compressed once at startup (backend/assets.py);
+# requests are dict lookups, and unknown paths get index.html
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
+static_assets = AssetIndex(FRONTEND_DIR, **load_assets_config())
 
 if FRONTEND_DIR.exists():
-    # Serve /static/* from frontend/
-    app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
-
-    @app.get("/")
-    async def serve_index():
-        return FileResponse(str(FRONTEND_DIR / "index.html"))
-
-    @app.get("/app")
-    async def serve_app():
-        return FileResponse(str(FRONTEND_DIR / "app.html"))
-
-    @app.get("/reference")
-    async def serve_reference():
-        return FileResponse(str(FRONTEND_DIR / "reference.html"))
-
-    @app.get("/{path:path}")
-    async def serve_static(path: str):
-        file_path = FRONTEND_DIR / path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(str(file_path))
-        return FileResponse(str(FRONTEND_DIR / "index.html"))
+    _PAGES = {"": "index.html", "app": "app.html", "reference": "reference.html"}
+
+    @app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+    async def serve_static_mount(path: str, request: Request):
+        asset = static_assets.get(path)
+        if asset is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return _send_asset(request, asset)
+
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"])
+    async def serve_static(path: str, request: Request):
+        asset = static_assets.get(_PAGES.get(path, path)) or static_assets.get("index.html")
+        if asset is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return _send_asset(request, asset)
@@ -0,0 +1,142 @@
+"""
+HUSH Metrics
+Cheap fixed-bucket histograms and counters for latency, batch-size and error
+reporting, plus Prometheus text exposition for /api/metrics.
+Updates are plain integer increments on the event loop — no locks. Workers
+never touch these: they time their stages with perf_counter and return the
+milliseconds in each result under "_timings", which the loop records.
+
+Frame stages (label stage=…):
+  decode     base64 (text frames) + frame-cache fingerprint
+             + imdecode + cvtColor                             [worker]
+  detect     hands.process                                     [worker]
+  classify   classification (batch time shared per hand)       [worker]
+  serialize  stability filter + result dict                    [worker]
+  queue      waiting in the session's latest-frame slot        [loop]
+  inference  scheduler submit → result (batching + worker)     [loop]
+  send       result encoding (ResultEncoder) + send            [loop]
+  total      frame received → result sent                      [loop]
+  landmarks  /ws/landmarks classify + stability                [loop]
+"""
+
+from bisect import bisect_left
+
+# Milliseconds, roughly logarithmic from sub-ms to multi-second
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2500)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        # bisect_left puts a value equal to a bound in that bucket (Prometheus "le")
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b:g}" for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class HistogramSet:
+    """Histograms sharing one bucket layout, keyed by a label value (e.g. stage)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.histograms: dict[str, Histogram] = {}
+
+    def observe(self, key: str, value: float):
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = Histogram(self.buckets)
+        hist.observe(value)
+
+    def observe_all(self, values: dict):
+        for key, value in values.items():
+            self.observe(key, value)
+
+    def reset(self):
+        for hist in self.histograms.values():
+            hist.reset()
+
+    def snapshot(self) -> dict:
+        return {key: hist.snapshot() for key, hist in self.histograms.items()}
+
+    def export(self) -> dict:
+        """Raw bucket counts and sums, for merging across processes (see backend/shared_stats.py)."""
+        return {key: {"counts": list(hist.counts), "sum": hist.sum} for key, hist in self.histograms.items()}
+
+    @classmethod
+    def from_export(cls, buckets, data: dict) -> "HistogramSet":
+        merged = cls(buckets)
+        for key, raw in data.items():
+            hist = merged.histograms[key] = Histogram(merged.buckets)
+            hist.counts = [int(n) for n in raw["counts"]]
+            hist.count = sum(hist.counts)
+            hist.sum = float(raw["sum"])
+        return merged
+
+
+# ─── Prometheus exposition ───────────────────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    # Integers stay exact; floats use the shortest round-tripping repr
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class PrometheusText:
+    """Builds a text/plain; version=0.0.4 exposition, declaring each metric once."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._lines = []
+        self._declared = set()
+
+    def _declare(self, name: str, kind: str, help_text: str):
+        if name not in self._declared:
+            self._declared.add(name)
+            self._lines.append(f"# HELP {name} {help_text}")
+            self._lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, metric_type: str = "gauge", help_text: str = "", **labels):
+        self._declare(name, metric_type, help_text or name)
+        self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, hist: Histogram, help_text: str = "", scale: float = 1.0, **labels):
+        """Emit a Histogram with cumulative buckets; scale converts units (e.g. ms → s)."""
+        self._declare(name, "histogram", help_text or name)
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            le = _labels({**labels, "le": f"{bound * scale:g}"})
+            self._lines.append(f"{name}_bucket{le} {cumulative}")
+        self._lines.append(f'{name}_bucket{_labels({**labels, "le": "+Inf"})} {hist.count}')
+        self._lines.append(f"{name}_sum{_labels(labels)} {_number(hist.sum * scale)}")
+        self._lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
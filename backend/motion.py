@@ -0,0 +1,265 @@
+"""
+HUSH Motion Gestures
+Dynamic letters (J, Z) recognized from fingertip trajectories.
+
+Static rules see a single frame; J and Z are drawn in the air. While the hand
+holds the letter's pose (pinky alone up for J, index alone up for Z) every
+frame's fingertip position goes into a fixed-size ring with its timestamp
+(TrajectoryRing), so a session's memory never grows.
+
+On each frame the fingertip has moved, recent frames are tried as the start
+of a gesture ending now: each candidate path (at most max_candidates,
+spanning at most max_seconds and at least min_path hand lengths) is
+resampled by arc length to the template's point count and turned into unit
+step directions, which removes position, size and drawing speed. All
+candidates are scored against all templates at once with a banded DTW
+(|i - j| ≤ band) over cosine distances:
+
+  D[i, j] = d(i, j) + min(D[i-1, j-1], D[i-1, j], D[i-1, j-2] + d(i, j-1))
+
+vectorized over (candidates, templates, points) — one loop of TEMPLATE_POINTS
+rows. The work per frame is bounded by the ring, not by the stream's length.
+
+Templates come in both horizontal orientations, so mirrored and unmirrored
+camera feeds both work. A recognized letter is reported for hold_seconds —
+longer than the frontend's auto-add hold — or until the hand is lost.
+
+Configuration (environment):
+  HUSH_MOTION               1 to recognize J and Z, 0 for static letters only (default: 1)
+  HUSH_MOTION_THRESHOLD     max mean cosine distance of a match (default: 0.2)
+  HUSH_MOTION_MAX_SECONDS   longest accepted gesture (default: 3)
+  HUSH_MOTION_HOLD_SECONDS  how long a recognized letter is reported (default: 2)
+"""
+
+import math
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from backend.landmarks import INDEX_TIP, MIDDLE_MCP, PINKY_TIP, WRIST, finger_states_array
+
+TEMPLATE_POINTS = 16
+RING_CAPACITY = 64      # frames of fingertip history per tracked tip
+
+
+class Template(NamedTuple):
+    letter: str
+    tip: int              # landmark whose path is matched
+    pose: tuple           # index, middle, ring, pinky extended
+    path: tuple           # polyline in image coordinates (y down)
+
+
+def _mirrored(path) -> tuple:
+    return tuple((1 - x, y) for x, y in path)
+
+
+_Z = ((0, 0), (1, 0), (0, 1), (1, 1))
+_J = ((0.5, 0), (0.5, 0.75), (0.4, 0.95), (0.2, 1.0), (0.05, 0.85))
+_INDEX_POSE = (True, False, False, False)
+_PINKY_POSE = (False, False, False, True)
+
+TEMPLATES = (
+    Template("Z", INDEX_TIP, _INDEX_POSE, _Z),
+    Template("Z", INDEX_TIP, _INDEX_POSE, _mirrored(_Z)),
+    Template("J", PINKY_TIP, _PINKY_POSE, _J),
+    Template("J", PINKY_TIP, _PINKY_POSE, _mirrored(_J)),
+)
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_MOTION", "1").strip() not in ("0", "false", "no", ""),
+        "threshold": float(os.environ.get("HUSH_MOTION_THRESHOLD", 0.2)),
+        "max_seconds": float(os.environ.get("HUSH_MOTION_MAX_SECONDS", 3)),
+        "hold_seconds": float(os.environ.get("HUSH_MOTION_HOLD_SECONDS", 2)),
+    }
+
+
+class TrajectoryRing:
+    """Preallocated ring of (timestamp, x, y) for the most recent frames."""
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self.t = np.zeros(capacity)
+        self.xy = np.zeros((capacity, 2))
+        self.count = 0
+
+    def append(self, t: float, xy):
+        slot = self.count % self.capacity
+        self.t[slot] = t
+        self.xy[slot] = xy
+        self.count += 1
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def last(self) -> np.ndarray:
+        return self.xy[(self.count - 1) % self.capacity]
+
+    def window(self) -> tuple[np.ndarray, np.ndarray]:
+        """Held frames in time order: (timestamps (N,), positions (N, 2))."""
+        order = np.arange(self.count - len(self), self.count) % self.capacity
+        return self.t[order], self.xy[order]
+
+    def clear(self):
+        self.count = 0
+
+
+def resample_paths(xy: np.ndarray, starts: np.ndarray, points: int = TEMPLATE_POINTS) -> np.ndarray:
+    """
+    Directions of the paths xy[s:] for each start s, each resampled to points
+    equal arc-length steps → (len(starts), points, 2) unit vectors.
+    """
+    arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))])
+    at = arc[starts, None] + np.linspace(0, 1, points + 1) * (arc[-1] - arc[starts])[:, None]
+    resampled = np.stack([np.interp(at, arc, xy[:, 0]), np.interp(at, arc, xy[:, 1])], axis=-1)
+    steps = np.diff(resampled, axis=1)
+    return steps / np.maximum(np.linalg.norm(steps, axis=-1, keepdims=True), 1e-12)
+
+
+def banded_dtw(paths: np.ndarray, templates: np.ndarray, band: int) -> np.ndarray:
+    """
+    paths (C, M, 2) and templates (K, M, 2) unit directions → (C, K) DTW cost
+    per point, warping at most band points off the diagonal.
+    """
+    c, m, _ = paths.shape
+    k = len(templates)
+    cosine = (paths.reshape(c * m, 2) @ templates.reshape(k * m, 2).T).reshape(c, m, k, m)
+    local = (1.0 - cosine).transpose(0, 2, 1, 3) + _band_penalty(m, band)  # (C, K, i, j)
+    # prev[..., j + 2] is the previous row's D[j]; the two leading columns stay inf
+    prev = np.full((c, k, m + 2), np.inf)
+    row = prev[..., 2:]
+    row[..., 0] = local[..., 0, 0]
+    row[..., 1] = local[..., 0, 0] + local[..., 0, 1]
+    passed = np.empty((c, k, m))
+    for i in range(1, m):
+        d = local[..., i, :]
+        np.copyto(passed, prev[..., :-2])
+        passed[..., 1:] += d[..., :-1]
+        best = np.minimum(np.minimum(prev[..., 1:-1], row), passed)
+        np.add(d, best, out=row)
+    return row[..., -1] / m
+
+
+@lru_cache(maxsize=None)
+def _band_penalty(m: int, band: int) -> np.ndarray:
+    """(M, M) array: 0 inside the band, inf outside."""
+    index = np.arange(m)
+    return np.where(np.abs(index[:, None] - index[None, :]) > band, np.inf, 0.0)
+
+
+class _TemplateBank:
+    """Trajectory ring and templates for one fingertip and pose."""
+
+    def __init__(self, templates: list, pose_grace: int):
+        self.letters = [t.letter for t in templates]
+        self.tip = templates[0].tip
+        self.pose = templates[0].pose
+        self.dirs = np.concatenate([  # (K, M, 2)
+            resample_paths(np.asarray(t.path, dtype=np.float64), np.zeros(1, dtype=int)) for t in templates
+        ])
+        self.pose_grace = pose_grace
+        self.ring = TrajectoryRing()
+        self.misses = 0
+
+    def reset(self):
+        self.ring.clear()
+        self.misses = 0
+
+    def miss(self):
+        """The pose was not held this frame; forget the path after pose_grace misses."""
+        self.misses += 1
+        if self.misses > self.pose_grace:
+            self.reset()
+
+
+class MotionTracker:
+    """Per-stream dynamic-gesture recognizer; feed it every detected hand in order."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        threshold: float = 0.2,
+        max_seconds: float = 3.0,
+        hold_seconds: float = 2.0,
+        min_path: float = 2.0,
+        min_move: float = 0.1,
+        band: int = 3,
+        max_candidates: int = 16,
+        pose_grace: int = 2,
+        templates=TEMPLATES,
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_seconds = max_seconds
+        self.hold_seconds = hold_seconds
+        self.min_path = min_path        # hand lengths (wrist → middle MCP)
+        self.min_move = min_move        # hand lengths the tip must move to re-match
+        self.band = band
+        self.max_candidates = max_candidates
+        groups = {}
+        for template in templates:
+            groups.setdefault((template.tip, template.pose), []).append(template)
+        self.banks = [_TemplateBank(group, pose_grace) for group in groups.values()]
+        self._held = None        # (letter, confidence) being reported
+        self._held_until = 0.0
+        self.matches = 0
+
+    def update(self, landmarks: np.ndarray, t: float) -> Optional[tuple]:
+        """
+        Feed one (21, 3) hand seen at time t (seconds). Returns (letter,
+        confidence) while a dynamic letter is being reported, else None.
+        """
+        if not self.enabled:
+            return None
+        if self._held is not None:
+            if t < self._held_until:
+                return self._held
+            self._held = None
+        hand_length = math.hypot(*(landmarks[MIDDLE_MCP, :2] - landmarks[WRIST, :2]).tolist())
+        if hand_length <= 0:
+            return None
+        pose = tuple(finger_states_array(landmarks[None])[0, 1:].tolist())
+        for bank in self.banks:
+            if pose != bank.pose:
+                bank.miss()
+                continue
+            bank.misses = 0
+            tip = landmarks[bank.tip, :2]
+            moved = not len(bank.ring) or math.hypot(*(tip - bank.ring.last()).tolist()) >= self.min_move * hand_length
+            bank.ring.append(t, tip)
+            if not moved:
+                continue
+            match = self._match(bank, t, hand_length)
+            if match is not None:
+                self.matches += 1
+                self._held = match
+                self._held_until = t + self.hold_seconds
+                for other in self.banks:
+                    other.reset()
+                return match
+        return None
+
+    def _match(self, bank: _TemplateBank, t: float, hand_length: float) -> Optional[tuple]:
+        """Best template match for paths ending at the newest frame, if good enough."""
+        times, xy = bank.ring.window()
+        arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))])
+        starts = np.flatnonzero((times >= t - self.max_seconds) & (arc[-1] - arc >= self.min_path * hand_length))
+        if not len(starts):
+            return None
+        if len(starts) > self.max_candidates:
+            starts = starts[np.linspace(0, len(starts) - 1, self.max_candidates).astype(int)]
+        costs = banded_dtw(resample_paths(xy, starts), bank.dirs, self.band)  # (C, K)
+        best = np.unravel_index(int(costs.argmin()), costs.shape)
+        score = float(costs[best])
+        if score > self.threshold:
+            return None
+        return bank.letters[best[1]], round(min(0.95, 1.0 - score), 3)
+
+    def reset(self):
+        """Forget trajectories and any held letter (hand lost or stream reset)."""
+        self._held = None
+        for bank in self.banks:
+            bank.reset()
@@ -0,0 +1,400 @@
+"""
+HUSH Offline Pipeline
+Streams a video file or an image directory through hand tracking and the
+gesture classifier and writes one JSON line per frame.
+
+    python -m backend.offline recording.mp4 -o labels.jsonl --every 2 --workers 4
+    python -m backend.offline frames/ -o labels.jsonl
+
+Stages are generators: read → optional frame sampling → chunk → fan out to a
+process pool (decode, hands.process, one classify call per chunk) → write
+results in input order as chunks complete. At most `workers × 2` chunks are in
+flight, so memory stays bounded no matter how large the input is.
+
+Each worker owns one GestureClassifier; its tracker and stability filter are
+reset at the start of every chunk, so `stable` reflects consecutive frames
+within a chunk.
+
+The REST API (/api/offline/jobs, see backend/main.py) streams an upload to a
+temporary file in chunks and runs the same pipeline on it in the background.
+Disk writes run in a thread so a large upload never blocks the event loop, and
+an upload that would grow past max_upload_mb is refused (413). At most max_jobs
+jobs exist at once (429 beyond that); finished or abandoned jobs, with their
+files, expire job_ttl_seconds after their last activity.
+
+Configuration (environment):
+  HUSH_OFFLINE_DIR      parent directory for uploads and results (default: system temp)
+  HUSH_OFFLINE_WORKERS  worker processes per REST job (default: 2)
+  HUSH_OFFLINE_MAX_UPLOAD_MB  largest upload per job, 0 = unlimited (default: 512)
+  HUSH_OFFLINE_MAX_JOBS       jobs held at once (default: 16)
+  HUSH_OFFLINE_JOB_TTL_SECONDS  how long an idle upload or finished job is kept (default: 3600)
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+WRITE_BUFFER = 1 << 20  # upload bytes gathered per disk write
+
+_worker = {}
+
+
+# ─── Sources ─────────────────────────────────────────────────────────────────
+
+def iter_video(path: str, sample_every: int = 1) -> Iterator[tuple]:
+    """Yield (index, timestamp_ms, BGR frame) for every sample_every-th frame."""
+    import cv2
+
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video '{path}'")
+    try:
+        index = 0
+        while True:
+            # grab() advances without converting the frame; only sampled ones are retrieved
+            if not cap.grab():
+                break
+            if index % sample_every == 0:
+                ok, frame = cap.retrieve()
+                if ok:
+                    yield index, round(cap.get(cv2.CAP_PROP_POS_MSEC), 1), frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def iter_images(directory: str, sample_every: int = 1) -> Iterator[tuple]:
+    """Yield (index, file name, path) for images in a directory, sorted by name."""
+    names = sorted(
+        entry.name for entry in os.scandir(directory)
+        if entry.is_file() and Path(entry.name).suffix.lower() in IMAGE_EXTENSIONS
+    )
+    for index, name in enumerate(names):
+        if index % sample_every == 0:
+            yield index, name, os.path.join(directory, name)
+
+
+def iter_source(source: str, sample_every: int = 1) -> Iterator[tuple]:
+    if os.path.isdir(source):
+        return iter_images(source, sample_every)
+    return iter_video(source, sample_every)
+
+
+def chunked(items: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ─── Worker ──────────────────────────────────────────────────────────────────
+
+def _init_worker():
+    from backend.gesture_classifier import GestureClassifier
+    _worker["classifier"] = GestureClassifier()
+
+
+def _label_chunk(chunk: list, include_landmarks: bool) -> list[dict]:
+    """Decode, track and classify one chunk of (index, key, frame-or-path) items."""
+    import cv2
+    import numpy as np
+
+    from backend.landmarks import landmarks_to_array, serialize_landmarks
+    from backend.learned import active_classifier
+
+    clf = _worker["classifier"]
+    clf.reset()
+    rows, hands = [], []
+    for index, key, item in chunk:
+        row = {"index": index}
+        row["file" if isinstance(key, str) else "timestamp_ms"] = key
+        img = cv2.imread(item) if isinstance(item, str) else item
+        if img is None:
+            row.update(hand_detected=False, letter=None, confidence=0.0, error="unreadable image")
+            rows.append(row)
+            continue
+        lm = clf.detect(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if lm is None:
+            row.update(hand_detected=False, letter=None, confidence=0.0)
+        else:
+            hands.append((row, landmarks_to_array(lm)))
+        rows.append(row)
+
+    if hands:
+        predictions = active_classifier()(np.stack([arr for _, arr in hands]))
+        for (row, arr), (letter, confidence) in zip(hands, predictions):
+            row.update(hand_detected=True, letter=letter, confidence=round(confidence, 3))
+            if include_landmarks:
+                row["landmarks"] = serialize_landmarks(arr)
+
+    # Stability runs in frame order once the whole chunk is classified
+    clf.stability.reset()
+    for row in rows:
+        if row["hand_detected"]:
+            row["stable"] = clf.stability.update(row["letter"])
+        else:
+            row["stable"] = False
+            clf.stability.reset()
+    return rows
+
+
+# ─── Pipeline ────────────────────────────────────────────────────────────────
+
+def run_pipeline(
+    source: str,
+    output: str,
+    sample_every: int = 1,
+    workers: Optional[int] = None,
+    chunk_size: int = 8,
+    include_landmarks: bool = False,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Label every sampled frame of source into the JSONL file output.
+    Returns a summary; progress (if given) is called with the same dict after
+    every chunk.
+    """
+    if sample_every < 1 or chunk_size < 1:
+        raise ValueError("sample_every and chunk_size must be at least 1")
+    workers = workers or min(4, os.cpu_count() or 1)
+    max_in_flight = workers * 2
+    stats = {"source": str(source), "frames": 0, "hands": 0, "seconds": 0.0, "fps": 0.0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool, open(output, "w", encoding="utf-8") as out:
+        in_flight = deque()
+
+        def drain_one():
+            for row in in_flight.popleft().result():
+                out.write(json.dumps(row) + "\n")
+                stats["frames"] += 1
+                stats["hands"] += row["hand_detected"]
+            out.flush()
+            stats["seconds"] = round(time.perf_counter() - start, 2)
+            stats["fps"] = round(stats["frames"] / max(stats["seconds"], 1e-9), 1)
+            if progress:
+                progress(dict(stats))
+
+        for chunk in chunked(iter_source(source, sample_every), chunk_size):
+            in_flight.append(pool.submit(_label_chunk, chunk, include_landmarks))
+            if len(in_flight) >= max_in_flight:
+                drain_one()
+        while in_flight:
+            drain_one()
+
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    stats["fps"] = round(stats["frames"] / max(stats["seconds"], 1e-9), 1)
+    return stats
+
+
+# ─── Upload jobs (REST) ──────────────────────────────────────────────────────
+
+def load_config() -> dict:
+    return {
+        "directory": os.environ.get("HUSH_OFFLINE_DIR") or None,
+        "workers": int(os.environ.get("HUSH_OFFLINE_WORKERS", "2")),
+        "max_upload_mb": float(os.environ.get("HUSH_OFFLINE_MAX_UPLOAD_MB", 512)),
+        "max_jobs": int(os.environ.get("HUSH_OFFLINE_MAX_JOBS", 16)),
+        "job_ttl_seconds": float(os.environ.get("HUSH_OFFLINE_JOB_TTL_SECONDS", 3600)),
+    }
+
+
+class UploadTooLarge(ValueError):
+    """An upload chunk would take the job past its size limit."""
+
+
+class TooManyJobs(RuntimeError):
+    """The registry already holds max_jobs jobs."""
+
+
+class OfflineJob:
+    """One uploaded video: appended to in chunks, then labelled in the background."""
+
+    def __init__(self, job_id: str, directory: Path, filename: str, max_bytes: int = 0):
+        self.id = job_id
+        self.directory = directory
+        self.upload_path = directory / ("upload" + Path(filename).suffix.lower())
+        self.output_path = directory / "results.jsonl"
+        self.state = "uploading"  # uploading → queued → running → done | failed
+        self.bytes_received = 0
+        self.max_bytes = max_bytes  # 0 = unlimited
+        self.active_at = time.monotonic()  # last chunk received or state change
+        self.progress = {}
+        self.error = None
+        self._receiving = False
+        self.upload_path.touch()
+
+    async def receive(self, offset: int, stream) -> None:
+        """
+        Append one upload chunk from an async byte stream (a request body).
+        offset must equal the bytes received so far, so chunks arrive in order
+        and a retried chunk is rejected rather than written twice. Raises
+        UploadTooLarge, keeping the bytes before the limit, if the chunk would
+        take the upload past max_bytes.
+        """
+        if self.state != "uploading":
+            raise ValueError(f"Job is {self.state}, uploads are closed")
+        if self._receiving:
+            raise ValueError("Another chunk is still uploading")
+        if offset != self.bytes_received:
+            raise ValueError(f"Expected offset {self.bytes_received}, got {offset}")
+        self._receiving = True
+        self.active_at = time.monotonic()
+        f = await asyncio.to_thread(open, self.upload_path, "ab")
+        try:
+            pending = bytearray()
+            async for data in stream:
+                if self.max_bytes and self.bytes_received + len(pending) + len(data) > self.max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+                pending += data
+                if len(pending) >= WRITE_BUFFER:
+                    await asyncio.to_thread(f.write, pending)
+                    self.bytes_received += len(pending)
+                    pending = bytearray()
+        finally:
+            try:
+                if pending:
+                    await asyncio.to_thread(f.write, pending)
+                    self.bytes_received += len(pending)
+            finally:
+                await asyncio.to_thread(f.close)
+                self._receiving = False
+                self.active_at = time.monotonic()
+
+    def status(self) -> dict:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "bytes_received": self.bytes_received,
+            "max_upload_bytes": self.max_bytes or None,
+            "progress": self.progress,
+            "error": self.error,
+        }
+
+
+class OfflineJobs:
+    """
+    Registry of upload jobs. Uploaded files and results live on disk under one
+    temporary directory; jobs run one at a time so offline work never competes
+    with itself for the CPUs the live pipeline also needs.
+    """
+
+    def __init__(self, directory: Optional[str] = None, workers: int = 2, max_upload_mb: float = 512,
+                 max_jobs: int = 16, job_ttl_seconds: float = 3600):
+        self.root = Path(tempfile.mkdtemp(prefix="hush-offline-", dir=directory))
+        self.workers = workers
+        self.max_upload_bytes = int(max(0.0, max_upload_mb) * 1024 * 1024)
+        self.max_jobs = max(1, max_jobs)
+        self.job_ttl = job_ttl_seconds
+        self.jobs: dict[str, OfflineJob] = {}
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hush-offline")
+
+    def create(self, filename: str) -> OfflineJob:
+        self.expire()
+        if len(self.jobs) >= self.max_jobs:
+            raise TooManyJobs(f"{len(self.jobs)} jobs already held; finish or delete one first")
+        job_id = uuid.uuid4().hex[:12]
+        directory = self.root / job_id
+        directory.mkdir()
+        job = self.jobs[job_id] = OfflineJob(job_id, directory, filename, self.max_upload_bytes)
+        return job
+
+    def get(self, job_id: str) -> Optional[OfflineJob]:
+        self.expire()
+        return self.jobs.get(job_id)
+
+    def expire(self, now: float = None):
+        """Delete finished and abandoned jobs idle for longer than job_ttl_seconds."""
+        now = time.monotonic() if now is None else now
+        for job in list(self.jobs.values()):
+            if job.state not in ("queued", "running") and not job._receiving and now - job.active_at > self.job_ttl:
+                self.delete(job)
+
+    def start(self, job: OfflineJob, sample_every: int = 1, include_landmarks: bool = False):
+        if job.state != "uploading" or job._receiving:
+            raise ValueError(f"Job is {job.state}, cannot start")
+        if not job.bytes_received:
+            raise ValueError("Nothing uploaded")
+        job.state = "queued"
+        self._runner.submit(self._run, job, sample_every, include_landmarks)
+
+    def _run(self, job: OfflineJob, sample_every: int, include_landmarks: bool):
+        job.state = "running"
+        try:
+            job.progress = run_pipeline(
+                str(job.upload_path),
+                str(job.output_path),
+                sample_every=sample_every,
+                workers=self.workers,
+                include_landmarks=include_landmarks,
+                progress=lambda stats: setattr(job, "progress", stats),
+            )
+            job.state = "done"
+        except Exception as e:
+            job.state = "failed"
+            job.error = str(e)
+            print(f"❌ Offline job {job.id} failed: {e}")
+        finally:
+            job.active_at = time.monotonic()  # the TTL runs from here
+
+    def delete(self, job: OfflineJob):
+        if job.state in ("queued", "running"):
+            raise ValueError(f"Job is {job.state}")
+        self.jobs.pop(job.id, None)
+        shutil.rmtree(job.directory, ignore_errors=True)
+
+    def close(self):
+        self._runner.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Label a video file or image directory with ISL letters.")
+    parser.add_argument("source", help="video file or directory of images")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to write")
+    parser.add_argument("--every", type=int, default=1, help="process every Nth frame (default: 1)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: min(4, CPUs))")
+    parser.add_argument("--chunk", type=int, default=8, help="frames per work unit (default: 8)")
+    parser.add_argument("--landmarks", action="store_true", help="include landmarks in each row")
+    args = parser.parse_args(argv)
+
+    def show(stats):
+        print(f"\r  {stats['frames']} frames, {stats['fps']} frames/sec", end="", file=sys.stderr)
+
+    summary = run_pipeline(
+        args.source,
+        args.output,
+        sample_every=args.every,
+        workers=args.workers,
+        chunk_size=args.chunk,
+        include_landmarks=args.landmarks,
+        progress=show,
+    )
+    print(file=sys.stderr)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
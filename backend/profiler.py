@@ -0,0 +1,222 @@
+"""
+HUSH Profiler
+An on-demand, bounded profiling window for a live server:
+POST /api/admin/profile?seconds=N runs one and returns its report.
+
+While the window is open:
+  stacks        a sampler thread reads every thread's Python stack each
+                interval (sys._current_frames, no tracing hooks, so the
+                cost does not grow with load) and counts them by thread
+                and call path — wall-clock, so idle waits show up too
+  loop lag      the request itself wakes every LAG_TICK_MS and records how
+                late it woke: the event loop's scheduling delay
+  slow callbacks whenever the loop has not ticked for slow_callback_ms, the
+                loop thread's sampled stack is charged to a slow callback
+                (asyncio's debug mode would do this too, at a cost we cannot
+                pay under load)
+  slowest frames /ws frames keep a trace (session, frame, stage timings) and
+                the slowest slowest_frames of them are kept
+
+The report comes back as JSON or as collapsed stacks (`thread;caller;callee
+count` per line), the input of flamegraph.pl, speedscope and inferno. Only
+one window runs at a time and it never runs longer than max_seconds. Admin
+endpoints are disabled (403) until HUSH_ADMIN_TOKEN is set, and then require
+it as a bearer token.
+Inference workers in process mode (HUSH_INFERENCE_MODE=process) are other
+processes and are not sampled — profile in thread mode to see inside them.
+With several uvicorn workers, the process that answers is the one profiled.
+
+Configuration (environment):
+  HUSH_PROFILE_MAX_SECONDS        longest profiling window (default: 60)
+  HUSH_PROFILE_INTERVAL_MS        stack sampling interval (default: 5)
+  HUSH_PROFILE_SLOW_CALLBACK_MS   loop stall charged to a slow callback (default: 100)
+  HUSH_PROFILE_SLOWEST_FRAMES     frame traces kept per window (default: 20)
+  HUSH_ADMIN_TOKEN                enables /api/admin/*, which then requires "Authorization: Bearer <token>" (default: unset = disabled)
+"""
+
+import asyncio
+import heapq
+import hmac
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+LAG_TICK_MS = 20
+MAX_DEPTH = 96
+TOP_FUNCTIONS = 25
+
+
+def load_config() -> dict:
+    return {
+        "max_seconds": float(os.environ.get("HUSH_PROFILE_MAX_SECONDS", 60)),
+        "interval_ms": float(os.environ.get("HUSH_PROFILE_INTERVAL_MS", 5)),
+        "slow_callback_ms": float(os.environ.get("HUSH_PROFILE_SLOW_CALLBACK_MS", 100)),
+        "slowest_frames": int(os.environ.get("HUSH_PROFILE_SLOWEST_FRAMES", 20)),
+        "admin_token": os.environ.get("HUSH_ADMIN_TOKEN") or None,
+    }
+
+
+class ProfilerBusy(RuntimeError):
+    """A profiling window is already open."""
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Profiler:
+    def __init__(self, max_seconds: float = 60, interval_ms: float = 5,
+                 slow_callback_ms: float = 100, slowest_frames: int = 20,
+                 admin_token: Optional[str] = None):
+        self.max_seconds = max_seconds
+        self.interval_ms = interval_ms
+        self.slow_callback_ms = slow_callback_ms
+        self.slowest_frames = slowest_frames
+        self.admin_token = admin_token
+        self.active = False
+        self._labels: dict = {}  # code object -> "file.py:qualname"
+        self._reset()
+
+    def _reset(self):
+        self._stacks: Counter = Counter()    # (thread name, code objects root→leaf) -> samples
+        self._blocked: Counter = Counter()   # loop-thread stacks sampled while the loop was stalled
+        self._samples = 0
+        self._stalls = 0
+        self._lags: list[float] = []
+        self._frames: list = []              # min-heap of (total ms, seq, trace)
+        self._seq = itertools.count()
+        self._tick = time.perf_counter()
+
+    # ─── Window ──────────────────────────────────────────────────────────────
+
+    async def run(self, seconds: float) -> dict:
+        """Profile for seconds (clamped to max_seconds) and return the report."""
+        if self.active:
+            raise ProfilerBusy("a profile is already running")
+        seconds = min(max(seconds, 0.1), self.max_seconds)
+        self._reset()
+        self.active = True
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stop, threading.get_ident()),
+                                   name="hush-profiler", daemon=True)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            tick = LAG_TICK_MS / 1000
+            while time.perf_counter() - started < seconds:
+                expected = time.perf_counter() + tick
+                await asyncio.sleep(tick)
+                self._tick = time.perf_counter()
+                self._lags.append(max(0.0, (self._tick - expected) * 1000))
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self.active = False
+        return self._report(time.perf_counter() - started)
+
+    def _sample(self, stop: threading.Event, loop_thread: int):
+        me = threading.get_ident()
+        interval = self.interval_ms / 1000
+        names, named_at = {}, 0.0
+        stalled = False
+        while not stop.wait(interval):
+            now = time.perf_counter()
+            if now - named_at > 1.0:  # threads come and go (worker pools grow)
+                names = {t.ident: re.sub(r"[-_]\d+$", "", t.name) for t in threading.enumerate()}
+                named_at = now
+            blocked = (now - self._tick) * 1000 >= self.slow_callback_ms
+            self._stalls += blocked and not stalled
+            stalled = blocked
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack = tuple(reversed(stack))
+                self._stacks[(names.get(ident, f"thread-{ident}"), stack)] += 1
+                if blocked and ident == loop_thread:
+                    self._blocked[stack] += 1
+            self._samples += 1
+
+    def frame(self, session_id: int, frame_id: int, total_ms: float, stages: dict, **detail):
+        """Offer one processed /ws frame's trace; kept if among the window's slowest."""
+        if not self.active:
+            return
+        trace = {"session": session_id, "frame_id": frame_id, "total_ms": round(total_ms, 2),
+                 "stages_ms": {stage: round(ms, 2) for stage, ms in stages.items()}, **detail}
+        entry = (total_ms, next(self._seq), trace)
+        if len(self._frames) < self.slowest_frames:
+            heapq.heappush(self._frames, entry)
+        elif total_ms > self._frames[0][0]:
+            heapq.heapreplace(self._frames, entry)
+
+    # ─── Report ──────────────────────────────────────────────────────────────
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{name}"
+        return label
+
+    def _collapse(self, stacks: Counter, prefix: bool = True) -> list[str]:
+        lines = []
+        for key, count in stacks.most_common():
+            thread, stack = key if prefix else (None, key)
+            labels = [self._label(code) for code in stack]
+            lines.append(";".join(([thread] if prefix else []) + labels) + f" {count}")
+        return lines
+
+    def _top_functions(self) -> list[dict]:
+        own, total = Counter(), Counter()
+        for (_, stack), count in self._stacks.items():
+            if stack:
+                own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+        return [{"function": self._label(code), "self": own[code], "total": count}
+                for code, count in total.most_common(TOP_FUNCTIONS)]
+
+    def _report(self, elapsed: float) -> dict:
+        lags = sorted(self._lags)
+        threads = Counter()
+        for (thread, _), count in self._stacks.items():
+            threads[thread] += count
+        return {
+            "seconds": round(elapsed, 2),
+            "interval_ms": self.interval_ms,
+            "samples": self._samples,
+            "threads": dict(threads.most_common()),
+            "top_functions": self._top_functions(),
+            "loop_lag_ms": {
+                "ticks": len(lags),
+                "p50": round(_percentile(lags, 0.50), 2),
+                "p95": round(_percentile(lags, 0.95), 2),
+                "p99": round(_percentile(lags, 0.99), 2),
+                "max": round(lags[-1], 2) if lags else 0.0,
+            },
+            "slow_callbacks": {
+                "threshold_ms": self.slow_callback_ms,
+                "stalls": self._stalls,
+                "samples": sum(self._blocked.values()),
+                "stacks": self._collapse(self._blocked, prefix=False)[:10],
+            },
+            "slowest_frames": [trace for _, _, trace in sorted(self._frames, reverse=True)],
+            "distinct_stacks": len(self._stacks),
+        }
+
+    def collapsed(self) -> str:
+        """The last window's stacks in collapsed format, busiest first."""
+        return "\n".join(self._collapse(self._stacks)) + "\n"
+
+    def authorized(self, header: str) -> bool:
+        """True if header is "Bearer <admin token>" (compared as bytes: headers may hold any text)."""
+        expected = f"Bearer {self.admin_token}".encode("utf-8")
+        return hmac.compare_digest(header.encode("utf-8", "surrogateescape"), expected)
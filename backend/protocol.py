@@ -0,0 +1,293 @@
+"""
+HUSH Binary Frame Protocol
+Versioned framing for binary WebSocket messages on /ws.
+
+Layout (little-endian, 20-byte header followed by the encoded image):
+  0  2s   magic      b"HF"
+  2  B    version    FRAME_PROTOCOL_VERSION
+  3  B    format     FRAME_FORMAT_JPEG | FRAME_FORMAT_WEBP
+  4  I    frame_id   client-assigned, echoed back in results
+  8  d    timestamp  client capture time, ms since epoch
+  16 H    width      encoded image width in pixels
+  18 H    height     encoded image height in pixels
+  20 ...  payload    raw JPEG/WebP bytes
+
+Text messages (base64 / data URL frames) remain supported as a fallback.
+
+/ws/landmarks and /api/landmarks/classify take client-side hand landmarks
+instead of images. Binary layout (little-endian, 16-byte header):
+  0  2s   magic      b"HL"
+  2  B    version    LANDMARK_PROTOCOL_VERSION
+  3  B    hands      number of hands that follow (0 = no hand in frame)
+  4  I    frame_id   client-assigned, echoed back in results
+  8  d    timestamp  client capture time, ms since epoch
+  16 ...  float32 x, y, z for 21 landmarks per hand (252 bytes per hand)
+
+JSON form: {"frame_id": 7, "landmarks": [[x, y, z], ... 21]} — points may
+also be {"x", "y", "z"} objects, and "hands": [[...21], ...] carries several.
+
+Results (server → client) are JSON text. The format is negotiated per
+connection with query parameters on /ws and /ws/landmarks:
+  landmarks=json    [{"x", "y", "z"}, ...] floats (default)
+  landmarks=packed  "landmarks_i16": base64 of 63 little-endian int16 values
+                    (x, y, z per landmark), each round(value * LANDMARK_SCALE)
+  landmarks=none    no landmarks in results
+  delta=1           a result equal to the last one sent (same letter, pending
+                    letter, stable flag and confidence, landmarks within
+                    delta_epsilon) is sent as {"type": "same", "frame_id": N}
+When either parameter is given the server first answers with
+{"type": "format", "landmarks": ..., "delta": ..., "scale": LANDMARK_SCALE}.
+With HUSH_MAX_HANDS=2 results also carry "hands": one entry per detected
+hand (handedness, letter, pending_letter, confidence, stable and its
+landmarks in the same format); the top-level fields are the primary hand's.
+"""
+
+import base64
+import json
+import struct
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from backend.landmarks import serialize_landmarks
+
+FRAME_MAGIC = b"HF"
+FRAME_PROTOCOL_VERSION = 1
+
+FRAME_FORMAT_JPEG = 1
+FRAME_FORMAT_WEBP = 2
+FRAME_FORMATS = {FRAME_FORMAT_JPEG: "jpeg", FRAME_FORMAT_WEBP: "webp"}
+
+FRAME_HEADER = struct.Struct("<2sBBIdHH")
+
+
+class FrameHeader(NamedTuple):
+    version: int
+    format: int
+    frame_id: int
+    timestamp: float
+    width: int
+    height: int
+
+
+class FrameProtocolError(ValueError):
+    pass
+
+
+def decode_frame_message(data) -> tuple[FrameHeader, memoryview]:
+    """
+    Split a binary frame message into its header and image payload.
+    The payload is a memoryview over the original buffer — no bytes are copied.
+    """
+    if len(data) < FRAME_HEADER.size:
+        raise FrameProtocolError("Frame message shorter than header")
+    magic, version, fmt, frame_id, timestamp, width, height = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise FrameProtocolError("Bad frame magic")
+    if version != FRAME_PROTOCOL_VERSION:
+        raise FrameProtocolError(f"Unsupported frame protocol version {version}")
+    if fmt not in FRAME_FORMATS:
+        raise FrameProtocolError(f"Unsupported frame format {fmt}")
+    header = FrameHeader(version, fmt, frame_id, timestamp, width, height)
+    return header, memoryview(data)[FRAME_HEADER.size:]
+
+
+def encode_frame_message(
+    payload: bytes,
+    frame_id: int,
+    timestamp: float,
+    width: int,
+    height: int,
+    fmt: int = FRAME_FORMAT_JPEG,
+) -> bytes:
+    """Build a binary frame message (used by tools and benchmarks)."""
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC, FRAME_PROTOCOL_VERSION, fmt, frame_id, timestamp, width, height
+    )
+    return header + bytes(payload)
+
+
+# ─── Landmark messages ───────────────────────────────────────────────────────
+
+LANDMARK_MAGIC = b"HL"
+LANDMARK_PROTOCOL_VERSION = 1
+LANDMARK_HEADER = struct.Struct("<2sBBId")
+LANDMARK_HAND_BYTES = 21 * 3 * 4
+MAX_LANDMARK_HANDS = 4096
+
+
+class LandmarkHeader(NamedTuple):
+    version: int
+    hands: int
+    frame_id: int
+    timestamp: float
+
+
+def _checked_hands(arr: np.ndarray) -> np.ndarray:
+    if arr.ndim == 2:
+        arr = arr[None]
+    if arr.ndim != 3 or arr.shape[1:] != (21, 3):
+        raise FrameProtocolError(f"Expected hands of shape (N, 21, 3), got {arr.shape}")
+    if len(arr) > MAX_LANDMARK_HANDS:
+        raise FrameProtocolError(f"At most {MAX_LANDMARK_HANDS} hands per message")
+    if not np.isfinite(arr).all():
+        raise FrameProtocolError("Landmarks must be finite numbers")
+    return arr
+
+
+def decode_landmark_message(data) -> tuple[LandmarkHeader, np.ndarray]:
+    """Parse a binary landmark message into its header and an (N, 21, 3) float32 array."""
+    if len(data) < LANDMARK_HEADER.size:
+        raise FrameProtocolError("Landmark message shorter than header")
+    magic, version, hands, frame_id, timestamp = LANDMARK_HEADER.unpack_from(data)
+    if magic != LANDMARK_MAGIC:
+        raise FrameProtocolError("Bad landmark magic")
+    if version != LANDMARK_PROTOCOL_VERSION:
+        raise FrameProtocolError(f"Unsupported landmark protocol version {version}")
+    expected = LANDMARK_HEADER.size + hands * LANDMARK_HAND_BYTES
+    if len(data) != expected:
+        raise FrameProtocolError(f"Landmark message is {len(data)} bytes, expected {expected}")
+    arr = np.frombuffer(data, dtype="<f4", offset=LANDMARK_HEADER.size).reshape(hands, 21, 3)
+    return LandmarkHeader(version, hands, frame_id, timestamp), _checked_hands(arr)
+
+
+def decode_landmark_array(data) -> np.ndarray:
+    """Parse a bare float32 payload (N * 63 values, no header) into (N, 21, 3)."""
+    if len(data) % LANDMARK_HAND_BYTES:
+        raise FrameProtocolError(f"Payload must be a multiple of {LANDMARK_HAND_BYTES} bytes")
+    return _checked_hands(np.frombuffer(data, dtype="<f4").reshape(-1, 21, 3))
+
+
+def parse_landmark_json(obj) -> tuple[Optional[int], np.ndarray]:
+    """Parse the JSON landmark form. Returns (frame_id or None, (N, 21, 3) array)."""
+    if not isinstance(obj, dict):
+        raise FrameProtocolError("Landmark message must be a JSON object")
+    if "hands" in obj:
+        hands = obj["hands"] or []
+    else:
+        hands = [obj["landmarks"]] if obj.get("landmarks") else []
+    try:
+        points = [
+            [(p["x"], p["y"], p["z"]) if isinstance(p, dict) else p for p in hand]
+            for hand in hands
+        ]
+        arr = np.array(points, dtype=np.float32).reshape(len(points), -1, 3) if points \
+            else np.empty((0, 21, 3), dtype=np.float32)
+        frame_id = obj.get("frame_id")
+        frame_id = int(frame_id) if frame_id is not None else None
+    except (KeyError, TypeError, ValueError) as e:
+        raise FrameProtocolError(f"Malformed landmarks: {e}") from None
+    return frame_id, _checked_hands(arr)
+
+
+def encode_landmark_message(hands, frame_id: int, timestamp: float) -> bytes:
+    """Build a binary landmark message (used by tools and benchmarks)."""
+    arr = np.asarray(hands, dtype="<f4").reshape(-1, 21, 3)
+    header = LANDMARK_HEADER.pack(LANDMARK_MAGIC, LANDMARK_PROTOCOL_VERSION, len(arr), frame_id, timestamp)
+    return header + arr.tobytes()
+
+
+# ─── Result messages ─────────────────────────────────────────────────────────
+
+LANDMARK_SCALE = 10000  # int16 units per normalized unit: ±3.27 range, 1e-4 steps
+LANDMARK_FORMATS = ("json", "packed", "none")
+DELTA_EPSILON = 0.002   # max per-coordinate change still reported as "same"
+
+
+def pack_landmarks(landmarks: np.ndarray) -> str:
+    """(21, 3) float landmarks → base64 of 63 little-endian int16 values."""
+    q = np.clip(np.rint(np.asarray(landmarks) * LANDMARK_SCALE), -32768, 32767).astype("<i2")
+    return base64.b64encode(q.tobytes()).decode("ascii")
+
+
+def unpack_landmarks(data: str) -> np.ndarray:
+    """Inverse of pack_landmarks (used by tools and benchmarks)."""
+    q = np.frombuffer(base64.b64decode(data), dtype="<i2").reshape(-1, 3)
+    return q.astype(np.float32) / LANDMARK_SCALE
+
+
+def _public_fields(result: dict) -> tuple:
+    """A result's items as sent, minus landmarks (formatted separately) and "_" internals."""
+    return tuple(item for item in result.items() if item[0] != "landmarks" and item[0][0] != "_")
+
+
+class ResultEncoder:
+    """
+    Per-connection result serializer. Worker results carry landmarks as a
+    (21, 3) array; encode() turns one result into the JSON text for this
+    connection's negotiated format and keeps byte counts for /api/stats.
+    Keys starting with "_" are server-internal and never sent.
+    """
+
+    def __init__(self, landmarks: str = "json", delta: bool = False, delta_epsilon: float = DELTA_EPSILON):
+        if landmarks not in LANDMARK_FORMATS:
+            raise FrameProtocolError(f"landmarks must be one of {', '.join(LANDMARK_FORMATS)}")
+        self.landmarks = landmarks
+        self.delta = delta
+        self.delta_epsilon = delta_epsilon
+        self._last_fields = None
+        self._last_landmarks = None
+        self.sent = 0
+        self.same = 0
+        self.bytes = 0
+
+    @classmethod
+    def from_params(cls, params) -> tuple["ResultEncoder", bool]:
+        """Build from connection query parameters; also returns whether the client asked for a format."""
+        asked = "landmarks" in params or "delta" in params
+        delta = params.get("delta", "0").strip().lower() in ("1", "true", "yes")
+        return cls(params.get("landmarks", "json").strip().lower(), delta), asked
+
+    def describe(self) -> dict:
+        return {"type": "format", "landmarks": self.landmarks, "delta": self.delta, "scale": LANDMARK_SCALE}
+
+    def _unchanged(self, fields: tuple, landmarks) -> bool:
+        if fields != self._last_fields:
+            return False
+        if self.landmarks == "none" or not len(landmarks):
+            return True
+        return float(np.abs(landmarks - self._last_landmarks).max()) <= self.delta_epsilon
+
+    def _add_landmarks(self, message: dict, landmarks):
+        if self.landmarks == "json":
+            message["landmarks"] = serialize_landmarks(landmarks) if len(landmarks) else []
+        elif self.landmarks == "packed" and len(landmarks):
+            message["landmarks_i16"] = pack_landmarks(landmarks)
+
+    def encode(self, frame_id: int, result: dict) -> str:
+        landmarks = compared = result.get("landmarks", ())
+        hands = result.get("hands")
+        fields = tuple(item for item in result.items() if item[0] not in ("landmarks", "hands") and item[0][0] != "_")
+        if hands is not None:
+            hand_fields = tuple(_public_fields(hand) for hand in hands)
+            fields += (("hands", hand_fields),)
+            if hands:
+                compared = np.stack([hand["landmarks"] for hand in hands])  # every hand counts for deltas
+        if self.delta and self._unchanged(fields, compared):
+            message = {"type": "same", "frame_id": frame_id}
+            self.same += 1
+        else:
+            message = {"type": "result", "frame_id": frame_id, **dict(fields)}
+            self._add_landmarks(message, landmarks)
+            if hands is not None:
+                message["hands"] = []
+                for hand, public in zip(hands, hand_fields):
+                    entry = dict(public)
+                    self._add_landmarks(entry, hand["landmarks"])
+                    message["hands"].append(entry)
+            # Later deltas compare against what the client actually holds
+            self._last_fields = fields
+            self._last_landmarks = compared
+        text = json.dumps(message, separators=(",", ":"))
+        self.sent += 1
+        self.bytes += len(text)
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "landmarks": self.landmarks,
+            "delta": self.delta,
+            "sent": self.sent,
+            "same": self.same,
+            "avg_bytes": round(self.bytes / self.sent, 1) if self.sent else 0.0,
+        }
@@ -0,0 +1,340 @@
+"""
+HUSH Session Recorder
+Opt-in capture of real /ws and /ws/landmarks traffic for replay
+(python -m benchmarks.replay).
+
+Each recorded session is a directory:
+  meta.json          endpoint, query string, start time, HUSH_* settings
+  seg-00000.hrl      append-only records, rolled over every segment_mb
+  seg-00000.idx      (timestamp, offset) per record, for seeking by time
+
+Segment layout (little-endian): an 8-byte header (b"HREC", version, 3 pad
+bytes), then records of a 20-byte header followed by the payload:
+  0  B    kind       FRAME | FRAME_B64 | HANDS | LANDMARKS | RESULT
+  1  3x   padding
+  4  I    frame_id
+  8  d    time       wall clock, seconds since epoch
+  16 I    length     payload bytes
+  20 ...  payload
+
+  FRAME      raw JPEG / WebP bytes as received on /ws
+  FRAME_B64  a text (base64) frame as received on /ws
+  HANDS      (N, 21, 3) float32 landmarks as received on /ws/landmarks
+  LANDMARKS  (21, 3) float32 landmarks of the result that follows
+  RESULT     the result as sent, JSON without landmarks or internal keys
+
+Recording on the event loop only appends a reference to a pending list.
+A flush task hands the list to one writer thread every flush_ms, or sooner
+once 1 MB is pending. The thread serializes the records, writes them and
+flushes the files, so a live recording is readable while it grows. If the
+disk falls behind and max_pending_mb is queued, new records are dropped and
+counted rather than blocking sessions. A crash can truncate the last record;
+readers stop at it.
+
+Configuration (environment):
+  HUSH_RECORD                1 to record every session, 0 to record nothing (default: 0)
+  HUSH_RECORD_DIR            where session directories are created (default: recordings)
+  HUSH_RECORD_SEGMENT_MB     segment file size before rolling over (default: 64)
+  HUSH_RECORD_FLUSH_MS       longest a record waits before it is written (default: 250)
+  HUSH_RECORD_MAX_PENDING_MB queued bytes beyond which records are dropped (default: 32)
+"""
+
+import asyncio
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+
+MAGIC = b"HREC"
+VERSION = 1
+SEGMENT_HEADER = MAGIC + bytes((VERSION, 0, 0, 0))
+RECORD = struct.Struct("<BxxxIdI")
+INDEX = struct.Struct("<dQ")
+
+FRAME, FRAME_B64, HANDS, LANDMARKS, RESULT = 1, 2, 3, 4, 5
+KIND_NAMES = {FRAME: "frame", FRAME_B64: "frame_b64", HANDS: "hands", LANDMARKS: "landmarks", RESULT: "result"}
+
+FLUSH_BYTES = 1 << 20
+
+
+class Record(NamedTuple):
+    kind: int
+    frame_id: int
+    time: float
+    payload: bytes
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_RECORD", "0").strip() not in ("0", "false", "no", ""),
+        "directory": os.environ.get("HUSH_RECORD_DIR", "recordings"),
+        "segment_mb": float(os.environ.get("HUSH_RECORD_SEGMENT_MB", 64)),
+        "flush_ms": float(os.environ.get("HUSH_RECORD_FLUSH_MS", 250)),
+        "max_pending_mb": float(os.environ.get("HUSH_RECORD_MAX_PENDING_MB", 32)),
+    }
+
+
+def _payload(kind: int, data) -> bytes:
+    """Serialize a record's payload (runs on the writer thread)."""
+    if kind == RESULT:
+        fields = {k: v for k, v in data.items() if k != "landmarks" and not k.startswith("_")}
+        if "hands" in fields:  # two-hand results: per-hand fields, landmarks of the primary hand only
+            fields["hands"] = [{k: v for k, v in hand.items() if k != "landmarks" and not k.startswith("_")}
+                               for hand in fields["hands"]]
+        return json.dumps(fields, separators=(",", ":")).encode("utf-8")
+    if kind in (HANDS, LANDMARKS):
+        return np.ascontiguousarray(data, dtype="<f4").tobytes()
+    if kind == FRAME_B64:
+        return data.encode("ascii", "replace")
+    return bytes(data)
+
+
+def _nbytes(data) -> int:
+    """Queued size of an array payload (lists, e.g. an empty hand list, count as their float32 size)."""
+    return data.nbytes if isinstance(data, np.ndarray) else len(data) * 21 * 3 * 4
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+
+class Recording:
+    """One session's log. Record methods run on the event loop; files are the writer thread's."""
+
+    def __init__(self, recorder: "Recorder", path: Path):
+        self.recorder = recorder
+        self.path = path
+        self._segment = -1
+        self._log = None
+        self._index = None
+        self._offset = 0
+
+    # Event loop side: cheap appends
+
+    def frame(self, frame_id: int, payload, binary: bool = True):
+        self.recorder._append(self, FRAME if binary else FRAME_B64, frame_id, payload, len(payload))
+
+    def hands(self, frame_id: int, hands: np.ndarray):
+        self.recorder._append(self, HANDS, frame_id, hands, _nbytes(hands))
+
+    def result(self, frame_id: int, result: dict):
+        landmarks = result.get("landmarks")
+        # No-hand and error results carry NO_HAND's empty list: nothing to record
+        if isinstance(landmarks, np.ndarray) and len(landmarks):
+            self.recorder._append(self, LANDMARKS, frame_id, landmarks, landmarks.nbytes)
+        self.recorder._append(self, RESULT, frame_id, dict(result), 256)
+
+    def close(self):
+        self.recorder._append(self, None, 0, None, 0)
+
+    # Writer thread side
+
+    def _write(self, kind: int, frame_id: int, t: float, data):
+        payload = _payload(kind, data)
+        size = RECORD.size + len(payload)
+        if self._log is None or (self._offset > len(SEGMENT_HEADER)
+                                 and self._offset + size > self.recorder.segment_bytes):
+            self._roll()
+        self._index.write(INDEX.pack(t, self._offset))
+        self._log.write(RECORD.pack(kind, frame_id, t, len(payload)))
+        self._log.write(payload)
+        self._offset += size
+        return size
+
+    def _roll(self):
+        self._close_files()
+        self._segment += 1
+        self._log = open(self.path / f"seg-{self._segment:05d}.hrl", "wb")
+        self._index = open(self.path / f"seg-{self._segment:05d}.idx", "wb")
+        self._log.write(SEGMENT_HEADER)
+        self._offset = len(SEGMENT_HEADER)
+
+    def _flush_files(self):
+        if self._log is not None:
+            self._log.flush()
+            self._index.flush()
+
+    def _close_files(self):
+        if self._log is not None:
+            self._log.close()
+            self._index.close()
+            self._log = self._index = None
+
+
+class Recorder:
+    """Batches every recording's records to one writer thread."""
+
+    def __init__(self, enabled: bool = False, directory: str = "recordings", segment_mb: float = 64,
+                 flush_ms: float = 250, max_pending_mb: float = 32):
+        self.enabled = enabled
+        self.directory = Path(directory)
+        self.segment_bytes = int(segment_mb * (1 << 20))
+        self.flush_seconds = flush_ms / 1000
+        self.max_pending = int(max_pending_mb * (1 << 20))
+        self._pending = []
+        self._pending_bytes = 0
+        self._ids = itertools.count(1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.counts = {"sessions": 0, "records": 0, "bytes": 0, "dropped": 0, "flushes": 0, "errors": 0}
+
+    def start(self):
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hush-recorder")
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+        print(f"⏺️  Recording sessions to {self.directory.resolve()}")
+
+    def open(self, endpoint: str, query: str = "") -> Optional[Recording]:
+        """A new session's recording, or None when recording is off."""
+        if not self.enabled or self._task is None:
+            return None
+        started = time.time()
+        name = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}-{os.getpid()}-{next(self._ids)}"
+        path = self.directory / name
+        meta = {
+            "endpoint": endpoint,
+            "query": query,
+            "started": started,
+            "pid": os.getpid(),
+            "version": VERSION,
+            "config": {k: v for k, v in os.environ.items() if k.startswith("HUSH_")},
+        }
+        recording = Recording(self, path)
+        self.counts["sessions"] += 1
+        self._append(recording, "meta", 0, meta, 0)
+        return recording
+
+    def _append(self, recording: Recording, kind, frame_id: int, data, nbytes: int):
+        if kind in (FRAME, FRAME_B64, HANDS) and self._pending_bytes + nbytes > self.max_pending:
+            self.counts["dropped"] += 1  # the writer is behind: never block the session
+            return
+        self._pending.append((recording, kind, frame_id, time.time(), data))
+        self._pending_bytes += nbytes
+        if self._pending_bytes >= FLUSH_BYTES:
+            self._wake.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write everything pending on the writer thread."""
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        loop = asyncio.get_running_loop()
+        written, records = await loop.run_in_executor(self._executor, self._write_batch, batch)
+        self.counts["records"] += records
+        self.counts["bytes"] += written
+        self.counts["flushes"] += 1
+
+    def _write_batch(self, batch: list) -> tuple[int, int]:
+        written = records = 0
+        touched = set()
+        for recording, kind, frame_id, t, data in batch:
+            try:
+                if kind == "meta":
+                    recording.path.mkdir(parents=True, exist_ok=True)
+                    (recording.path / "meta.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+                elif kind is None:
+                    recording._close_files()
+                    touched.discard(recording)
+                else:
+                    written += recording._write(kind, frame_id, t, data)
+                    records += 1
+                    touched.add(recording)
+            except (OSError, ValueError, TypeError, KeyError) as e:
+                self.counts["errors"] += 1
+                if self.counts["errors"] == 1:
+                    print(f"⚠️  Recording to {recording.path} failed: {e}", file=sys.stderr)
+        for recording in touched:
+            recording._flush_files()
+        return written, records
+
+    async def close(self):
+        """Write what is pending and stop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.counts, "pending_bytes": self._pending_bytes}
+
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+
+class RecordingReader:
+    """A recorded session directory, read through mmap."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = self.path / "meta.json"
+        self.meta = json.loads(meta.read_text(encoding="utf-8")) if meta.exists() else {}
+        self.segments = sorted(self.path.glob("seg-*.hrl"))
+        if not self.segments:
+            raise ValueError(f"{self.path} holds no recording segments")
+
+    def _start_offset(self, segment: Path, since: Optional[float]) -> int:
+        """First record at or after since, from the segment's index (header size if none)."""
+        if since is None:
+            return len(SEGMENT_HEADER)
+        index = segment.with_suffix(".idx")
+        try:
+            raw = index.read_bytes()
+        except OSError:
+            return len(SEGMENT_HEADER)
+        entries = [INDEX.unpack_from(raw, i) for i in range(0, len(raw) - INDEX.size + 1, INDEX.size)]
+        pos = bisect_left([t for t, _ in entries], since)
+        return entries[pos][1] if pos < len(entries) else -1
+
+    def records(self, since: Optional[float] = None) -> Iterator[Record]:
+        """Every record in order (from wall time since, if given); stops at a truncated tail."""
+        for segment in self.segments:
+            with open(segment, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size <= len(SEGMENT_HEADER):
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm[:len(MAGIC)] != MAGIC or mm[len(MAGIC)] != VERSION:
+                        raise ValueError(f"{segment} is not a version {VERSION} recording segment")
+                    offset = self._start_offset(segment, since)
+                    if offset < 0:
+                        continue
+                    while offset + RECORD.size <= size:
+                        kind, frame_id, t, length = RECORD.unpack_from(mm, offset)
+                        end = offset + RECORD.size + length
+                        if end > size:
+                            return  # truncated by a crash
+                        yield Record(kind, frame_id, t, mm[offset + RECORD.size:end])
+                        offset = end
+
+
+def decode_payload(record: Record):
+    """A record's payload as the value it was recorded from (bytes, str, array or dict)."""
+    if record.kind == RESULT:
+        return json.loads(record.payload)
+    if record.kind in (HANDS, LANDMARKS):
+        return np.frombuffer(record.payload, dtype="<f4").reshape(-1, 21, 3)
+    if record.kind == FRAME_B64:
+        return record.payload.decode("ascii")
+    return record.payload
@@ -0,0 +1,177 @@
+"""
+HUSH Results
+Stability filtering, motion gestures and result-dict construction shared by
+every ingest path (/ws frames, /ws/landmarks, batch tools). Kept free of MediaPipe/OpenCV so
+landmark-only paths can use it without loading the vision stack.
+
+Result dicts keep the hand's landmarks as a (21, 3) array; they are only
+turned into JSON by the connection's ResultEncoder (backend/protocol.py), in
+whatever format that client negotiated.
+
+With more than one hand per frame (HUSH_MAX_HANDS, see
+backend/gesture_classifier.py) each hand keeps its own stability filter and
+motion tracker (HandStates). The result's top-level fields stay those of one
+hand — the primary: the first hand seen, for as long as it stays in view — so
+single-hand clients are unaffected, and "hands" lists every hand's result
+with its "handedness".
+
+Configuration (environment):
+  HUSH_MAX_HANDS  hands tracked and classified per frame, 1 or 2 (default: 1)
+"""
+
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from backend.learned import active_classifier
+from backend.motion import MotionTracker
+
+NO_HAND = {"hand_detected": False, "letter": None, "confidence": 0.0, "landmarks": []}
+MAX_HANDS = 2
+
+
+def load_config() -> dict:
+    max_hands = int(os.environ.get("HUSH_MAX_HANDS", 1))
+    if not 1 <= max_hands <= MAX_HANDS:
+        raise ValueError(f"HUSH_MAX_HANDS must be between 1 and {MAX_HANDS}, got {max_hands}")
+    return {"max_hands": max_hands}
+
+
+class StabilityFilter:
+    """Require the same raw prediction on consecutive frames before reporting it."""
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold  # frames to confirm
+        self._last_letter = None
+        self._stable_count = 0
+
+    def update(self, letter: Optional[str]) -> bool:
+        """Feed one raw prediction; returns True once it has been seen threshold times in a row."""
+        if letter == self._last_letter:
+            self._stable_count += 1
+        else:
+            self._last_letter = letter
+            self._stable_count = 1
+        return self._stable_count >= self.threshold
+
+    def reset(self):
+        self._last_letter = None
+        self._stable_count = 0
+
+
+def hand_result(landmarks: np.ndarray, letter: Optional[str], confidence: float, stable: bool) -> dict:
+    """Build the per-frame result dict for a detected hand (landmarks stay an array)."""
+    return {
+        "hand_detected": True,
+        "letter": letter if stable else None,
+        "pending_letter": letter,  # raw prediction before stability
+        "confidence": round(confidence, 3) if stable else 0.0,
+        "_raw_confidence": round(confidence, 3),  # for the word decoder; never sent
+        "landmarks": landmarks,
+        "stable": stable
+    }
+
+
+def stream_result(
+    landmarks: np.ndarray,
+    letter: Optional[str],
+    confidence: float,
+    stability: StabilityFilter,
+    motion: Optional[MotionTracker] = None,
+) -> dict:
+    """
+    Result for one detected hand of a stream. A dynamic letter recognized by
+    the motion tracker replaces the static prediction and is reported stable
+    straight away — the trajectory already spans many frames.
+    """
+    if motion is not None:
+        dynamic = motion.update(landmarks, time.monotonic())
+        if dynamic is not None:
+            letter, confidence = dynamic
+            stability.update(letter)
+            return hand_result(landmarks, letter, confidence, True)
+    return hand_result(landmarks, letter, confidence, stability.update(letter))
+
+
+def hand_keys(labels: list) -> list[str]:
+    """State keys for one frame's hands: the handedness, made unique by position when missing or repeated."""
+    keys = []
+    for n, label in enumerate(labels):
+        key = label or f"hand{n}"
+        keys.append(key if key not in keys else f"{key}#{n}")
+    return keys
+
+
+class HandStates:
+    """
+    Per-hand stability filter and motion tracker for multi-hand streams,
+    keyed by handedness ("Left" / "Right" as MediaPipe reports it; by
+    position when unknown). A hand missing from a frame loses its state, as
+    a lone hand does.
+    """
+
+    def __init__(self, max_hands: int = 2, threshold: int = 3, motion: Optional[dict] = None):
+        self.max_hands = max_hands
+        self.threshold = threshold
+        self.motion_config = motion
+        self._states: dict[str, tuple] = {}  # key -> (StabilityFilter, MotionTracker or None)
+        self.primary: Optional[str] = None
+
+    def _state(self, key: str) -> tuple:
+        state = self._states.get(key)
+        if state is None:
+            config = self.motion_config
+            motion = MotionTracker(**config) if config and config["enabled"] else None
+            state = self._states[key] = (StabilityFilter(self.threshold), motion)
+        return state
+
+    def result(self, hands: np.ndarray, labels: list, predictions: list) -> dict:
+        """Result for one frame's (N, 21, 3) hands, their handedness and [(letter, confidence), ...]."""
+        keys = hand_keys(labels)
+        for key in set(self._states) - set(keys):
+            del self._states[key]
+        per_hand = []
+        for key, label, landmarks, (letter, confidence) in zip(keys, labels, hands, predictions):
+            stability, motion = self._state(key)
+            hand = stream_result(landmarks, letter, confidence, stability, motion)
+            del hand["hand_detected"]
+            per_hand.append({"handedness": label, **hand})
+        if self.primary not in keys:
+            self.primary = keys[0]
+        return {"hand_detected": True, **per_hand[keys.index(self.primary)], "hands": per_hand}
+
+    def no_hand(self) -> dict:
+        self.reset()
+        return {**NO_HAND, "hands": []}
+
+    def reset(self):
+        self._states.clear()
+        self.primary = None
+
+
+def landmark_result(
+    hands: np.ndarray,
+    stability: StabilityFilter,
+    motion: Optional[MotionTracker] = None,
+    states: Optional[HandStates] = None,
+) -> dict:
+    """
+    Classify client-supplied landmarks for one frame of a stream.
+    hands: (N, 21, 3); an empty array means no hand. Only the first hand is
+    classified unless states is given, which classifies up to its max_hands
+    in one call (client landmarks carry no handedness: hands are keyed by order).
+    """
+    if states is not None:
+        if not len(hands):
+            return states.no_hand()
+        hands = hands[:states.max_hands]
+        return states.result(hands, [None] * len(hands), active_classifier()(hands))
+    if not len(hands):
+        stability.reset()
+        if motion is not None:
+            motion.reset()
+        return dict(NO_HAND)
+    letter, confidence = active_classifier()(hands[:1])[0]
+    return stream_result(hands[0], letter, confidence, stability, motion)
@@ -0,0 +1,140 @@
+"""
+HUSH Region of Interest
+Crop-and-track preprocessing for hand detection.
+
+Once a hand has been found, the next frame only needs the area around it.
+The session keeps a square box (normalized full-frame coordinates) padded
+around the previous landmarks; frames are decoded at the smallest JPEG scale
+(libjpeg DCT scaling via IMREAD_REDUCED_COLOR_2/4/8) that still leaves the box
+at least min_side pixels, cropped, and only the crop is colour-converted and
+given to hands.process. Landmarks come back relative to the crop and are
+mapped to full-frame coordinates, so results look exactly as before.
+
+The box is sticky: it is only recomputed when the hand nears its edge or
+shrinks well inside it, because every change of box moves MediaPipe's
+coordinate frame and forces a fresh palm detection.
+
+Configuration (environment):
+  HUSH_ROI           1 to crop to the tracked hand, 0 for full frames (default: 1)
+  HUSH_ROI_PADDING   box padding per side, as a fraction of the hand size (default: 0.6)
+  HUSH_ROI_MIN_SIDE  minimum crop side in decoded pixels (default: 256)
+  HUSH_FULL_MIN_SIDE minimum long side for reduced full-frame decodes (default: 640)
+"""
+
+import os
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+# JPEG decode scale → OpenCV flag (DCT scaling; other formats are resized)
+_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    1: cv2.IMREAD_COLOR,
+}
+
+
+class Box(NamedTuple):
+    """Normalized full-frame box: 0 ≤ x0 < x1 ≤ 1, 0 ≤ y0 < y1 ≤ 1."""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_ROI", "1").strip() not in ("0", "false", "no", ""),
+        "padding": float(os.environ.get("HUSH_ROI_PADDING", 0.6)),
+        "min_side": int(os.environ.get("HUSH_ROI_MIN_SIDE", 256)),
+        "full_min_side": int(os.environ.get("HUSH_FULL_MIN_SIDE", 640)),
+    }
+
+
+# ─── Geometry ────────────────────────────────────────────────────────────────
+
+def hand_box(landmarks: np.ndarray) -> Box:
+    """Tight box around a (21, 3) hand."""
+    x0, y0 = landmarks[:, :2].min(axis=0).tolist()
+    x1, y1 = landmarks[:, :2].max(axis=0).tolist()
+    return Box(x0, y0, x1, y1)
+
+
+def padded_box(tight: Box, frame_size: tuple, padding: float) -> Box:
+    """Square (in pixels) box around a tight hand box, shifted to stay inside the frame."""
+    width, height = frame_size
+    cx, cy = (tight.x0 + tight.x1) / 2 * width, (tight.y0 + tight.y1) / 2 * height
+    side = max((tight.x1 - tight.x0) * width, (tight.y1 - tight.y0) * height) * (1 + 2 * padding)
+    half_w = min(side, width) / 2
+    half_h = min(side, height) / 2
+    cx = min(max(cx, half_w), width - half_w)
+    cy = min(max(cy, half_h), height - half_h)
+    return Box((cx - half_w) / width, (cy - half_h) / height, (cx + half_w) / width, (cy + half_h) / height)
+
+
+def should_move(roi: Box, tight: Box, margin: float = 0.12, shrink: float = 0.25) -> bool:
+    """True when the hand is near the box edge or now fills only a small part of it."""
+    mx, my = (roi.x1 - roi.x0) * margin, (roi.y1 - roi.y0) * margin
+    if (tight.x0 < roi.x0 + mx or tight.y0 < roi.y0 + my
+            or tight.x1 > roi.x1 - mx or tight.y1 > roi.y1 - my):
+        return True
+    hand_area = (tight.x1 - tight.x0) * (tight.y1 - tight.y0)
+    return hand_area < shrink * shrink * (roi.x1 - roi.x0) * (roi.y1 - roi.y0)
+
+
+def map_to_frame(landmarks: np.ndarray, box: Box) -> np.ndarray:
+    """Crop-relative (21, 3) landmarks (or (N, 21, 3) hands) → full-frame coordinates."""
+    scale_x, scale_y = box.x1 - box.x0, box.y1 - box.y0
+    out = np.empty_like(landmarks)
+    out[..., 0] = box.x0 + landmarks[..., 0] * scale_x
+    out[..., 1] = box.y0 + landmarks[..., 1] * scale_y
+    out[..., 2] = landmarks[..., 2] * scale_x  # MediaPipe z shares x's scale
+    return out
+
+
+# ─── Decoding ────────────────────────────────────────────────────────────────
+
+def _reduction(pixels: float, min_side: int) -> int:
+    for factor in (8, 4, 2):
+        if pixels / factor >= min_side:
+            return factor
+    return 1
+
+
+def decode_reduced(frame_bytes, factor: int) -> Optional[np.ndarray]:
+    """Decode to BGR at 1/factor scale (factor in 1, 2, 4, 8); None if undecodable."""
+    return cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), _REDUCED_FLAGS[factor])
+
+
+def decode_full(frame_bytes, frame_size: Optional[tuple], full_min_side: int):
+    """
+    Decode the whole frame to RGB, at a reduced scale when the previous frame
+    showed it is much larger than detection needs.
+    Returns (RGB image, full-resolution (width, height)) or (None, None).
+    """
+    factor = _reduction(max(frame_size), full_min_side) if frame_size else 1
+    img = decode_reduced(frame_bytes, factor)
+    if img is None:
+        return None, None
+    h, w = img.shape[:2]
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB), (w * factor, h * factor)
+
+
+def decode_region(frame_bytes, roi: Box, frame_size: tuple, min_side: int):
+    """
+    Decode only as much resolution as the box needs and crop to it.
+    Returns (RGB crop, box actually cropped, full-resolution (width, height)),
+    or (None, None, None) if undecodable.
+    """
+    width, height = frame_size
+    factor = _reduction(min((roi.x1 - roi.x0) * width, (roi.y1 - roi.y0) * height), min_side)
+    img = decode_reduced(frame_bytes, factor)
+    if img is None:
+        return None, None, None
+    h, w = img.shape[:2]
+    px0, py0 = int(roi.x0 * w), int(roi.y0 * h)
+    px1, py1 = max(px0 + 1, int(round(roi.x1 * w))), max(py0 + 1, int(round(roi.y1 * h)))
+    crop = cv2.cvtColor(img[py0:py1, px0:px1], cv2.COLOR_BGR2RGB)
+    return crop, Box(px0 / w, py0 / h, px1 / w, py1 / h), (w * factor, h * factor)
@@ -0,0 +1,165 @@
+"""
+HUSH Batch Scheduler
+Cross-session micro-batching in front of the inference pool.
+Frames from every active session are queued per worker (sessions are pinned
+to workers). A collector per worker waits for the first frame, then gathers
+more for up to max_wait_ms or until max_batch_size, and ships the whole batch
+to the worker in one call — one executor round-trip, one decode pass and one
+classify_gestures() call per batch instead of per frame.
+
+Tuning: max_batch_size=1 / max_wait_ms=0 is plain per-frame dispatch (lowest
+p99); larger values trade a little latency for throughput under load.
+
+Under load the scheduler also switches a worker to MediaPipe's lite landmark
+model (model_complexity=0): whenever a dispatch finds at least
+lite_backlog frames waiting for the worker (the batch plus what is still
+queued), that worker runs lite for the next lite_hold_seconds.
+
+Configuration (environment):
+  HUSH_BATCH_MAX_SIZE          frames per batch, capped at HUSH_MAX_TRACKERS (default: 8)
+  HUSH_BATCH_MAX_WAIT_MS       how long to hold a batch open (default: 2)
+  HUSH_ADAPTIVE_COMPLEXITY     1 to switch model complexity by load, 0 to stay on 1 (default: 1)
+  HUSH_LITE_BACKLOG            waiting frames that trigger the lite model (default: 4)
+  HUSH_LITE_HOLD_SECONDS       how long a worker stays lite after that (default: 5)
+"""
+
+import asyncio
+import os
+import time
+from typing import NamedTuple
+
+from backend.inference_pool import InferencePool
+from backend.metrics import BATCH_SIZE_BUCKETS, LATENCY_BUCKETS_MS, Histogram
+
+
+class _Request(NamedTuple):
+    session_id: int
+    frame: object
+    future: asyncio.Future
+    enqueued_at: float
+
+
+def load_config() -> dict:
+    """Read scheduler configuration from the environment."""
+    return {
+        "max_batch_size": int(os.environ.get("HUSH_BATCH_MAX_SIZE", 8)),
+        "max_wait_ms": float(os.environ.get("HUSH_BATCH_MAX_WAIT_MS", 2)),
+        "adaptive_complexity": os.environ.get("HUSH_ADAPTIVE_COMPLEXITY", "1").strip() not in ("0", "false", "no", ""),
+        "lite_backlog": int(os.environ.get("HUSH_LITE_BACKLOG", 4)),
+        "lite_hold_seconds": float(os.environ.get("HUSH_LITE_HOLD_SECONDS", 5)),
+    }
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        pool: InferencePool,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 2.0,
+        adaptive_complexity: bool = True,
+        lite_backlog: int = 4,
+        lite_hold_seconds: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.adaptive_complexity = adaptive_complexity
+        self.lite_backlog = max(1, lite_backlog)
+        self.lite_hold = lite_hold_seconds
+        self._lite_until = [0.0] * pool.size  # per worker, time.monotonic()
+        self.lite_batches = 0
+        self._queues = [asyncio.Queue() for _ in range(pool.size)]
+        self._collectors = []
+        self.batches = 0
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    def start(self):
+        self._collectors = [
+            asyncio.create_task(self._collect(idx)) for idx in range(self.pool.size)
+        ]
+
+    async def submit(self, session_id: int, frame) -> dict:
+        """Queue one frame (bytes/memoryview or base64 str) and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        idx = self.pool.worker_for(session_id)
+        self._queues[idx].put_nowait(_Request(session_id, frame, future, time.monotonic()))
+        return await future
+
+    async def _collect(self, idx: int):
+        queue = self._queues[idx]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(idx, batch)
+
+    async def _dispatch(self, idx: int, batch: list):
+        now = time.monotonic()
+        self.batches += 1
+        self.batch_sizes.observe(len(batch))
+        for req in batch:
+            self.wait_ms.observe((now - req.enqueued_at) * 1000)
+
+        complexity = None
+        if self.adaptive_complexity:
+            if len(batch) + self._queues[idx].qsize() >= self.lite_backlog:
+                self._lite_until[idx] = now + self.lite_hold
+            complexity = 0 if now < self._lite_until[idx] else 1
+            self.lite_batches += complexity == 0
+
+        try:
+            results = await self.pool.process_batch(
+                idx, [(req.session_id, req.frame) for req in batch], complexity
+            )
+        except Exception as e:
+            for req in batch:
+                if not req.future.done():
+                    req.future.set_exception(e)
+            return
+
+        for req, result in zip(batch, results):
+            if not req.future.done():
+                req.future.set_result(result)
+
+    @property
+    def queued(self) -> int:
+        """Frames waiting for a batch, across all workers."""
+        return sum(q.qsize() for q in self._queues)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "queued": self.queued,
+            "lite_batches": self.lite_batches,
+            "lite_workers": sum(time.monotonic() < until for until in self._lite_until),
+            "batch_size": self.batch_sizes.snapshot(),
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
+    def reset_stats(self):
+        self.batches = 0
+        self.lite_batches = 0
+        self.batch_sizes.reset()
+        self.wait_ms.reset()
+
+    async def close(self):
+        for task in self._collectors:
+            task.cancel()
+        await asyncio.gather(*self._collectors, return_exceptions=True)
+        self._collectors = []
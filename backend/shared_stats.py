@@ -0,0 +1,210 @@
+"""
+HUSH Shared Stats
+Server-wide statistics when uvicorn runs several worker processes
+(`uvicorn backend.main:app --workers N`).
+
+Each worker keeps counting in its own plain dicts and histograms, so the
+frame path never takes a lock or talks to another process. About once a
+second, and just before it answers a stats request, a worker publishes a
+snapshot of those counters as a small JSON segment in a shared-memory
+directory (/dev/shm where available). The segment is written under a
+temporary name and renamed into place, so readers never see a torn one. A
+stats request merges every worker's segment:
+  counters    summed (nested dicts key by key, bucket lists element-wise)
+  gauges      summed over workers that are still alive (open sessions)
+
+Reset does not touch other processes' counters: it stores a baseline (the
+merged counters at that moment) that every read subtracts. Segments of
+workers that exit stay in place, so totals never go backwards. The directory
+belongs to one server (named after the uvicorn master's pid, or the process's
+own pid without --workers); directories of servers that are gone are removed
+at startup. Another worker's numbers are at most publish_seconds old.
+
+Configuration (environment):
+  HUSH_STATS_DIR              where segment directories live (default: /dev/shm, else the temp dir)
+  HUSH_STATS_PUBLISH_SECONDS  how often each worker publishes its counters (default: 1)
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+_PREFIX = "hush-stats-"
+_BASELINE = "baseline.json"
+
+
+def load_config() -> dict:
+    default_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return {
+        "directory": os.environ.get("HUSH_STATS_DIR", default_dir),
+        "publish_seconds": float(os.environ.get("HUSH_STATS_PUBLISH_SECONDS", 1)),
+    }
+
+
+def _server_pid() -> int:
+    """The uvicorn master for a --workers child, else this process."""
+    parent = multiprocessing.parent_process()
+    return parent.pid if parent is not None else os.getpid()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def merge(a, b):
+    """Sum two counter trees (numbers, lists of numbers, dicts of either)."""
+    if isinstance(a, dict):
+        out = dict(a)
+        for key, value in b.items():
+            out[key] = merge(out[key], value) if key in out else value
+        return out
+    if isinstance(a, list):
+        return [merge(x, y) for x, y in zip(a, b)] + (a[len(b):] or b[len(a):])
+    return a + b
+
+
+def subtract(a, baseline):
+    """a minus a baseline tree, never below zero (keys missing from the baseline count in full)."""
+    if isinstance(a, dict):
+        return {key: subtract(value, baseline[key]) if key in baseline else value for key, value in a.items()}
+    if isinstance(a, list):
+        return [subtract(x, y) for x, y in zip(a, baseline)] + a[len(baseline):]
+    return max(a - baseline, 0)
+
+
+class SharedStats:
+    def __init__(self, directory: str, publish_seconds: float = 1.0):
+        self.server_pid = _server_pid()
+        self.root = Path(directory)
+        self.path = self.root / f"{_PREFIX}{self.server_pid}"
+        self.segment = self.path / f"{os.getpid()}.json"
+        self.publish_seconds = publish_seconds
+        self.shared = False   # False → this process's counters only
+        self.started = time.time()
+        self._baseline = {"reset_at": 0.0, "counters": {}, "histograms": {}}
+        self._task: Optional[asyncio.Task] = None
+
+    def open(self):
+        """Create this worker's segment directory and clear out dead servers' ones."""
+        try:
+            for stale in self.root.glob(f"{_PREFIX}*"):
+                pid = stale.name[len(_PREFIX):]
+                if pid.isdigit() and int(pid) != self.server_pid and not _alive(int(pid)):
+                    shutil.rmtree(stale, ignore_errors=True)
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.shared = True
+        except OSError as e:
+            print(f"⚠️  Shared stats unavailable ({e}); reporting this worker only", file=sys.stderr)
+
+    def start(self, snapshot):
+        """Publish snapshot() every publish_seconds until close()."""
+        self._task = asyncio.create_task(self._publish_loop(snapshot))
+
+    async def _publish_loop(self, snapshot):
+        while True:
+            await asyncio.sleep(self.publish_seconds)
+            self.publish(snapshot())
+
+    def publish(self, local: dict):
+        """
+        Write this worker's snapshot: {"counters": tree, "gauges": tree,
+        "histograms": HistogramSet.export()}.
+        """
+        if not self.shared:
+            return
+        doc = {"pid": os.getpid(), "started": self.started, "published": time.time(), **local}
+        tmp = self.segment.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.segment)
+        except OSError as e:
+            print(f"⚠️  Could not publish stats: {e}", file=sys.stderr)
+
+    def _segments(self) -> list[dict]:
+        docs = []
+        for path in self.path.glob("*.json"):
+            if path.name == _BASELINE:
+                continue
+            try:
+                docs.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # removed or replaced while listing
+        return docs
+
+    def _totals(self, local: dict) -> dict:
+        """Merged raw counters of every worker (this one fresh from local)."""
+        docs = [{"pid": os.getpid(), "started": self.started, **local}]
+        if self.shared:
+            self.publish(local)
+            docs += [doc for doc in self._segments() if doc.get("pid") != os.getpid()]
+        totals = {"counters": {}, "histograms": {}, "gauges": {}, "workers": 0, "started": self.started}
+        for doc in docs:
+            totals["counters"] = merge(totals["counters"], doc["counters"])
+            totals["histograms"] = merge(totals["histograms"], doc["histograms"])
+            totals["started"] = min(totals["started"], doc["started"])
+            if doc["pid"] == os.getpid() or _alive(doc["pid"]):
+                totals["workers"] += 1
+                totals["gauges"] = merge(totals["gauges"], doc["gauges"])
+        return totals
+
+    def _load_baseline(self) -> dict:
+        if self.shared:
+            try:
+                return json.loads((self.path / _BASELINE).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return {"reset_at": 0.0, "counters": {}, "histograms": {}}
+        return self._baseline
+
+    def read(self, local: dict) -> dict:
+        """
+        Server-wide stats since the last reset: {"counters", "histograms",
+        "gauges", "workers", "since"}. local is this worker's current snapshot.
+        """
+        totals = self._totals(local)
+        baseline = self._load_baseline()
+        return {
+            "counters": subtract(totals["counters"], baseline["counters"]),
+            "histograms": subtract(totals["histograms"], baseline["histograms"]),
+            "gauges": totals["gauges"],
+            "workers": totals["workers"],
+            "since": max(totals["started"], baseline["reset_at"]),
+        }
+
+    def reset(self, local: dict):
+        """Make the current totals the zero point for every worker's reads."""
+        totals = self._totals(local)
+        baseline = {"reset_at": time.time(), "counters": totals["counters"], "histograms": totals["histograms"]}
+        self._baseline = baseline
+        if self.shared:
+            tmp = self.path / (_BASELINE + ".tmp")
+            try:
+                tmp.write_text(json.dumps(baseline, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp, self.path / _BASELINE)
+            except OSError as e:
+                print(f"⚠️  Could not store stats baseline: {e}", file=sys.stderr)
+
+    async def close(self, local: dict):
+        """Stop publishing and leave a final snapshot (or remove the directory if this is the whole server)."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if not self.shared:
+            return
+        if self.server_pid == os.getpid():
+            shutil.rmtree(self.path, ignore_errors=True)
+        else:
+            self.publish(local)
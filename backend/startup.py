@@ -0,0 +1,128 @@
+"""
+HUSH Startup
+Readiness of the inference workers and a report of where startup time went.
+
+The web app itself never imports MediaPipe or OpenCV: those load inside the
+inference workers. At startup the workers are started and warmed in the
+background — MediaPipe imported, a Hands tracker built and a blank frame run
+through the lite and full landmark models — while the server already answers
+/api/gestures, /api/health and static pages. The warm tracker is parked as a
+spare, so the first session does not pay for it.
+
+Until the workers are ready, /api/health reports "ready": false (it is the
+liveness check and always answers 200), /api/health/ready answers 503, and
+/ws either holds frames — the session's newest frame waits, older ones are
+dropped as usual, and the client is told {"type": "status", "state":
+"warming_up"} then "ready" — or sheds them with a "warming_up" status per
+frame. /ws/landmarks needs no workers and is never gated.
+
+If warm-up fails the server is marked ready anyway and the workers start on
+the first frame, as they would with warm-up off.
+
+Configuration (environment):
+  HUSH_WARMUP     1 to start and warm the inference workers in the background at startup,
+                  0 to start them on the first frame (default: 1)
+  HUSH_NOT_READY  "hold" (process the newest frame once ready) or "shed" (answer
+                  "warming_up" and drop it) for /ws frames before then (default: hold)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+NOT_READY_POLICIES = ("hold", "shed")
+HEAVY_MODULES = ("mediapipe", "cv2")  # should only ever load in inference workers
+
+
+def load_config() -> dict:
+    policy = os.environ.get("HUSH_NOT_READY", "hold").strip().lower()
+    if policy not in NOT_READY_POLICIES:
+        raise ValueError(f"Unknown HUSH_NOT_READY '{policy}', expected one of {NOT_READY_POLICIES}")
+    return {
+        "warm_up": os.environ.get("HUSH_WARMUP", "1").strip() not in ("0", "false", "no", ""),
+        "not_ready": policy,
+    }
+
+
+def heavy_modules_loaded() -> list[str]:
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class Startup:
+    """Startup phase timings (ms) and the workers' readiness."""
+
+    def __init__(self, import_ms: float = 0.0, heavy_modules: Optional[list] = None):
+        self.started = time.time()
+        self.phases = {"import": round(import_ms, 1)}
+        self.heavy_modules = heavy_modules or []  # loaded by importing the app (should be none)
+        self.workers: list[dict] = []
+        self.error: Optional[str] = None
+        self.ready_at: Optional[float] = None
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_ready(self):
+        self.ready_at = time.time()
+        self._ready.set()
+
+    async def wait_ready(self):
+        await self._ready.wait()
+
+    def start_warm_up(self, pool, on_ready=None):
+        """Warm the pool's workers in the background; mark ready (and call on_ready) when done."""
+        self._task = asyncio.create_task(self._warm_up(pool, on_ready))
+
+    async def _warm_up(self, pool, on_ready):
+        started = time.perf_counter()
+        try:
+            self.workers = await pool.warm_up()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"⚠️  Warm-up failed ({self.error}); workers start on the first frame", file=sys.stderr)
+        self.phases["warm_up"] = round((time.perf_counter() - started) * 1000, 1)
+        self.mark_ready()
+        if on_ready:
+            on_ready()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def summary(self) -> str:
+        """One log line: total time to ready and its biggest parts."""
+        total = (self.ready_at or time.time()) - self.started + self.phases["import"] / 1000
+        parts = [f"{name} {ms / 1000:.2f}s" for name, ms in self.phases.items() if ms >= 10]
+        if self.workers:
+            slowest = max(self.workers, key=lambda w: sum(w.values()))
+            parts.append(f"slowest worker: import {slowest['import_ms'] / 1000:.2f}s, "
+                         f"tracker {slowest['build_ms'] / 1000:.2f}s, "
+                         f"first frames {slowest['first_frames_ms'] / 1000:.2f}s")
+        return f"{total:.2f}s ({'; '.join(parts)})"
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "seconds_to_ready": round(self.ready_at - self.started + self.phases["import"] / 1000, 3)
+            if self.ready_at else None,
+            "phases_ms": dict(self.phases),
+            "workers": self.workers,
+            "heavy_modules_at_import": self.heavy_modules,
+            "error": self.error,
+        }
@@ -0,0 +1,123 @@
+"""
+HUSH Tracker Pool
+Worker-side pool of per-session GestureClassifier instances.
+Every WebSocket session gets its own classifier so the stability filter and
+MediaPipe's temporal tracking (static_image_mode=False) follow a single video
+stream. Trackers are recycled LRU-first, idle sessions are evicted after a
+timeout, and the number of resident Hands graphs is capped per worker.
+A tracker keeps a graph per model complexity it has run, so switching between
+the full and lite model costs nothing; each graph counts against max_trackers.
+Over the cap, graphs for a tracker's other complexity are closed first (spares,
+then least recently used sessions), and only then is a session's tracker taken.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+class TrackerPool:
+    def __init__(
+        self,
+        factory: Callable,
+        max_trackers: int = 8,
+        idle_seconds: float = 30.0,
+        max_spare: int = 1,
+    ):
+        if max_trackers < 1:
+            raise ValueError("Tracker pool needs room for at least one tracker")
+        self._factory = factory
+        self.max_trackers = max_trackers
+        self.idle_seconds = idle_seconds
+        self.max_spare = max_spare
+        self._active = OrderedDict()  # session_id -> [tracker, last_used]
+        self._spare = []              # reset trackers ready for reuse
+        self._last_sweep = time.monotonic()
+        self.created = 0
+        self.evicted = 0
+
+    @property
+    def graphs(self) -> int:
+        """Resident Hands graphs; a tracker that has not run yet counts as one."""
+        return sum(max(1, tracker.graphs) for tracker in self.trackers())
+
+    def get(self, session_id):
+        """Return the session's tracker, assigning one if needed."""
+        now = time.monotonic()
+        if now - self._last_sweep >= min(self.idle_seconds, 5.0):
+            self.sweep(now)
+
+        entry = self._active.get(session_id)
+        if entry is not None:
+            entry[1] = now
+            self._active.move_to_end(session_id)
+            return entry[0]
+
+        tracker = self._acquire()
+        self._active[session_id] = [tracker, now]
+        return tracker
+
+    def _acquire(self):
+        if self._spare:
+            return self._spare.pop()
+        self.trim(room=1)
+        if self.graphs < self.max_trackers:
+            self.created += 1
+            return self._factory()
+        # At capacity: steal the least recently used session's tracker
+        _, (tracker, _) = self._active.popitem(last=False)
+        self.evicted += 1
+        tracker.reset()
+        return tracker
+
+    def release(self, session_id):
+        """Return a session's tracker to the spare list (or close it)."""
+        entry = self._active.pop(session_id, None)
+        if entry is None:
+            return
+        tracker = entry[0]
+        if len(self._spare) < self.max_spare:
+            tracker.reset()
+            self._spare.append(tracker)
+        else:
+            tracker.close()
+
+    def sweep(self, now: float = None):
+        """Release sessions that have been idle longer than idle_seconds."""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        while self._active:
+            session_id, (_, last_used) = next(iter(self._active.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            self.evicted += 1
+            self.release(session_id)
+
+    def trim(self, room: int = 0):
+        """Close idle-complexity graphs, spares and LRU sessions first, until room more fit."""
+        over = self.graphs + room - self.max_trackers
+        for tracker in self._spare + [entry[0] for entry in self._active.values()]:
+            if over <= 0:
+                break
+            over -= tracker.close_idle_graphs()
+
+    def trackers(self) -> list:
+        """All resident trackers: active sessions first, then spares."""
+        return [entry[0] for entry in self._active.values()] + list(self._spare)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._active),
+            "spare": len(self._spare),
+            "graphs": self.graphs,
+            "created": self.created,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        for tracker, _ in self._active.values():
+            tracker.close()
+        for tracker in self._spare:
+            tracker.close()
+        self._active.clear()
+        self._spare.clear()
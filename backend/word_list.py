@@ -0,0 +1,55 @@
+"""
+Default lexicon for the word decoder (backend/words.py).
+Common English words followed by everyday Hinglish (romanized Hindi) words,
+each list roughly in order of how often it is used; the decoder turns the
+order into a Zipf-like prior. Set HUSH_LEXICON to use a larger word list.
+"""
+
+ENGLISH = """
+THE BE TO OF AND A IN THAT HAVE I IT FOR NOT ON WITH HE AS YOU DO AT THIS BUT
+HIS BY FROM THEY WE SAY HER SHE OR AN WILL MY ONE ALL WOULD THERE THEIR WHAT SO
+UP OUT IF ABOUT WHO GET WHICH GO ME WHEN MAKE CAN LIKE TIME NO JUST HIM KNOW
+TAKE PEOPLE INTO YEAR YOUR GOOD SOME COULD THEM SEE OTHER THAN THEN NOW LOOK
+ONLY COME ITS OVER THINK ALSO BACK AFTER USE TWO HOW OUR WORK FIRST WELL WAY
+EVEN NEW WANT BECAUSE ANY THESE GIVE DAY MOST US IS ARE WAS AM HI HELLO YES
+OKAY PLEASE THANK THANKS SORRY HELP NEED NAME WHERE WHY HOME WATER FOOD EAT
+DRINK SLEEP GOOD BAD HAPPY SAD LOVE FRIEND FAMILY MOTHER FATHER BROTHER SISTER
+SCHOOL BOOK READ WRITE LEARN SIGN HAND NIGHT MORNING TODAY TOMORROW YESTERDAY
+NOW LATER WAIT STOP GO COME HERE THERE FINE SURE MAYBE DONE HOLD CALL DOCTOR
+HOSPITAL POLICE FIRE LOST PAIN HURT SICK WELL MEDICINE EMERGENCY SAFE FREE
+HOUSE ROOM DOOR OPEN CLOSE LIGHT DARK BIG SMALL HOT COLD FAST SLOW STRONG
+BRAVE NICE KIND BEAUTIFUL PEACE HOPE GREAT LIFE LIVE CARE LAUGH CRY SING
+DANCE SWIM JUMP FALL RUN WALK SIT STAND PLAY SPEAK HEAR FEEL SEE THINK MORE
+LESS MUCH MANY LITTLE FEW AGAIN ALWAYS NEVER SOMETIMES EVERY EACH BOTH THANKYOU
+MONEY PAY BUY SELL SHOP MARKET BUS TRAIN CAR TICKET ROAD LEFT RIGHT UP DOWN
+NEAR FAR TEA COFFEE MILK RICE BREAD FRUIT APPLE BANANA MANGO SUGAR SALT
+HUNGRY THIRSTY TIRED BUSY READY LATE EARLY WEEK MONTH HOUR MINUTE CLOCK
+PHONE NUMBER ADDRESS CITY VILLAGE COUNTRY INDIA DELHI MUMBAI OFFICE JOB
+TEACHER STUDENT CLASS EXAM TEST QUESTION ANSWER UNDERSTAND REMEMBER FORGET
+AGREE KNOW SHOW TELL ASK TALK LISTEN WATCH MEET VISIT TRAVEL RETURN BRING
+SEND KEEP LEAVE FIND TRY START FINISH BEGIN END CHANGE MOVE TURN PUSH PULL
+BABY CHILD BOY GIRL MAN WOMAN HUSBAND WIFE SON DAUGHTER UNCLE AUNT GRANDMOTHER
+GRANDFATHER COUSIN NEIGHBOR GUEST BIRTHDAY PARTY FESTIVAL HOLIDAY WEDDING
+WEATHER RAIN SUN WIND SUMMER WINTER TREE FLOWER GARDEN DOG CAT BIRD COW
+COLOR RED BLUE GREEN YELLOW WHITE BLACK PINK ORANGE PURPLE BROWN
+ONE TWO THREE FOUR FIVE SIX SEVEN EIGHT NINE TEN HUNDRED THOUSAND
+FEAR HATE WISH DREAM ANGRY WORRY SCARED EXCITED PROUD SHY BORED CALM
+QUIET LOUD DEAF HEARING INTERPRETER LANGUAGE ENGLISH HINDI WORD LETTER
+SENTENCE SPELL ALPHABET COMPUTER INTERNET MESSAGE VIDEO CAMERA PICTURE
+BATHROOM TOILET SHOWER CLOTHES SHIRT SHOES BED CHAIR TABLE KITCHEN
+BREAKFAST LUNCH DINNER MEAL COOK CLEAN WASH DIRTY NEW OLD YOUNG TALL SHORT
+HEAVY EASY HARD DIFFICULT IMPORTANT SPECIAL SAME DIFFERENT TRUE FALSE
+WRONG CORRECT POSSIBLE WELCOME CONGRATULATIONS GOODBYE BYE SEE YOU SOON
+"""
+
+HINGLISH = """
+HAAN NAHI KYA KAISE KAHAN KAB KYUN KAUN NAMASTE DHANYAVAD SHUKRIYA ACCHA
+THIK THEEK BAHUT THODA PAANI KHANA CHAI DOODH GHAR DOST MAA PAPA BHAI BEHEN
+DIDI BETA BETI NAAM MERA TERA TUMHARA AAP HUM MAIN TUM YAHAN WAHAN ABHI
+KAL AAJ JALDI DHEERE CHALO RUKO AAO JAO BAITHO SUNO DEKHO BOLO SAMAJH PATA
+MADAD DARD DAWAI DOCTOR PAISA KITNA SAHI GALAT KHUSH DUKHI PYAAR SUNDAR
+ZAROOR BILKUL KUCH SAB KOI NAHIN HAI HO THA THI KARO KARNA JANA AANA
+KHAO PIYO SOJAO UTHO SCHOOL KAAM DUKAAN BAZAAR SADAK GAADI BUS TRAIN
+"""
+
+WORDS = tuple(dict.fromkeys(ENGLISH.split() + HINGLISH.split()))
@@ -0,0 +1,299 @@
+"""
+HUSH Word Decoder
+Turns a session's letter stream into word completions and corrections.
+
+Letters: the decoder watches the same results the client does. A stable
+letter held for hold_ms becomes one letter event, the same moment the
+frontend's auto-add fires; holding on repeats the letter after the
+frontend's cooldown and another hold. The event's evidence is every raw
+prediction (pending_letter and its raw confidence) since the previous stable
+run ended, so a misread that only stabilised on the wrong letter still leaves
+the right one in the running.
+A hand absent for gap_ms ends the word.
+
+Lexicon: a prefix trie of the word list, built once per process and only
+read afterwards. Nodes are numbered breadth-first, so each node's children
+are one contiguous range; every node stores its letter, parent, the word
+ending there, the best log-prior of any word below it and its top-K
+precomputed completions. The built-in ~500-word list is ~1,400 nodes.
+
+Decoding keeps a beam of (trie node, score) hypotheses. Each letter event
+extends every hypothesis by each child — at most 26 — scored by the event's
+smoothed letter distribution plus the change in best reachable word prior, or
+skips the letter as spurious at a fixed cost. Work per letter is
+beam × 26, whatever the lexicon's size. Words outside the lexicon compete as
+the letters exactly as typed with a per-letter penalty, so names are left
+alone unless a lexicon word explains the evidence clearly better.
+
+Whenever a letter event or word end changes it, the /ws and /ws/landmarks
+result carries:
+
+  "word": {"typed": "HRLP", "decoded": "HELP", "completions": ["HELP", ...],
+           "final": null | "HELP"}
+
+typed is the top letter of each event, decoded the best hypothesis's
+spelling, completions the best words reachable from the top hypotheses,
+final the chosen word when the word ended.
+
+Configuration (environment):
+  HUSH_WORDS          1 to decode words, 0 to leave results alone (default: 1)
+  HUSH_LEXICON        word list, one word per line with an optional count (default: built-in)
+  HUSH_WORDS_BEAM     hypotheses kept per letter (default: 16)
+  HUSH_WORDS_HOLD_MS  stable hold that makes a letter event (default: 1800)
+  HUSH_WORDS_GAP_MS   hand absence that ends a word (default: 1500)
+"""
+
+import math
+import os
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SMOOTHING = 0.05                  # probability mass spread over every letter
+SKIP_LOGP = math.log(0.02)        # an event that was not meant as a letter
+OOV_LOGP = math.log(0.02)         # a word outside the lexicon...
+OOV_LETTER_LOGP = math.log(1 / 12)  # ...and each of its letters (~English letter entropy)
+REPEAT_COOLDOWN = 1.2             # seconds; the frontend's AUTO_COOLDOWN_MS
+
+
+def load_config() -> dict:
+    return {
+        "enabled": os.environ.get("HUSH_WORDS", "1").strip() not in ("0", "false", "no", ""),
+        "lexicon": os.environ.get("HUSH_LEXICON", ""),
+        "beam": int(os.environ.get("HUSH_WORDS_BEAM", 16)),
+        "hold_ms": float(os.environ.get("HUSH_WORDS_HOLD_MS", 1800)),
+        "gap_ms": float(os.environ.get("HUSH_WORDS_GAP_MS", 1500)),
+    }
+
+
+# ─── Lexicon ─────────────────────────────────────────────────────────────────
+
+class Lexicon:
+    """Read-only prefix trie in flat arrays (node 0 is the root)."""
+
+    def __init__(self, words: list[tuple[str, float]], completions: int = 5):
+        counts = {}
+        for word, count in words:
+            word = word.strip().upper()
+            if word and all(ch in ALPHABET for ch in word):
+                counts[word] = counts.get(word, 0.0) + count
+        if not counts:
+            raise ValueError("Lexicon has no words of A–Z letters")
+        self.words = sorted(counts)
+        total = sum(counts.values())
+        self.logp = np.array([math.log(counts[w] / total) for w in self.words])
+
+        # Breadth-first numbering: a node's children get consecutive ids
+        letter, parent, first, n_children, word_at = [0], [-1], [0], [0], [-1]
+        level = [(0, list(range(len(self.words))))]  # (node, words below it)
+        depth = 0
+        while level:
+            next_level = []
+            for node, members in level:
+                groups = {}
+                for w in members:
+                    if len(self.words[w]) == depth:
+                        word_at[node] = w
+                    else:
+                        groups.setdefault(self.words[w][depth], []).append(w)
+                first[node] = len(letter)
+                n_children[node] = len(groups)
+                for ch in sorted(groups):
+                    child = len(letter)
+                    letter.append(ALPHABET.index(ch))
+                    parent.append(node)
+                    first.append(0)
+                    n_children.append(0)
+                    word_at.append(-1)
+                    next_level.append((child, groups[ch]))
+            level = next_level
+            depth += 1
+        self.letter = np.array(letter, dtype=np.uint8)
+        self.parent = np.array(parent, dtype=np.int32)
+        self.first = np.array(first, dtype=np.int32)
+        self.n_children = np.array(n_children, dtype=np.uint8)
+        self.word_at = np.array(word_at, dtype=np.int32)
+
+        # Children have higher ids than parents: fill best / completions bottom-up
+        n = len(letter)
+        self.best = np.full(n, -np.inf)
+        self.completions = np.full((n, completions), -1, dtype=np.int32)
+        logp = self.logp
+        for node in range(n - 1, -1, -1):
+            pool = list(self.completions[self.first[node]:self.first[node] + self.n_children[node]].ravel())
+            if self.word_at[node] >= 0:
+                pool.append(self.word_at[node])
+            pool = sorted((w for w in pool if w >= 0), key=lambda w: -logp[w])[:completions]
+            self.completions[node, :len(pool)] = pool
+            if pool:
+                self.best[node] = logp[pool[0]]
+
+    @classmethod
+    def from_lines(cls, lines, completions: int = 5) -> "Lexicon":
+        """Word-list lines: "WORD" or "WORD COUNT"; words without counts get a Zipf prior by position."""
+        words = []
+        for rank, line in enumerate(line for line in lines if line.strip() and not line.startswith("#")):
+            parts = line.split()
+            words.append((parts[0], float(parts[1]) if len(parts) > 1 else 1.0 / (rank + 10)))
+        return cls(words, completions)
+
+    def __len__(self) -> int:
+        return len(self.letter)
+
+    def children(self, node: int) -> range:
+        start = int(self.first[node])
+        return range(start, start + int(self.n_children[node]))
+
+    def spell(self, node: int) -> str:
+        chars = []
+        while node > 0:
+            chars.append(ALPHABET[self.letter[node]])
+            node = int(self.parent[node])
+        return "".join(reversed(chars))
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(path: str = "") -> Lexicon:
+    """The process-wide lexicon for a word-list path ("" = built-in list)."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return Lexicon.from_lines(f)
+    from backend.word_list import WORDS
+    return Lexicon.from_lines(WORDS)
+
+
+# ─── Decoder ─────────────────────────────────────────────────────────────────
+
+class WordDecoder:
+    """Per-session letter segmentation and beam search over a shared Lexicon."""
+
+    def __init__(self, lexicon: Lexicon, beam: int = 16, hold_ms: float = 1800, gap_ms: float = 1500):
+        self.lexicon = lexicon
+        self.beam = beam
+        self.hold = hold_ms / 1000
+        self.gap = gap_ms / 1000
+        self._evidence = np.zeros(len(ALPHABET))
+        self._run_letter = None      # stable letter being held
+        self._run_since = 0.0        # when its current hold started
+        self._absent_since = None    # when the hand disappeared
+        self.reset_word()
+
+    def reset_word(self):
+        # score = log P(evidence | prefix) + best log-prior of a word below the node
+        self._nodes = np.zeros(1, dtype=np.int64)
+        self._scores = np.array([self.lexicon.best[0]])
+        self._typed = ""
+        self._typed_logp = 0.0
+
+    def observe(self, result: dict, now: float) -> Optional[dict]:
+        """
+        Feed one frame's result (before encoding). Returns the "word" update
+        when a letter event or the end of a word changed it, else None.
+        """
+        if not result.get("hand_detected"):
+            self._end_run()
+            if self._absent_since is None:
+                self._absent_since = now
+            elif self._typed and now - self._absent_since >= self.gap:
+                return self._finish()
+            return None
+        self._absent_since = None
+
+        raw = result.get("pending_letter")
+        if raw and raw in ALPHABET:
+            weight = result.get("_raw_confidence", result.get("confidence", 0.0))
+            self._evidence[ALPHABET.index(raw)] += max(weight, 0.05)
+        letter = result.get("letter")
+        if not letter:
+            self._end_run()
+            return None
+        if letter != self._run_letter:
+            self._run_letter, self._run_since = letter, now
+        elif now - self._run_since >= self.hold:
+            self._run_since = now + REPEAT_COOLDOWN  # keep holding to repeat the letter
+            return self._letter_event()
+        return None
+
+    def _end_run(self):
+        if self._run_letter is not None:
+            self._run_letter = None
+            self._evidence[:] = 0.0
+
+    def _letter_event(self) -> dict:
+        evidence = self._evidence
+        if self._run_letter in ALPHABET:
+            evidence[ALPHABET.index(self._run_letter)] += 1.0
+        dist = (1 - SMOOTHING) * evidence / evidence.sum() + SMOOTHING / len(ALPHABET)
+        log_obs = np.log(dist)
+        top = int(np.argmax(dist))
+        self._typed += ALPHABET[top]
+        self._typed_logp += log_obs[top] + OOV_LETTER_LOGP
+        evidence[:] = 0.0
+
+        lex = self.lexicon
+        nodes, scores = [self._nodes], [self._scores + SKIP_LOGP]
+        for node, score in zip(self._nodes.tolist(), self._scores.tolist()):
+            kids = lex.children(node)
+            if len(kids):
+                k = np.arange(kids.start, kids.stop)
+                nodes.append(k)
+                scores.append(score + log_obs[lex.letter[k]] + lex.best[k] - lex.best[node])
+        nodes, scores = np.concatenate(nodes), np.concatenate(scores)
+        # Best score per node, then the top `beam` nodes
+        order = np.lexsort((-scores, nodes))
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = nodes[order[1:]] != nodes[order[:-1]]
+        nodes, scores = nodes[order[keep]], scores[order[keep]]
+        if len(nodes) > self.beam:
+            top_k = np.argpartition(-scores, self.beam - 1)[:self.beam]
+            nodes, scores = nodes[top_k], scores[top_k]
+        ranked = np.argsort(-scores)
+        self._nodes, self._scores = nodes[ranked], scores[ranked]
+        return self._update(None)
+
+    def _word_scores(self, limit: int) -> list[tuple[float, str]]:
+        """Best (score, word) completions over the top hypotheses."""
+        lex = self.lexicon
+        seen = {}
+        for node, score in zip(self._nodes[:3].tolist(), self._scores[:3].tolist()):
+            for w in lex.completions[node].tolist():
+                if w < 0:
+                    break
+                total = score + lex.logp[w] - lex.best[node]
+                if total > seen.get(w, -np.inf):
+                    seen[w] = total
+        ranked = sorted(seen.items(), key=lambda item: -item[1])[:limit]
+        return [(total, lex.words[w]) for w, total in ranked]
+
+    def _decoded(self) -> str:
+        best = float(self._scores[0])
+        if self._typed_logp + OOV_LOGP > best:
+            return self._typed
+        return self.lexicon.spell(int(self._nodes[0]))
+
+    def _update(self, final: Optional[str]) -> dict:
+        return {
+            "typed": self._typed,
+            "decoded": self._decoded(),
+            "completions": [word for _, word in self._word_scores(5)] if final is None else [],
+            "final": final,
+        }
+
+    def _finish(self) -> dict:
+        """Close the word: the best complete lexicon word, or the letters as typed."""
+        lex = self.lexicon
+        final, best = self._typed, self._typed_logp + OOV_LOGP
+        for node, score in zip(self._nodes.tolist(), self._scores.tolist()):
+            w = int(lex.word_at[node])
+            if w >= 0 and score + lex.logp[w] - lex.best[node] > best:
+                final, best = lex.words[w], score + lex.logp[w] - lex.best[node]
+        update = self._update(final)
+        self.reset_word()
+        return update
+
+    def reset(self):
+        self._end_run()
+        self._absent_since = None
+        self.reset_word()
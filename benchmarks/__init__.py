@@ -0,0 +1 @@
+"""HUSH benchmarks — run modules with `python -m benchmarks.<name>`."""
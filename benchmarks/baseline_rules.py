@@ -0,0 +1,189 @@
+"""
+The original rule cascade, frozen: a verbatim copy of the if-chain that
+backend/gesture_rules.py compiled into its finger-state dispatch table. It is
+the reference the parity checks (benchmarks/classifier_vectorized.py,
+tests/test_gesture_rules.py) hold the table and the vectorized classifier to —
+do not edit it along with the rules.
+"""
+
+import math
+
+from backend.landmarks import (
+    WRIST,
+    THUMB_IP, THUMB_TIP,
+    INDEX_MCP, INDEX_PIP, INDEX_TIP,
+    MIDDLE_MCP, MIDDLE_PIP, MIDDLE_TIP,
+    RING_PIP, RING_TIP,
+    PINKY_PIP, PINKY_TIP,
+)
+
+
+def dist(a, b):
+    return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2 + (a.z - b.z) ** 2)
+
+
+def is_finger_up(lm, tip_idx, pip_idx):
+    """Returns True if the finger tip is above its PIP joint (extended)."""
+    return lm[tip_idx].y < lm[pip_idx].y
+
+
+def is_finger_bent(lm, tip_idx, pip_idx):
+    return lm[tip_idx].y > lm[pip_idx].y
+
+
+def finger_states(lm):
+    """Returns bool tuple: (thumb_up, index_up, middle_up, ring_up, pinky_up)"""
+    thumb = lm[THUMB_TIP].x < lm[THUMB_IP].x  # left hand: thumb extends left
+    # For typical right hand in mirrored (selfie) view:
+    thumb = lm[THUMB_TIP].x > lm[THUMB_IP].x
+    index = is_finger_up(lm, INDEX_TIP, INDEX_PIP)
+    middle = is_finger_up(lm, MIDDLE_TIP, MIDDLE_PIP)
+    ring = is_finger_up(lm, RING_TIP, RING_PIP)
+    pinky = is_finger_up(lm, PINKY_TIP, PINKY_PIP)
+    return (thumb, index, middle, ring, pinky)
+
+
+def fingers_up_count(states):
+    return sum(states)
+
+
+def touching(lm, a_idx, b_idx, threshold=0.06):
+    return dist(lm[a_idx], lm[b_idx]) < threshold
+
+
+def classify_gesture(lm) -> tuple[str, float]:
+    """
+    Returns (letter, confidence) for ISL alphabet.
+    Uses rule-based landmark geometry.
+    """
+    t, i, m, r, p = finger_states(lm)
+    count = fingers_up_count((t, i, m, r, p))
+
+    # --- A: Fist, thumb to the side ---
+    if not i and not m and not r and not p and not t:
+        return ("A", 0.82)
+
+    # --- S: Fist with thumb over fingers ---
+    if not i and not m and not r and not p and t:
+        if lm[THUMB_TIP].y > lm[INDEX_MCP].y:
+            return ("S", 0.78)
+
+    # --- B: 4 fingers up, thumb folded ---
+    if not t and i and m and r and p:
+        if abs(lm[INDEX_TIP].x - lm[PINKY_TIP].x) < 0.15:
+            return ("B", 0.85)
+
+    # --- L: Index up + thumb out ---
+    if t and i and not m and not r and not p:
+        # Thumb and index roughly perpendicular
+        return ("L", 0.83)
+
+    # --- Y: Thumb + pinky extended (shaka) ---
+    if t and not i and not m and not r and p:
+        return ("Y", 0.87)
+
+    # --- I: Only pinky up ---
+    if not t and not i and not m and not r and p:
+        return ("I", 0.84)
+
+    # --- D: Index up, thumb touches middle ---
+    if not t and i and not m and not r and not p:
+        if touching(lm, THUMB_TIP, MIDDLE_TIP, 0.07):
+            return ("D", 0.80)
+
+    # --- G: Index horizontal, thumb parallel ---
+    if not t and i and not m and not r and not p:
+        # Index roughly horizontal (tip.y ≈ MCP.y)
+        if abs(lm[INDEX_TIP].y - lm[INDEX_MCP].y) < 0.07:
+            return ("G", 0.75)
+
+    # --- X: Index bent/hooked ---
+    if not t and not m and not r and not p:
+        if lm[INDEX_TIP].y > lm[INDEX_PIP].y:  # index bent down
+            return ("X", 0.78)
+
+    # --- 1/Index: Index up alone ---
+    if not t and i and not m and not r and not p:
+        return ("1", 0.70)
+
+    # --- V: Index + middle in V ---
+    if not t and i and m and not r and not p:
+        spread = abs(lm[INDEX_TIP].x - lm[MIDDLE_TIP].x)
+        if spread > 0.04:
+            return ("V", 0.85)
+
+    # --- U: Index + middle together ---
+    if not t and i and m and not r and not p:
+        return ("U", 0.80)
+
+    # --- R: Index + middle crossed ---
+    if not t and i and m and not r and not p:
+        if lm[INDEX_TIP].x > lm[MIDDLE_TIP].x:  # crossed
+            return ("R", 0.76)
+        return ("U", 0.80)
+
+    # --- H: Index + middle horizontal ---
+    if not t and i and m and not r and not p:
+        if abs(lm[INDEX_TIP].y - lm[INDEX_MCP].y) < 0.07:
+            return ("H", 0.75)
+
+    # --- K: V with thumb between ---
+    if t and i and m and not r and not p:
+        if lm[THUMB_TIP].y < lm[INDEX_MCP].y:
+            return ("K", 0.78)
+
+    # --- W: 3 fingers spread ---
+    if not t and i and m and r and not p:
+        spread = abs(lm[INDEX_TIP].x - lm[RING_TIP].x)
+        if spread > 0.07:
+            return ("W", 0.82)
+
+    # --- 3 fingers: W variant ---
+    if not t and i and m and r and not p:
+        return ("W", 0.75)
+
+    # --- F: OK sign (index+thumb circle, 3 fingers up) ---
+    if not t and i and m and r and p:
+        if touching(lm, INDEX_TIP, THUMB_TIP, 0.06):
+            return ("F", 0.82)
+
+    # --- O: All fingertips touching thumb ---
+    if count >= 3:
+        if touching(lm, INDEX_TIP, THUMB_TIP, 0.07):
+            all_close = all(touching(lm, tip, THUMB_TIP, 0.10) for tip in [MIDDLE_TIP, RING_TIP])
+            if all_close:
+                return ("O", 0.84)
+
+    # --- C: Curved hand ---
+    if not i and not m and not r and not p:
+        # Open C shape — all fingers curved but not closed
+        return ("C", 0.70)
+
+    # --- E: Fingers bent at middle joint ---
+    if not t and not i and not m and not r and not p:
+        return ("E", 0.72)
+
+    # --- M: 3 fingers over thumb ---
+    if not t and not i and not m and not r and not p:
+        return ("M", 0.68)
+
+    # --- N: 2 fingers over thumb ---
+    if not t and not i and not m and not r and not p:
+        return ("N", 0.65)
+
+    # --- T: Thumb between index+middle ---
+    if not i and not m and not r and not p:
+        if lm[THUMB_TIP].x > lm[INDEX_MCP].x and lm[THUMB_TIP].x < lm[MIDDLE_MCP].x:
+            return ("T", 0.73)
+
+    # --- P: K shape pointing down ---
+    if t and i and m and not r and not p:
+        if lm[INDEX_TIP].y > lm[WRIST].y:  # pointing downward
+            return ("P", 0.70)
+
+    # --- Q: G pointing down ---
+    if t and i and not m and not r and not p:
+        if lm[INDEX_TIP].y > lm[WRIST].y:
+            return ("Q", 0.68)
+
+    return (None, 0.0)
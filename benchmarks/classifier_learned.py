@@ -0,0 +1,97 @@
+"""
+Accuracy and latency of the rule table vs learned indexes (centroid, knn).
+
+    python -m benchmarks.classifier_learned [--hands 30000] [--labelled labelled.jsonl|.npz ...]
+
+With --labelled, hands and letters come from labelled files (see
+backend/learned.py) and the rules are scored against those labels too.
+Without it, posed synthetic hands are labelled by the rule table itself, so
+the learned accuracies measure how well each index reproduces the rules —
+not sign accuracy — and the rules score 1.0 by construction.
+
+Both indexes are trained on a shuffled split and scored on the held-out
+hands. Latency is measured per batch of --batch hands (a typical micro-batch)
+and as whole-set throughput.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.gesture_rules import classify_landmarks
+from backend.learned import LearnedClassifier, load_labelled
+from benchmarks.corpus import posed_hands
+from benchmarks.report import emit, summarize
+
+
+def _measure(classify, hands: np.ndarray, labels: np.ndarray, batch: int) -> dict:
+    start = time.perf_counter()
+    predictions = classify(hands)
+    total_s = time.perf_counter() - start
+    batch_ms = []
+    for offset in range(0, len(hands), batch):
+        start = time.perf_counter()
+        classify(hands[offset:offset + batch])
+        batch_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "accuracy": round(float(np.mean([letter == label for (letter, _), label in zip(predictions, labels)])), 4),
+        "hands_per_sec": round(len(hands) / total_s),
+        "batch_latency": summarize(batch_ms),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hands", type=int, default=30000, help="posed hands to generate (without --labelled)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--labelled", nargs="+", help="labelled JSONL / .npz files instead of rule-labelled posed hands")
+    parser.add_argument("--label-field", default="label")
+    parser.add_argument("--test-fraction", type=float, default=0.3)
+    parser.add_argument("--prototypes", type=int, default=8)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=8, help="hands per timed batch")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    if args.labelled:
+        hands, labels = load_labelled(args.labelled, args.label_field)
+    else:
+        hands = posed_hands(args.hands, args.seed)
+        letters = np.array([letter or "" for letter, _ in classify_landmarks(hands)])
+        hands, labels = hands[letters != ""], letters[letters != ""]
+    order = np.random.default_rng(args.seed).permutation(len(hands))
+    cut = int(len(order) * (1 - args.test_fraction))
+    train, test = order[:cut], order[cut:]
+
+    report = {
+        "corpus": ",".join(args.labelled) if args.labelled else "posed (labels from rules)",
+        "train_hands": len(train),
+        "test_hands": len(test),
+        "letters": sorted(set(labels.tolist())),
+        "rules": _measure(classify_landmarks, hands[test], labels[test], args.batch),
+    }
+    for kind in ("centroid", "knn"):
+        start = time.perf_counter()
+        clf = LearnedClassifier.train(hands[train], labels[train], kind, args.prototypes, args.k, args.seed)
+        train_s = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            clf.save(path)
+            size = os.path.getsize(path)
+            clf = LearnedClassifier.load(path)  # score what would be deployed (float16 knn vectors)
+        report[kind] = {
+            "vectors": len(clf.vectors),
+            "index_bytes": size,
+            "train_seconds": round(train_s, 2),
+            **_measure(clf.classify, hands[test], labels[test], args.batch),
+        }
+    emit("classifier_learned", report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
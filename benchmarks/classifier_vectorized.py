@@ -0,0 +1,70 @@
+"""
+Parity check and throughput comparison: the frozen original cascade
+(benchmarks/baseline_rules.py) vs the rule table's scalar classify_gesture and
+the vectorized classify_landmarks over (N, 21, 3) arrays.
+
+    python -m benchmarks.classifier_vectorized [--hands 20000] [--corpus hands.jsonl]
+
+Exits non-zero if either gives any hand a different letter or confidence than
+the original cascade.
+"""
+
+import argparse
+import sys
+import time
+
+from backend.gesture_classifier import classify_gesture
+from backend.gesture_rules import classify_landmarks
+from benchmarks import baseline_rules
+from benchmarks.corpus import as_landmark_lists, load_hands
+from benchmarks.report import emit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="recorded landmarks (.npy or JSONL) instead of synthetic hands")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    hands = load_hands(args.corpus, args.hands, args.seed)
+    lists = as_landmark_lists(hands)
+
+    start = time.perf_counter()
+    baseline = [baseline_rules.classify_gesture(lm) for lm in lists]
+    baseline_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = [classify_gesture(lm) for lm in lists]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector = classify_landmarks(hands)
+    vector_s = time.perf_counter() - start
+
+    scalar_mismatches = [n for n, (a, b) in enumerate(zip(baseline, scalar)) if a != b]
+    mismatches = [n for n, (a, b) in enumerate(zip(baseline, vector)) if a != b]
+    letters = sorted({letter or "-" for letter, _ in baseline})
+    report = {
+        "corpus": args.corpus or "synthetic",
+        "hands": len(hands),
+        "letters_covered": letters,
+        "scalar_mismatches": len(scalar_mismatches),
+        "mismatches": len(mismatches),
+        "baseline_hands_per_sec": round(len(hands) / baseline_s),
+        "scalar_hands_per_sec": round(len(hands) / scalar_s),
+        "vectorized_hands_per_sec": round(len(hands) / vector_s),
+        "speedup": round(scalar_s / vector_s, 2),
+    }
+    emit("classifier_vectorized", report, args.output)
+    if scalar_mismatches or mismatches:
+        n = min(scalar_mismatches + mismatches)
+        print(f"first mismatch at hand {n}: original={baseline[n]} scalar={scalar[n]} vectorized={vector[n]}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
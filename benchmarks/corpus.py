@@ -0,0 +1,144 @@
+"""
+Corpora for benchmarks.
+
+Landmarks: synthetic hands are random 21-point clouds at a mix of scales, so
+that every finger-state mask and both sides of the distance thresholds in the
+rules are exercised. Posed hands come from a small kinematic model (palm plus
+jointed fingers with random flexion, splay, rotation and scale) — hand-shaped,
+so nearest-neighbour classifiers have structure to learn. Recorded hands load
+from a .npy (N, 21, 3) array or a JSONL file with a "landmarks" field per line — e.g. the output of
+`python -m backend.offline ... --landmarks`.
+
+Frames: synthetic JPEGs of a hand-like silhouette on a noisy background, or a
+directory of recorded JPEG/PNG frames.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+class Point:
+    """Stand-in for a MediaPipe NormalizedLandmark (.x/.y/.z)."""
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+def synthetic_hands(n: int, seed: int = 0) -> np.ndarray:
+    """(n, 21, 3) float32 array of random hands."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0.3, 0.7, size=(n, 1, 3))
+    scales = rng.choice([0.02, 0.04, 0.08, 0.15, 0.3], size=(n, 1, 1))
+    hands = centers + scales * rng.standard_normal((n, 21, 3))
+    return hands.astype(np.float32)
+
+
+# Kinematic hand model, in hand lengths (wrist → middle MCP), y up the hand
+_BASES = {  # MCP (thumb: CMC) position relative to the wrist
+    "thumb": (-0.35, -0.3), "index": (-0.3, -0.95), "middle": (0.0, -1.0),
+    "ring": (0.25, -0.95), "pinky": (0.45, -0.85),
+}
+_SEGMENTS = {
+    "thumb": (0.4, 0.35, 0.3), "index": (0.45, 0.28, 0.22), "middle": (0.5, 0.32, 0.24),
+    "ring": (0.47, 0.3, 0.22), "pinky": (0.36, 0.22, 0.2),
+}
+_BENDS = np.radians((80, 100, 70))  # full flexion per joint
+
+
+def posed_hands(n: int, seed: int = 0) -> np.ndarray:
+    """(n, 21, 3) float32 array of kinematically plausible hands in image coordinates."""
+    rng = np.random.default_rng(seed)
+    hands = np.zeros((n, 21, 3))
+    for finger, (bx, by) in _BASES.items():
+        first = 1 + 4 * list(_BASES).index(finger)
+        # Mostly clearly open or closed, sometimes in between
+        flex = np.clip(rng.choice([0.05, 0.95], size=n) + rng.normal(0, 0.2, n), 0, 1)
+        splay = rng.normal(0, 0.12, n) + (0.9 if finger == "thumb" else (bx * 0.3))
+        hands[:, first] = (bx, by, 0.0)
+        angle = np.zeros(n)
+        for joint, (length, bend) in enumerate(zip(_SEGMENTS[finger], _BENDS)):
+            angle = angle + flex * bend
+            if finger == "thumb":  # folds across the palm in the image plane
+                step = np.stack([np.sin(splay - angle), -np.cos(splay - angle), np.zeros(n)], axis=1)
+            else:                  # curls toward the camera and back down the palm
+                step = np.stack([np.sin(splay), -np.cos(angle), -np.sin(angle)], axis=1)
+            hands[:, first + joint + 1] = hands[:, first + joint] + length * step
+    theta = rng.normal(0, 0.3, n)
+    rotation = np.stack([
+        np.stack([np.cos(theta), -np.sin(theta)], axis=1),
+        np.stack([np.sin(theta), np.cos(theta)], axis=1),
+    ], axis=1)  # (n, 2, 2)
+    hands[:, :, :2] = np.einsum("nij,nkj->nki", rotation, hands[:, :, :2])
+    scale = rng.uniform(0.08, 0.25, size=(n, 1, 1))
+    hands = hands * scale + rng.normal(0, 0.004, hands.shape)
+    hands[:, :, :2] += rng.uniform(0.3, 0.7, size=(n, 1, 2))
+    return hands.astype(np.float32)
+
+
+def as_landmark_lists(hands: np.ndarray) -> list:
+    """(n, 21, 3) array → list of landmark lists with .x/.y/.z attributes."""
+    return [[Point(x, y, z) for x, y, z in hand.tolist()] for hand in hands]
+
+
+def recorded_hands(path: str) -> np.ndarray:
+    """Load recorded landmarks from .npy or JSONL into an (n, 21, 3) float32 array."""
+    from backend.protocol import parse_landmark_json
+
+    if path.endswith(".npy"):
+        return np.load(path).astype(np.float32).reshape(-1, 21, 3)
+    hands = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if row.get("landmarks") or row.get("hands"):
+                hands.append(parse_landmark_json(row)[1])
+    if not hands:
+        raise ValueError(f"No landmarks found in {path}")
+    return np.concatenate(hands)
+
+
+def load_hands(corpus: str = None, n: int = 20000, seed: int = 0) -> np.ndarray:
+    """Recorded hands if a corpus path is given, else n synthetic hands."""
+    return recorded_hands(corpus) if corpus else synthetic_hands(n, seed)
+
+
+def synthetic_frames(n: int, width: int = 640, height: int = 480, quality: int = 65, seed: int = 0) -> list[bytes]:
+    """n JPEG frames of a palm-and-fingers silhouette at varying positions."""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(n):
+        img = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+        cx = int(rng.uniform(0.3, 0.7) * width)
+        cy = int(rng.uniform(0.45, 0.7) * height)
+        r = int(min(width, height) * rng.uniform(0.08, 0.14))
+        skin = (int(rng.integers(120, 170)), int(rng.integers(150, 190)), int(rng.integers(190, 235)))
+        cv2.ellipse(img, (cx, cy), (r, int(r * 1.2)), 0, 0, 360, skin, -1)
+        for k, angle in enumerate(np.linspace(-0.9, 0.5, 5)):
+            length = r * (1.1 if k else 0.8) * rng.uniform(0.4, 1.0)
+            tip = (int(cx + np.sin(angle) * (r + length)), int(cy - np.cos(angle) * (r + length)))
+            cv2.line(img, (cx, cy), tip, skin, max(4, r // 5))
+        ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append(buf.tobytes())
+    return frames
+
+
+def recorded_frames(directory: str, limit: int = None) -> list[bytes]:
+    """Encoded image files from a directory, sorted by name (not re-encoded)."""
+    names = sorted(
+        name for name in os.listdir(directory)
+        if Path(name).suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"}
+    )[:limit]
+    if not names:
+        raise ValueError(f"No images found in {directory}")
+    return [Path(directory, name).read_bytes() for name in names]
+
+
+def load_frames(directory: str = None, n: int = 200, seed: int = 0) -> list[bytes]:
+    """Recorded frames if a directory is given, else n synthetic JPEGs."""
+    return recorded_frames(directory, n) if directory else synthetic_frames(n, seed=seed)
@@ -0,0 +1,119 @@
+"""
+Per-stage timing of the frame path in GestureClassifier.process_frame.
+
+    python -m benchmarks.frame_pipeline [--frames 200] [--dir recorded/] [--repeat 3] [--compare-hands]
+
+Stages, in order: b64 decode (the text-frame fallback), imdecode, cvtColor,
+hands.process, classify, landmark serialization. Each frame runs through one
+tracking classifier, as a live session would; classify and serialize are only
+timed on frames where a hand was found.
+
+--compare-hands also times whole process_frame calls tracking one hand and
+two (HUSH_MAX_HANDS=2), with the frame cache off, and reports the p50 ratio.
+"""
+
+import argparse
+import base64
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from backend.gesture_classifier import GestureClassifier, classify_gesture
+from backend.landmarks import landmarks_to_array, serialize_landmarks
+from benchmarks.corpus import load_frames
+from benchmarks.report import emit, summarize
+
+STAGES = ("b64_decode", "imdecode", "cvt_color", "hands_process", "classify", "serialize")
+
+
+def run(frames: list[bytes], repeat: int = 1) -> dict:
+    clf = GestureClassifier()
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+    encoded = [base64.b64encode(frame).decode("ascii") for frame in frames]
+    hands = 0
+    clock = time.perf_counter
+
+    try:
+        for _ in range(repeat):
+            for b64 in encoded:
+                t0 = clock()
+                raw = base64.b64decode(b64)
+                t1 = clock()
+                img = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+                t2 = clock()
+                rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                t3 = clock()
+                found = clf.hands.process(rgb).multi_hand_landmarks
+                t4 = clock()
+                stamps = [t0, t1, t2, t3, t4]
+                if found:
+                    lm = found[0].landmark
+                    classify_gesture(lm)
+                    t5 = clock()
+                    serialize_landmarks(landmarks_to_array(lm))
+                    stamps += [t5, clock()]
+                    hands += 1
+                for stage, start, end in zip(STAGES, stamps, stamps[1:]):
+                    timings[stage].append((end - start) * 1000)
+                totals.append((stamps[-1] - t0) * 1000)
+    finally:
+        clf.close()
+
+    total_s = sum(totals) / 1000
+    return {
+        "frames": len(totals),
+        "frames_with_hand": hands,
+        "frames_per_sec": round(len(totals) / total_s, 1) if total_s else 0.0,
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+        "total": summarize(totals),
+    }
+
+
+def compare_hands(frames: list[bytes], repeat: int = 1) -> dict:
+    """End-to-end process_frame latency with max_hands 1 and 2."""
+    report = {}
+    for max_hands in (1, 2):
+        clf = GestureClassifier(frame_cache={"enabled": False}, max_hands=max_hands)
+        samples, hands = [], 0
+        try:
+            for _ in range(repeat):
+                for frame in frames:
+                    t0 = time.perf_counter()
+                    result = clf.process_frame(frame)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                    hands += len(result["hands"]) if "hands" in result else result["hand_detected"]
+        finally:
+            clf.close()
+        report[f"{max_hands}_hand"] = {"hands_found": hands, "latency": summarize(samples)}
+    one, two = report["1_hand"]["latency"], report["2_hand"]["latency"]
+    report["p50_ratio"] = round(two["p50_ms"] / one["p50_ms"], 2) if one.get("p50_ms") else None
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200, help="synthetic frames (or max recorded frames)")
+    parser.add_argument("--dir", help="directory of recorded JPEG/PNG frames instead of synthetic ones")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare-hands", action="store_true", help="also time one- vs two-hand tracking")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.dir, args.frames, args.seed)
+    report = {
+        "corpus": args.dir or "synthetic",
+        "frame_bytes_mean": round(sum(map(len, frames)) / len(frames)),
+        **run(frames, args.repeat),
+    }
+    if args.compare_hands:
+        report["hands"] = compare_hands(frames, args.repeat)
+    emit("frame_pipeline", report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Replay a recorded session (backend/recorder.py) through the classifier.
+
+    python -m benchmarks.replay recordings/<session> [--speed 1] [--all-frames] [--diffs 20]
+
+/ws recordings feed each frame through a tracking GestureClassifier, as the
+session's worker did; /ws/landmarks recordings feed the received landmarks
+through the stability filter and motion tracker. Every replayed result is
+compared with the one recorded for the same frame (hand_detected, letter,
+pending_letter, stable, confidence within --confidence-tolerance, landmarks
+within --landmark-tolerance). The report counts mismatches per field, lists
+the first --diffs of them, and times replay against the recorded server
+latency (frame received → result recorded).
+
+--speed 1 paces frames as they arrived (J / Z detection and frame-cache
+expiry depend on elapsed time), 2 twice as fast, 0 as fast as possible. Only
+frames that produced a result are replayed unless --all-frames is given
+(frames the server dropped as superseded then run too and can shift the
+stability filter).
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from backend.recorder import FRAME, FRAME_B64, HANDS, LANDMARKS, RESULT, RecordingReader, decode_payload
+from benchmarks.report import emit, summarize
+
+FIELDS = ("hand_detected", "letter", "pending_letter", "stable")
+
+
+def _recorded(reader: RecordingReader) -> tuple[dict, dict]:
+    """frame_id -> (recorded result, its landmarks or None, time) and frame_id -> frame receive time."""
+    results, received, landmarks = {}, {}, {}
+    for record in reader.records():
+        if record.kind in (FRAME, FRAME_B64, HANDS):
+            received[record.frame_id] = record.time
+        elif record.kind == LANDMARKS:
+            landmarks[record.frame_id] = decode_payload(record)[0]
+        elif record.kind == RESULT:
+            results[record.frame_id] = (decode_payload(record), landmarks.pop(record.frame_id, None), record.time)
+    return results, received
+
+
+def _compare(frame_id: int, recorded: dict, recorded_landmarks, replayed: dict, args) -> list[dict]:
+    diffs = []
+    for field in FIELDS:
+        if recorded.get(field) != replayed.get(field):
+            diffs.append({"frame_id": frame_id, "field": field,
+                          "recorded": recorded.get(field), "replayed": replayed.get(field)})
+    delta = abs(recorded.get("confidence", 0.0) - replayed.get("confidence", 0.0))
+    if delta > args.confidence_tolerance:
+        diffs.append({"frame_id": frame_id, "field": "confidence",
+                      "recorded": recorded.get("confidence"), "replayed": replayed.get("confidence")})
+    points = replayed.get("landmarks")
+    if recorded_landmarks is not None and points is not None:
+        error = float(np.abs(np.asarray(points, dtype=np.float32) - recorded_landmarks).max())
+        if error > args.landmark_tolerance:
+            diffs.append({"frame_id": frame_id, "field": "landmarks", "recorded": None,
+                          "replayed": f"max deviation {error:.4f}"})
+    return diffs
+
+
+def _processor(endpoint: str):
+    """A function taking one input record and returning its result dict, plus a cleanup."""
+    if endpoint == "/ws/landmarks":
+        from backend.motion import MotionTracker, load_config as load_motion_config
+        from backend.results import HandStates, StabilityFilter, landmark_result, load_config as load_hands_config
+        stability = StabilityFilter()
+        motion_config = load_motion_config()
+        motion = MotionTracker(**motion_config) if motion_config["enabled"] else None
+        max_hands = load_hands_config()["max_hands"]
+        states = HandStates(max_hands, motion=motion_config) if max_hands > 1 else None
+        return (lambda record: landmark_result(decode_payload(record), stability, motion, states)), (lambda: None)
+
+    from backend.gesture_classifier import GestureClassifier
+    clf = GestureClassifier()
+
+    def process(record):
+        if record.kind == FRAME_B64:
+            return clf.process_base64_frame(decode_payload(record))
+        return clf.process_frame(bytes(record.payload))
+    return process, clf.close
+
+
+def run(path: str, args) -> dict:
+    reader = RecordingReader(path)
+    endpoint = reader.meta.get("endpoint", "/ws")
+    results, received = _recorded(reader)
+    process, close = _processor(endpoint)
+
+    counts = {field: 0 for field in FIELDS + ("confidence", "landmarks")}
+    diffs, replay_ms, recorded_ms = [], [], []
+    replayed = compared = mismatched = 0
+    first = None
+    start = time.perf_counter()
+    try:
+        for record in reader.records():
+            if record.kind not in (FRAME, FRAME_B64, HANDS):
+                continue
+            if not args.all_frames and record.frame_id not in results:
+                continue
+            if args.speed > 0:
+                first = first if first is not None else (record.time, time.perf_counter())
+                due = first[1] + (record.time - first[0]) / args.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            t0 = time.perf_counter()
+            result = process(record)
+            replay_ms.append((time.perf_counter() - t0) * 1000)
+            replayed += 1
+            if record.frame_id not in results:
+                continue
+            recorded, recorded_landmarks, recorded_at = results.pop(record.frame_id)
+            recorded_ms.append((recorded_at - received.get(record.frame_id, recorded_at)) * 1000)
+            compared += 1
+            frame_diffs = _compare(record.frame_id, recorded, recorded_landmarks, result, args)
+            mismatched += bool(frame_diffs)
+            for diff in frame_diffs:
+                counts[diff["field"]] += 1
+                if len(diffs) < args.diffs:
+                    diffs.append(diff)
+    finally:
+        close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "recording": str(reader.path),
+        "endpoint": endpoint,
+        "query": reader.meta.get("query", ""),
+        "segments": len(reader.segments),
+        "speed": args.speed,
+        "frames_replayed": replayed,
+        "results_compared": compared,
+        "results_without_frame": len(results),
+        "mismatches": counts,
+        "mismatched_frames": mismatched,
+        "match_rate": round(1 - mismatched / compared, 4) if compared else None,
+        "diffs": diffs,
+        "seconds": round(elapsed, 2),
+        "frames_per_sec": round(replayed / elapsed, 1) if elapsed else 0.0,
+        "replay_latency": summarize(replay_ms),
+        "recorded_server_latency": summarize(recorded_ms),
+        "recorded_config": reader.meta.get("config", {}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("recording", help="a session directory written with HUSH_RECORD=1")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 0 = as fast as possible")
+    parser.add_argument("--all-frames", action="store_true", help="also replay frames that got no result")
+    parser.add_argument("--diffs", type=int, default=20, help="mismatches to list")
+    parser.add_argument("--confidence-tolerance", type=float, default=0.01)
+    parser.add_argument("--landmark-tolerance", type=float, default=0.002)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    emit("replay", run(args.recording, args), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
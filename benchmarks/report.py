@@ -0,0 +1,44 @@
+"""
+Shared reporting for benchmarks: latency summaries and JSON output.
+Every benchmark prints one JSON document to stdout (and optionally writes it to
+--output) so runs can be diffed or collected by CI.
+"""
+
+import json
+import platform
+import time
+
+import numpy as np
+
+
+def summarize(samples_ms) -> dict:
+    """Latency samples (ms) → count, mean and p50/p95/p99/max."""
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    if not arr.size:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+def emit(name: str, report: dict, output: str = None):
+    """Print the report as JSON, tagged with the benchmark name and host."""
+    doc = {
+        "benchmark": name,
+        "timestamp": round(time.time()),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **report,
+    }
+    text = json.dumps(doc, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return doc
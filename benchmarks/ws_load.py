@@ -0,0 +1,154 @@
+"""
+In-process WebSocket load generator for backend.main:app.
+
+    python -m benchmarks.ws_load [--cameras 8] [--seconds 10] [--fps 7] [--landmarks]
+                                 [--results json|packed|none] [--delta]
+
+Each simulated camera opens /ws (or /ws/landmarks), then behaves like the
+frontend: send a binary frame, wait for its result, wait for the next tick
+of --fps (0 = send again immediately). Latency is send → result per frame;
+frames the server skips (admission limits, see backend/admission.py) are
+counted apart, and a camera the server rejects stops.
+--results/--delta pick the negotiated result format (see backend/protocol.py);
+the report includes the server's outbound bytes per result.
+The app runs in this process through Starlette's TestClient, with its normal
+lifespan, so the HUSH_* environment variables configure the server as usual;
+cameras start once /api/health/ready reports the workers warm, and the report
+includes the server's startup breakdown.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import load_frames, synthetic_hands
+from benchmarks.report import emit, summarize
+
+
+def camera(client, path: str, messages: list[bytes], stop: threading.Event, fps: float, out: dict):
+    interval = 1.0 / fps if fps > 0 else 0.0
+    latencies, errors, skipped, rejected = [], 0, 0, False
+    with client.websocket_connect(path) as ws:
+        n = 0
+        while not stop.is_set() and not rejected:
+            tick = time.perf_counter()
+            ws.send_bytes(messages[n % len(messages)])
+            while True:
+                reply = ws.receive_json()
+                kind = reply.get("type")
+                if kind in ("result", "same"):
+                    latencies.append((time.perf_counter() - tick) * 1000)
+                    break
+                if kind == "skipped":
+                    skipped += 1
+                    break
+                if kind == "rejected":
+                    rejected = True
+                    break
+                if kind == "error":
+                    errors += 1
+                    latencies.append((time.perf_counter() - tick) * 1000)
+                    break
+            n += 1
+            if interval:
+                stop.wait(max(0.0, interval - (time.perf_counter() - tick)))
+    out["latencies"], out["errors"], out["skipped"], out["rejected"] = latencies, errors, skipped, rejected
+
+
+def build_messages(landmarks: bool, count: int, directory: str = None) -> list[bytes]:
+    if landmarks:
+        from backend.protocol import encode_landmark_message
+        return [
+            encode_landmark_message(hand, n, 0.0)
+            for n, hand in enumerate(synthetic_hands(count))
+        ]
+    import cv2
+    import numpy as np
+    from backend.protocol import encode_frame_message
+    messages = []
+    for n, frame in enumerate(load_frames(directory, count)):
+        height, width = cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR).shape[:2]
+        messages.append(encode_frame_message(frame, n, 0.0, width, height))
+    return messages
+
+
+def run(
+    cameras: int,
+    seconds: float,
+    fps: float,
+    landmarks: bool = False,
+    frames_dir: str = None,
+    results: str = "json",
+    delta: bool = False,
+) -> dict:
+    from backend.main import app
+
+    messages = build_messages(landmarks, 64, frames_dir)
+    path = ("/ws/landmarks" if landmarks else "/ws") + f"?landmarks={results}&delta={int(delta)}"
+    stop = threading.Event()
+    outputs = [{} for _ in range(cameras)]
+
+    # Server log lines go to stderr so stdout stays a single JSON document
+    with contextlib.redirect_stdout(sys.stderr), TestClient(app) as client:
+        while client.get("/api/health/ready").status_code != 200:
+            time.sleep(0.05)
+        startup = client.get("/api/health").json()["startup"]
+        client.post("/api/stats/reset")
+        threads = [
+            threading.Thread(target=camera, args=(client, path, messages, stop, fps, out), daemon=True)
+            for out in outputs
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        server = client.get("/api/stats").json()
+
+    latencies = [ms for out in outputs for ms in out.get("latencies", [])]
+    return {
+        "endpoint": path,
+        "cameras": cameras,
+        "seconds": round(elapsed, 2),
+        "target_fps_per_camera": fps,
+        "frames": len(latencies),
+        "errors": sum(out.get("errors", 0) for out in outputs),
+        "skipped": sum(out.get("skipped", 0) for out in outputs),
+        "rejected_cameras": sum(bool(out.get("rejected")) for out in outputs),
+        "frames_per_sec": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+        "per_camera_frames": [len(out.get("latencies", [])) for out in outputs],
+        "server": {key: server.get(key) for key in ("ingest", "batching", "results", "frame_cache", "admission")},
+        "startup": startup,
+        "config": {k: v for k, v in os.environ.items() if k.startswith("HUSH_")},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cameras", type=int, default=8, help="concurrent simulated cameras")
+    parser.add_argument("--seconds", type=float, default=10.0, help="test duration")
+    parser.add_argument("--fps", type=float, default=7.0, help="per-camera frame rate cap (0 = unthrottled)")
+    parser.add_argument("--landmarks", action="store_true", help="drive /ws/landmarks instead of /ws")
+    parser.add_argument("--results", choices=("json", "packed", "none"), default="json",
+                        help="landmark format in results")
+    parser.add_argument("--delta", action="store_true", help="ask for 'same' messages for repeated results")
+    parser.add_argument("--dir", help="directory of recorded frames instead of synthetic ones")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run(args.cameras, args.seconds, args.fps, args.landmarks, args.dir, args.results, args.delta)
+    emit("ws_load", report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,12 +4,21 @@
  */
 'use strict';
 
-const WS_URL = `ws://${location.host}/ws`;
-const FRAME_INTERVAL_MS = 150;
+// Results without landmarks (the UI doesn't draw them); repeats come as "same"
+const WS_URL = `ws://${location.host}/ws?landmarks=none&delta=1`;
+const FRAME_INTERVAL_MS = 150;   // default until the server sends a control message
 const STABLE_HOLD_MS = 1800;   // hold time before auto-add (ms)
 const AUTO_COOLDOWN_MS = 1200; // cooldown after auto-add (ms)
 const ISL_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'.split(''); // ← moved here
 
+// ─── Binary frame protocol (see backend/protocol.py) ─────────
+const BINARY_FRAMES = true;        // false → legacy base64 text frames
+const FRAME_PROTOCOL_VERSION = 1;
+const FRAME_FORMAT_JPEG = 1;
+const FRAME_HEADER_BYTES = 20;
+const JPEG_QUALITY = 0.65;
+const MAX_FRAME_WIDTH = 640;
+
 // ─── ISL Word Dictionary ──────────────────────────────────────
 const WORD_DICT = [
   'HOPE', 'LOVE', 'PEACE', 'HAPPY', 'HELLO', 'HELP', 'GOOD', 'GREAT',
@@ -78,6 +87,12 @@ const state = {
   autoCooldown: false,
   autoProgress: 0,
   autoProgressTimer: null,
+  frameId: 0,
+  // Server-driven (see "control" messages in backend/control.py)
+  frameInterval: FRAME_INTERVAL_MS,
+  maxWidth: MAX_FRAME_WIDTH,
+  jpegQuality: JPEG_QUALITY,
+  lastResult: null,  // replayed for {"type": "same"} messages
 };
 
 // ─── DOM ─────────────────────────────────────────────────────
@@ -137,24 +152,45 @@ async function startCamera() {
   });
   state.stream = stream;
   video.srcObject = stream;
-  video.onloadedmetadata = () => {
-    canvas.width = video.videoWidth || 640;
-    canvas.height = video.videoHeight || 480;
-  };
+  video.onloadedmetadata = sizeCanvas;
   hideOverlay(permOverlay);
   showOverlay(noHandOverlay);
   startFrameLoop();
   toast('📷 Camera ready!', 'success');
 }
 
+// Scale the capture canvas down to the server's max width, keeping aspect ratio
+function sizeCanvas() {
+  const w = video.videoWidth || 640;
+  const h = video.videoHeight || 480;
+  const scale = Math.min(1, state.maxWidth / w);
+  canvas.width = Math.round(w * scale);
+  canvas.height = Math.round(h * scale);
+}
+
+function applyControl(d) {
+  const interval = Math.max(30, Number(d.frame_interval_ms) || FRAME_INTERVAL_MS);
+  const maxWidth = Math.max(160, Number(d.max_width) || MAX_FRAME_WIDTH);
+  state.jpegQuality = Math.min(1, Math.max(0.1, Number(d.jpeg_quality) || JPEG_QUALITY));
+  if (maxWidth !== state.maxWidth) {
+    state.maxWidth = maxWidth;
+    sizeCanvas();
+  }
+  if (interval !== state.frameInterval) {
+    state.frameInterval = interval;
+    if (state.frameTimer) startFrameLoop();
+  }
+}
+
 function startFrameLoop() {
   clearInterval(state.frameTimer);
   state.frameTimer = setInterval(() => {
     if (!state.paused && state.ws?.readyState === WebSocket.OPEN
+      && state.ws.bufferedAmount === 0   // previous frame still uploading → skip
       && video.srcObject) {   // stream assigned is enough
       sendFrame();
     }
-  }, FRAME_INTERVAL_MS);
+  }, state.frameInterval);
 }
 
 function sendFrame() {
@@ -165,25 +201,66 @@ function sendFrame() {
     ctx.scale(-1, 1); // always mirror for selfie view
     ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
     ctx.restore();
-    const b64 = canvas.toDataURL('image/jpeg', 0.65).split(',')[1];
-    state.ws.send(b64);
+    if (!BINARY_FRAMES) {
+      const b64 = canvas.toDataURL('image/jpeg', state.jpegQuality).split(',')[1];
+      state.ws.send(b64);
+      return;
+    }
+    const frameId = state.frameId = (state.frameId + 1) >>> 0;
+    const { width, height } = canvas;
+    canvas.toBlob(async (blob) => {
+      if (!blob || state.ws?.readyState !== WebSocket.OPEN) return;
+      const jpeg = await blob.arrayBuffer();
+      state.ws.send(encodeFrame(jpeg, frameId, width, height));
+    }, 'image/jpeg', state.jpegQuality);
   } catch (e) { /* ignore single frame errors */ }
 }
 
+// Header + raw JPEG bytes; layout mirrors FRAME_HEADER in backend/protocol.py
+function encodeFrame(jpeg, frameId, width, height) {
+  const out = new Uint8Array(FRAME_HEADER_BYTES + jpeg.byteLength);
+  const view = new DataView(out.buffer);
+  view.setUint8(0, 0x48);  // 'H'
+  view.setUint8(1, 0x46);  // 'F'
+  view.setUint8(2, FRAME_PROTOCOL_VERSION);
+  view.setUint8(3, FRAME_FORMAT_JPEG);
+  view.setUint32(4, frameId, true);
+  view.setFloat64(8, Date.now(), true);
+  view.setUint16(16, width, true);
+  view.setUint16(18, height, true);
+  out.set(new Uint8Array(jpeg), FRAME_HEADER_BYTES);
+  return out.buffer;
+}
+
 // ─── WebSocket ────────────────────────────────────────────────
 function connectWS() {
   setStatus('connecting');
   const ws = new WebSocket(WS_URL);
   state.ws = ws;
 
+  state.lastResult = null;
+  let retryMs = 2500;
   ws.onopen = () => { setStatus('connected'); toast('🔗 Connected', 'info'); };
-  ws.onclose = () => { setStatus('disconnected'); setTimeout(connectWS, 2500); };
+  ws.onclose = () => { setStatus('disconnected'); setTimeout(connectWS, retryMs); };
   ws.onerror = () => ws.close();
 
   ws.onmessage = (e) => {
     try {
       const d = JSON.parse(e.data);
-      if (d.type === 'result') handleResult(d);
+      if (d.type === 'result') {
+        state.lastResult = d;
+        if (d.word) applyWordUpdate(d.word);  // only on new results, never replayed
+        handleResult(d);
+      }
+      else if (d.type === 'same' && state.lastResult) handleResult(state.lastResult);
+      else if (d.type === 'control') applyControl(d);
+      else if (d.type === 'status') setStatus(d.state === 'warming_up' ? 'warming' : 'connected');
+      else if (d.type === 'rejected') {
+        // Server full: come back when it says to, not on the usual schedule
+        retryMs = (d.retry_after_seconds || 5) * 1000;
+        toast(`⏳ Server busy – retrying in ${Math.round(retryMs / 1000)}s`, 'info');
+      }
+      // 'skipped' (frame over the rate or inference budget): nothing to show
     } catch (err) {
       console.error('[HUSH] WS handler error:', err);
     }
@@ -350,6 +427,32 @@ function updateWordDisplay() {
 }
 
 // ─── Word Suggestions ────────────────────────────────────────
+// Server word decoder (backend/words.py): completions and corrections for the
+// letters it saw held, sent in results as {typed, decoded, completions, final}
+function applyWordUpdate(word) {
+  const parts = state.word.toUpperCase().split(' ');
+  const partial = parts[parts.length - 1];
+  if (word.final) {
+    // Word ended: in auto mode, fix the word just spelled if the decoder corrected it
+    if (state.autoMode && partial && partial === word.typed && word.final !== word.typed) {
+      parts[parts.length - 1] = word.final;
+      state.word = parts.join(' ') + ' ';
+      updateWordDisplay();
+      toast(`✏️ Corrected to "${word.final}"`, 'success', 1500);
+      renderSuggestions([]);
+    } else if (word.final !== word.typed) {
+      renderSuggestions([word.final + ' ✎']);
+    }
+    return;
+  }
+  const chips = word.decoded !== word.typed ? [word.decoded + ' ✎'] : [];
+  word.completions.forEach(w => {
+    if (w === word.typed && w.length >= 3) chips.unshift(w + ' ✓');
+    else if (w !== word.decoded || !chips.length) chips.push(w);
+  });
+  renderSuggestions(chips.slice(0, 6));
+}
+
 function updateSuggestions() {
   if (!suggestionsEl) return;
   const current = state.word.replace(/\s/g, '').toUpperCase();
@@ -368,8 +471,11 @@ function updateSuggestions() {
   if (exact && partial.length >= 3) {
     matches = [partial + ' ✓', ...matches.filter(m => m !== partial)];
   }
-  matches = matches.slice(0, 6);
+  renderSuggestions(matches.slice(0, 6));
+}
 
+function renderSuggestions(matches) {
+  if (!suggestionsEl) return;
   if (!matches.length) { suggestionsEl.innerHTML = ''; return; }
 
   suggestionsEl.innerHTML = `
@@ -377,7 +483,7 @@ function updateSuggestions() {
     <div class="suggestions-chips">
       ${matches.map(m => `
         <button class="suggestion-chip ${m.endsWith('✓') ? 'exact' : ''}"
-          data-word="${m.replace(' ✓', '')}"
+          data-word="${m.replace(/ [✓✎]$/, '')}"
           aria-label="Use word ${m}">
           ${m}
         </button>`).join('')}
@@ -441,7 +547,7 @@ function hideOverlay(el) { el?.classList.add('hidden'); }
 // ─── Status ──────────────────────────────────────────────────
 function setStatus(s) {
   if (statusDot) { statusDot.className = 'pulse-dot ' + s; }
-  if (statusText) statusText.textContent = { connected: 'Connected', disconnected: 'Reconnecting…', connecting: 'Connecting…' }[s] || s;
+  if (statusText) statusText.textContent = { connected: 'Connected', disconnected: 'Reconnecting…', connecting: 'Connecting…', warming: 'Warming up…' }[s] || s;
 }
 
 // ─── Controls Setup ──────────────────────────────────────────
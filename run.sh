@@ -34,7 +34,8 @@ echo "  Press Ctrl+C to stop."
 echo ""
 
 cd "$PROJECT_DIR"
-python3 -m uvicorn backend.main:app \
+# --reload only watches backend/; re-read edited frontend files too
+HUSH_STATIC_RELOAD=1 python3 -m uvicorn backend.main:app \
   --host 0.0.0.0 \
   --port 8000 \
   --reload \
@@ -0,0 +1,37 @@
+"""
+Per-session admission limits on /ws (backend/admission.py).
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_rate_skipped_text_frames_keep_unique_ids(monkeypatch):
+    monkeypatch.setenv("HUSH_MAX_SESSION_FPS", "0.01")  # the burst of 2, then every frame is skipped
+    import backend.main
+
+    replies = []
+    with TestClient(backend.main.app) as client:
+        with client.websocket_connect("/ws?landmarks=none") as ws:
+            for _ in range(4):
+                ws.send_text("!!!notbase64")
+                while (message := ws.receive_json())["type"] not in ("result", "skipped"):
+                    pass
+                replies.append((message["type"], message["frame_id"]))
+    assert replies == [("result", 1), ("result", 2), ("skipped", 3), ("skipped", 4)]
+
+
+def test_sessions_capped_at_worker_trackers(monkeypatch):
+    monkeypatch.setenv("HUSH_INFERENCE_WORKERS", "1")
+    monkeypatch.setenv("HUSH_MAX_TRACKERS", "2")
+    monkeypatch.setenv("HUSH_MAX_SESSIONS", "0")  # asks for unlimited: capped at 1 worker × 2 trackers
+    import backend.main
+
+    with TestClient(backend.main.app) as client:
+        with client.websocket_connect("/ws?landmarks=none"), client.websocket_connect("/ws?landmarks=none"):
+            with client.websocket_connect("/ws?landmarks=none") as third:
+                while (message := third.receive_json())["type"] == "format":
+                    pass
+                assert message["type"] == "rejected"
+            stats = client.get("/api/stats").json()
+    assert stats["admission"]["max_sessions"] == 2
+    assert stats["admission"]["rejected"] == 1
@@ -0,0 +1,43 @@
+"""
+Per-tracker MediaPipe state in backend/gesture_classifier.py and its cap in
+backend/tracker_pool.py.
+"""
+
+import pytest
+
+pytest.importorskip("mediapipe")
+
+
+def test_complexity_switch_reuses_graphs():
+    from backend.gesture_classifier import GestureClassifier
+
+    clf = GestureClassifier()
+    full = clf.hands
+    clf.set_complexity(0)
+    lite = clf.hands
+    clf.set_complexity(1)
+    assert clf.hands is full  # switching back costs no rebuild
+    assert clf.graphs == 2
+    assert clf.close_idle_graphs() == 1
+    assert list(clf._hands.values()) == [full] and lite not in clf._hands.values()
+    clf.close()
+
+
+def test_tracker_pool_counts_graphs_against_the_cap():
+    from backend.gesture_classifier import GestureClassifier
+    from backend.tracker_pool import TrackerPool
+
+    pool = TrackerPool(GestureClassifier, max_trackers=3, max_spare=0)
+    a, b = pool.get("a"), pool.get("b")
+    for tracker in (a, b):
+        tracker.hands
+        tracker.set_complexity(0)
+        tracker.hands
+    pool.trim()
+    assert pool.graphs == 3  # b (most recent) keeps both, a drops its idle graph
+    assert (a.graphs, b.graphs) == (1, 2)
+
+    c = pool.get("c")  # makes room by closing b's idle graph, not by taking a tracker
+    assert c not in (a, b) and pool.stats()["evicted"] == 0
+    assert pool.graphs == 3
+    pool.close()
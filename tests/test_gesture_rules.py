@@ -0,0 +1,39 @@
+"""
+The compiled rule table and the vectorized classifier (backend/gesture_rules.py)
+against the frozen original cascade (benchmarks/baseline_rules.py).
+"""
+
+import numpy as np
+import pytest
+
+from backend.gesture_rules import classify_hand, classify_landmarks
+from benchmarks import baseline_rules
+from benchmarks.corpus import as_landmark_lists, posed_hands, synthetic_hands
+
+CORPORA = {
+    "synthetic": synthetic_hands(5000, seed=1),
+    "posed": posed_hands(5000, seed=1),
+}
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_rule_table_matches_original_cascade(corpus):
+    hands = CORPORA[corpus]
+    for hand, lm in zip(hands, as_landmark_lists(hands)):
+        expected = baseline_rules.classify_gesture(lm)
+        assert classify_hand(hand[:, 0], hand[:, 1], hand[:, 2]) == expected
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_vectorized_matches_original_cascade(corpus):
+    hands = CORPORA[corpus]
+    expected = [baseline_rules.classify_gesture(lm) for lm in as_landmark_lists(hands)]
+    assert classify_landmarks(hands) == expected  # float32, as the binary protocols deliver
+
+
+def test_vectorized_input_shapes():
+    hands = CORPORA["posed"][:3]
+    expected = classify_landmarks(hands)
+    assert classify_landmarks(list(hands)) == expected
+    assert classify_landmarks(hands[0]) == expected[:1]
+    assert classify_landmarks(np.empty((0, 21, 3))) == []
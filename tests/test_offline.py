@@ -0,0 +1,73 @@
+"""
+Offline labelling (backend/offline.py): upload jobs over REST and result rows.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("HUSH_OFFLINE_DIR", str(tmp_path))
+    monkeypatch.setenv("HUSH_OFFLINE_MAX_UPLOAD_MB", "0.01")  # 10485 bytes
+    monkeypatch.setenv("HUSH_OFFLINE_MAX_JOBS", "3")
+    import backend.main
+    with TestClient(backend.main.app) as client:
+        yield client
+
+
+def test_upload_chunks_up_to_the_limit(client):
+    job = client.post("/api/offline/jobs").json()
+    url = f"/api/offline/jobs/{job['job_id']}/upload"
+    assert client.put(url, params={"offset": 0}, content=b"x" * 6000).json()["bytes_received"] == 6000
+    response = client.put(url, params={"offset": 6000}, content=b"x" * 6000)
+    assert response.status_code == 413
+    assert response.json()["bytes_received"] == 6000
+    assert client.put(url, params={"offset": 6000}, content=b"x" * 4000).json()["bytes_received"] == 10000
+
+
+def test_streamed_upload_past_the_limit(client):
+    job = client.post("/api/offline/jobs").json()
+    url = f"/api/offline/jobs/{job['job_id']}/upload"
+    chunks = (b"x" * 4000 for _ in range(4))  # no Content-Length: caught while streaming
+    response = client.put(url, params={"offset": 0}, content=chunks)
+    assert response.status_code == 413
+    assert response.json()["bytes_received"] <= response.json()["max_upload_bytes"]
+
+
+def test_job_limit(client):
+    jobs = [client.post("/api/offline/jobs").json()["job_id"] for _ in range(3)]
+    assert client.post("/api/offline/jobs").status_code == 429
+    client.delete(f"/api/offline/jobs/{jobs[0]}")
+    assert client.post("/api/offline/jobs").status_code == 200
+
+
+def test_idle_jobs_expire(tmp_path):
+    from backend.offline import OfflineJobs, TooManyJobs
+
+    jobs = OfflineJobs(str(tmp_path), max_jobs=2, job_ttl_seconds=60)
+    first, second = jobs.create("a.mp4"), jobs.create("b.mp4")
+    with pytest.raises(TooManyJobs):
+        jobs.create("c.mp4")
+    second.active_at += 30  # used more recently
+    jobs.expire(time.monotonic() + 61)
+    assert list(jobs.jobs) == [second.id] and not first.directory.exists()
+    jobs.create("c.mp4")
+    jobs.close()
+
+
+def test_rows_share_one_schema(tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    from backend import offline
+
+    dark = tmp_path / "dark.jpg"
+    cv2.imwrite(str(dark), np.zeros((240, 320, 3), np.uint8))
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not an image")
+    offline._init_worker()
+    rows = offline._label_chunk([(0, dark.name, str(dark)), (1, broken.name, str(broken))], False)
+    assert [row["stable"] for row in rows] == [False, False]
+    assert all(not row["hand_detected"] for row in rows)
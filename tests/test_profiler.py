@@ -0,0 +1,37 @@
+"""Access control and report shape of /api/admin/profile (backend/profiler.py)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def make(token=None):
+        if token is None:
+            monkeypatch.delenv("HUSH_ADMIN_TOKEN", raising=False)
+        else:
+            monkeypatch.setenv("HUSH_ADMIN_TOKEN", token)
+        import backend.main
+        return TestClient(backend.main.app)
+    return make
+
+
+def test_disabled_without_token(client):
+    with client() as c:
+        assert c.post("/api/admin/profile?seconds=0.1").status_code == 403
+
+
+@pytest.mark.parametrize("header", ["", "Bearer wrong", "Bearer é".encode(), "s3cret"])
+def test_rejects_bad_credentials(client, header):
+    with client("s3cret") as c:
+        response = c.post("/api/admin/profile?seconds=0.1", headers={"Authorization": header})
+        assert response.status_code == 401
+
+
+def test_profile_with_token(client):
+    with client("s3cret") as c:
+        headers = {"Authorization": "Bearer s3cret"}
+        report = c.post("/api/admin/profile?seconds=0.2", headers=headers).json()
+        assert report["samples"] > 0 and "loop_lag_ms" in report
+        text = c.post("/api/admin/profile?seconds=0.1&format=collapsed", headers=headers).text
+        assert text.strip().splitlines()[0].rsplit(" ", 1)[1].isdigit()
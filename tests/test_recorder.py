@@ -0,0 +1,76 @@
+"""
+Record /ws and /ws/landmarks sessions that include no-hand and error frames
+(backend/recorder.py), then replay them with benchmarks.replay.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setenv("HUSH_RECORD", "1")
+    monkeypatch.setenv("HUSH_RECORD_DIR", str(tmp_path / "recordings"))
+    monkeypatch.setenv("HUSH_RECORD_FLUSH_MS", "10")
+    monkeypatch.setenv("HUSH_MAX_SESSION_FPS", "0")
+    import backend.main
+    return backend.main.app
+
+
+def _session(tmp_path):
+    sessions = sorted((tmp_path / "recordings").iterdir())
+    assert len(sessions) == 1
+    return sessions[0]
+
+
+def _replay(path, tmp_path) -> dict:
+    from benchmarks import replay
+    output = tmp_path / "replay.json"
+    assert replay.main([str(path), "--speed", "0", "--output", str(output)]) == 0
+    return json.loads(output.read_text())
+
+
+def _receive_result(ws) -> dict:
+    while True:
+        message = ws.receive_json()
+        if message["type"] == "result":
+            return message
+
+
+def test_landmarks_session_with_no_hand_frame(app, tmp_path):
+    from backend.protocol import encode_landmark_message
+
+    hand = np.random.default_rng(0).random((21, 3), dtype=np.float32)
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/landmarks") as ws:
+            for frame_id, hands in enumerate([hand, np.empty((0, 21, 3)), hand], 1):
+                ws.send_bytes(encode_landmark_message(hands, frame_id, 0.0))
+                result = _receive_result(ws)
+                assert result["frame_id"] == frame_id
+                assert result["hand_detected"] == bool(len(hands))
+
+    report = _replay(_session(tmp_path), tmp_path)
+    assert report["results_compared"] == 3
+    assert report["match_rate"] == 1.0
+
+
+def test_frame_session_with_no_hand_and_error_frames(app, tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    from backend.protocol import encode_frame_message
+
+    dark = cv2.imencode(".jpg", np.zeros((240, 320, 3), np.uint8))[1].tobytes()
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws?landmarks=none") as ws:
+            ws.send_bytes(encode_frame_message(dark, 1, 0.0, 320, 240))
+            result = _receive_result(ws)
+            assert result["frame_id"] == 1 and not result["hand_detected"]
+            ws.send_text("!!!notbase64")  # undecodable text frame: an error result
+            result = _receive_result(ws)
+            assert result["frame_id"] == 2 and "error" in result
+
+    report = _replay(_session(tmp_path), tmp_path)
+    assert report["results_compared"] == 2
+    assert report["match_rate"] == 1.0
@@ -0,0 +1,15 @@
+"""
+Startup configuration of the batch scheduler (backend/scheduler.py).
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_batch_size_capped_at_tracker_limit(monkeypatch):
+    monkeypatch.setenv("HUSH_BATCH_MAX_SIZE", "16")
+    monkeypatch.setenv("HUSH_MAX_TRACKERS", "4")
+    import backend.main
+
+    with TestClient(backend.main.app) as client:
+        stats = client.get("/api/stats").json()
+    assert stats["batching"]["max_batch_size"] == 4
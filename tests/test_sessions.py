@@ -0,0 +1,47 @@
+"""
+/ws session lifecycle in backend/main.py.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+
+def test_session_closes_when_processing_fails(monkeypatch):
+    monkeypatch.setenv("HUSH_MAX_SESSION_FPS", "0")
+    import backend.main
+
+    async def broken_submit(session_id, frame):
+        raise RuntimeError("worker crashed")
+
+    with TestClient(backend.main.app) as client:
+        monkeypatch.setattr(backend.main.scheduler, "submit", broken_submit)
+        with client.websocket_connect("/ws?landmarks=none") as ws:
+            ws.send_text("!!!notbase64")
+            with pytest.raises(WebSocketDisconnect) as closed:
+                while True:
+                    ws.receive_json()
+        assert closed.value.code == backend.main.WS_INTERNAL_ERROR
+        stats = client.get("/api/stats").json()
+    assert stats["admission"]["sessions"] == 0
+    assert stats["admission"]["in_flight"] == 0
+
+
+def test_text_frame_ids_follow_binary_ids(monkeypatch):
+    cv2 = pytest.importorskip("cv2")
+    monkeypatch.setenv("HUSH_MAX_SESSION_FPS", "0")
+    import backend.main
+    from backend.protocol import encode_frame_message
+
+    dark = cv2.imencode(".jpg", np.zeros((240, 320, 3), np.uint8))[1].tobytes()
+    with TestClient(backend.main.app) as client:
+        with client.websocket_connect("/ws?landmarks=none") as ws:
+            ids = []
+            for send in (lambda: ws.send_bytes(encode_frame_message(dark, 5, 0.0, 320, 240)),
+                         lambda: ws.send_text("!!!notbase64")):
+                send()
+                while (message := ws.receive_json())["type"] != "result":
+                    pass
+                ids.append(message["frame_id"])
+    assert ids == [5, 6]